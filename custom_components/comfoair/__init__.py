@@ -3,65 +3,57 @@
 from __future__ import annotations
 
 import logging
+import os
+from collections.abc import Mapping
 
 import pymodbus
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import config_validation as cv
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, entity_registry as er
 
 from .const import (
     CONF_ALARM_DELAY,
-    CONF_ALARM_NOTIFICATION_TITLE,
     CONF_BAUDRATE,
     CONF_BYTESIZE,
     CONF_CONNECTION_ERROR_DELAY,
-    CONF_CONNECTION_ERROR_NOTIFICATION_TITLE,
     CONF_CONTROL_TYPE,
     CONF_DEVICE,
     CONF_DEVICE_ID,
-    CONF_DEWPOINT_DELTA,
+    CONF_CLIENT,
+    CONF_HISTORY_DAYS,
     CONF_MODE,
-    CONF_NOTIFY_ALARMS_MOBILE,
-    CONF_NOTIFY_ALARMS_PERSISTENT,
-    CONF_NOTIFY_ALARMS_SERVICES,
-    CONF_NOTIFY_CONNECTION_ERRORS_MOBILE,
-    CONF_NOTIFY_CONNECTION_ERRORS_PERSISTENT,
-    CONF_NOTIFY_CONNECTION_ERRORS_SERVICES,
     CONF_PARITY,
     CONF_STOPBITS,
     CONTROL_TYPE_MANUAL,
     DEFAULT_ALARM_DELAY,
-    DEFAULT_ALARM_NOTIFICATION_TITLE,
     DEFAULT_BAUDRATE,
     DEFAULT_BYTESIZE,
     DEFAULT_CONNECTION_ERROR_DELAY,
-    DEFAULT_CONNECTION_ERROR_NOTIFICATION_TITLE,
     DEFAULT_DEVICE_ID,
-    DEFAULT_DEWPOINT_DELTA,
-    DEFAULT_NOTIFY_ALARMS_MOBILE,
-    DEFAULT_NOTIFY_ALARMS_PERSISTENT,
-    DEFAULT_NOTIFY_ALARMS_SERVICES,
-    DEFAULT_NOTIFY_CONNECTION_ERRORS_MOBILE,
-    DEFAULT_NOTIFY_CONNECTION_ERRORS_PERSISTENT,
-    DEFAULT_NOTIFY_CONNECTION_ERRORS_SERVICES,
+    DEFAULT_CLIENT,
+    DEFAULT_HISTORY_DAYS,
     DEFAULT_PARITY,
-    DEFAULT_SCAN_INTERVAL,
     DEFAULT_STOPBITS,
     DOMAIN,
     PLATFORMS,
 )
 from .alarm_monitor import AlarmMonitor
-from .hub import ComfoAirHub
+from .hub import ComfoAirHub, support_map_store
+from .options import alarm_monitor_settings, hub_settings
+from .services import async_scan_registers, async_setup_services
+from .websocket_api import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
-async def async_setup(_hass: HomeAssistant, _config: dict) -> bool:
-    """Set up via YAML is not supported."""
+async def async_setup(hass: HomeAssistant, _config: dict) -> bool:
+    """Register the services and websocket commands; set up via YAML is not supported."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
     return True
 
 
@@ -80,14 +72,28 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+@callback
+def _async_update_consumed_keys(hass: HomeAssistant, entry: ConfigEntry, hub: ComfoAirHub) -> None:
+    """Tell the hub which data keys the enabled entities of this entry read."""
+    prefix = f"{entry.data[CONF_NAME]}_"
+    keys = {
+        registry_entry.unique_id.removeprefix(prefix)
+        for registry_entry in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+        if not registry_entry.disabled and registry_entry.unique_id.startswith(prefix)
+    }
+    hub.async_set_consumed_keys(keys)
+
+
+def _history_path(hass: HomeAssistant, name: str) -> str:
+    return hass.config.path(DOMAIN, f"{name}.history")
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up ComfoAir from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
     name = entry.data[CONF_NAME]
     mode = entry.data[CONF_MODE]
-    scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-
     _LOGGER.info("Setting up %s.%s", DOMAIN, name)
     _LOGGER.debug("Used pymodbus version: %s", pymodbus.__version__)
     _LOGGER.debug(
@@ -99,7 +105,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hub = ComfoAirHub(
         hass=hass,
         name=name,
-        scan_interval=scan_interval,
         mode=mode,
         device_id=DEFAULT_DEVICE_ID,
         host=entry.data.get(CONF_HOST),
@@ -109,59 +114,76 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         bytesize=entry.data.get(CONF_BYTESIZE, DEFAULT_BYTESIZE),
         parity=entry.data.get(CONF_PARITY, DEFAULT_PARITY),
         stopbits=entry.data.get(CONF_STOPBITS, DEFAULT_STOPBITS),
-        dewpoint_delta=entry.data.get(CONF_DEWPOINT_DELTA, DEFAULT_DEWPOINT_DELTA),
-        notify_connection_errors_mobile=entry.data.get(
-            CONF_NOTIFY_CONNECTION_ERRORS_MOBILE, DEFAULT_NOTIFY_CONNECTION_ERRORS_MOBILE
-        ),
-        notify_connection_errors_persistent=entry.data.get(
-            CONF_NOTIFY_CONNECTION_ERRORS_PERSISTENT, DEFAULT_NOTIFY_CONNECTION_ERRORS_PERSISTENT
-        ),
-        notify_services=entry.data.get(
-            CONF_NOTIFY_CONNECTION_ERRORS_SERVICES, DEFAULT_NOTIFY_CONNECTION_ERRORS_SERVICES
-        ),
-        connection_error_notification_title=entry.data.get(
-            CONF_CONNECTION_ERROR_NOTIFICATION_TITLE, DEFAULT_CONNECTION_ERROR_NOTIFICATION_TITLE
-        ),
-        connection_error_delay=entry.data.get(CONF_CONNECTION_ERROR_DELAY, DEFAULT_CONNECTION_ERROR_DELAY),
+        client=entry.data.get(CONF_CLIENT, DEFAULT_CLIENT),
+        **hub_settings(entry.data),
     )
-    await hub.async_config_entry_first_refresh()
-
-    alarm_monitor = AlarmMonitor(
-        hass=hass,
-        name=name,
-        hub=hub,
-        notify_alarms_mobile=entry.data.get(CONF_NOTIFY_ALARMS_MOBILE, DEFAULT_NOTIFY_ALARMS_MOBILE),
-        notify_alarms_persistent=entry.data.get(CONF_NOTIFY_ALARMS_PERSISTENT, DEFAULT_NOTIFY_ALARMS_PERSISTENT),
-        notify_services=entry.data.get(CONF_NOTIFY_ALARMS_SERVICES, DEFAULT_NOTIFY_ALARMS_SERVICES),
-        notification_title=entry.data.get(CONF_ALARM_NOTIFICATION_TITLE, DEFAULT_ALARM_NOTIFICATION_TITLE),
-        alarm_delay=entry.data.get(CONF_ALARM_DELAY, DEFAULT_ALARM_DELAY),
+    try:
+        history_days = entry.data.get(CONF_HISTORY_DAYS, DEFAULT_HISTORY_DAYS)
+        if history_days:
+            await hub.async_open_history(_history_path(hass, name), history_days)
+        await hub.async_load_support_map()
+        await hub.async_config_entry_first_refresh()
+        if await hub.async_support_map_outdated():
+            # Firmware updates can change which registers a unit has.
+            _LOGGER.info("Model or firmware of %s changed since its last register scan, scanning again", name)
+            entry.async_create_background_task(
+                hass,
+                async_scan_registers(hass, entry.entry_id, hub, hub.support_map.first, hub.support_map.last),
+                f"{DOMAIN} {name} register scan",
+            )
+        hub.async_start_fixed_rate()
+        entry.async_on_unload(hub.async_start_backfill())
+
+        alarm_monitor = AlarmMonitor(hass=hass, name=name, hub=hub, **alarm_monitor_settings(entry.data))
+
+        firmware_version = None
+        model_display = None
+        serial_number = None
+        if isinstance(hub.data, Mapping):
+            firmware_version = hub.data.get("firmware_version")
+            model_parts = ["ComfoAir", hub.data.get("112"), hub.data.get("111")]
+            model_display = " ".join(p for p in model_parts if p) or None
+            serial_number = hub.data.get("serial_number")
+
+        hass.data[DOMAIN][name] = {
+            "hub": hub,
+            "mode": mode,
+            "alarm_monitor": alarm_monitor,
+            "device_info": {
+                "identifiers": {(DOMAIN, name)},
+                "name": name,
+                "manufacturer": "Mischa Bommer",
+                "model": model_display,
+                "sw_version": firmware_version,
+                "serial_number": serial_number,
+            },
+        }
+
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        # Without this the worker thread and an open history file outlive the failed setup.
+        hass.data[DOMAIN].pop(name, None)
+        hub.async_stop_fixed_rate()
+        await hub.async_close_history()
+        await hub.async_close()
+        raise
+
+    # Only read and derive what enabled entities use, and follow the user enabling
+    # or disabling entities without a reload.
+    _async_update_consumed_keys(hass, entry, hub)
+
+    @callback
+    def _registry_filter(event_data: er.EventEntityRegistryUpdatedData) -> bool:
+        return event_data["action"] != "update" or "disabled_by" in event_data["changes"]
+
+    @callback
+    def _registry_updated(_event: Event[er.EventEntityRegistryUpdatedData]) -> None:
+        _async_update_consumed_keys(hass, entry, hub)
+
+    entry.async_on_unload(
+        hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, _registry_updated, event_filter=_registry_filter)
     )
 
-    firmware_version = None
-    model_display = None
-    serial_number = None
-    if isinstance(hub.data, dict):
-        firmware_version = hub.data.get("firmware_version")
-        model_parts = ["ComfoAir", hub.data.get("112"), hub.data.get("111")]
-        model_display = " ".join(p for p in model_parts if p) or None
-        serial_number = hub.data.get("serial_number")
-
-    hass.data[DOMAIN][name] = {
-        "hub": hub,
-        "mode": mode,
-        "alarm_monitor": alarm_monitor,
-        "device_info": {
-            "identifiers": {(DOMAIN, name)},
-            "name": name,
-            "manufacturer": "Mischa Bommer",
-            "model": model_display,
-            "sw_version": firmware_version,
-            "serial_number": serial_number,
-        },
-    }
-
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
     alarm_monitor.start_monitoring()
 
     return True
@@ -175,5 +197,25 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         alarm_monitor: AlarmMonitor = item["alarm_monitor"]
         alarm_monitor.stop_monitoring()
         hub: ComfoAirHub = item["hub"]
-        hub.close()
+        hub.async_stop_fixed_rate()
+        hub.async_stop_live_mode()
+        hub.async_end_streams()
+        await hub.async_close_history()
+        # Kept open briefly, so a reload of the entry reuses the connection.
+        hub.async_park()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Close a connection the removed entry left open; drop its kept data, history and register scan."""
+    name = entry.data[CONF_NAME]
+    data_store = hass.data.pop(f"{name}_data_store", None)
+    parked = data_store.get("connection") if data_store is not None else None
+    if parked is not None:
+        parked.cancel_close()
+        await parked.worker.async_stop(parked.poller.reset_client)
+    path = _history_path(hass, name)
+    if await hass.async_add_executor_job(os.path.exists, path):
+        await hass.async_add_executor_job(os.remove, path)
+        _LOGGER.info("Removed history file %s", path)
+    await support_map_store(hass, name).async_remove()
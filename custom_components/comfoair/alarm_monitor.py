@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from datetime import datetime
 
 from homeassistant.components.persistent_notification import async_create as create_persistent_notification
@@ -10,25 +11,15 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_track_time_change
 
 from .const import (
-    ALARM_BITS,
     DOMAIN,
     GATED_WARNING_KEYS,
     WARNING_QUIET_HOUR_END,
     WARNING_QUIET_HOUR_START,
-    alarm_data_key,
 )
+from .core.alarms import ALARM_DESCRIPTIONS, AlarmTracker
 
 _LOGGER = logging.getLogger(__name__)
 
-_DESCRIPTIONS: dict[str, str] = {
-    alarm_data_key(reg_str, bit_pos): description
-    for reg_str, bits in ALARM_BITS.items()
-    for bit_pos, description in bits
-}
-_DESCRIPTIONS["supply_condensation_alarm"] = "condensation alarm"
-
-ALL_ALARM_KEYS: set[str] = set(_DESCRIPTIONS)
-
 
 class AlarmMonitor:
     """Monitor ComfoAir alarm/warning bits and send notifications."""
@@ -48,6 +39,22 @@ class AlarmMonitor:
         self.hass = hass
         self.name = name
         self._hub = hub
+        self._set_settings(
+            notify_alarms_mobile, notify_alarms_persistent, notify_services, notification_title, alarm_delay
+        )
+        self._tracker = AlarmTracker()
+        self._pending_gated: set[str] = set()
+        self._remove_listener = None
+        self._remove_quiet_hour_trigger = None
+
+    def _set_settings(
+        self,
+        notify_alarms_mobile: bool,
+        notify_alarms_persistent: bool,
+        notify_services: str,
+        notification_title: str,
+        alarm_delay: int,
+    ) -> None:
         self._notify_alarms_mobile = notify_alarms_mobile
         self._notify_alarms_persistent = notify_alarms_persistent
         self._notify_services = (
@@ -55,10 +62,21 @@ class AlarmMonitor:
         )
         self._notification_title = notification_title
         self._alarm_delay = alarm_delay
-        self._active: dict[str, bool] = {}
-        self._pending_gated: set[str] = set()
-        self._remove_listener = None
-        self._remove_quiet_hour_trigger = None
+
+    def update_settings(
+        self,
+        notify_alarms_mobile: bool,
+        notify_alarms_persistent: bool,
+        notify_services: str,
+        notification_title: str,
+        alarm_delay: int,
+    ) -> None:
+        """Apply changed notification options; the known alarm states are kept."""
+        self.stop_monitoring()
+        self._set_settings(
+            notify_alarms_mobile, notify_alarms_persistent, notify_services, notification_title, alarm_delay
+        )
+        self.start_monitoring()
 
     def start_monitoring(self) -> None:
         """Start monitoring hub data updates for alarm bit transitions."""
@@ -79,26 +97,19 @@ class AlarmMonitor:
     @callback
     def _handle_hub_update(self) -> None:
         data = self._hub.data
-        if not isinstance(data, dict):
+        if not isinstance(data, Mapping):
             return
 
-        for key in ALL_ALARM_KEYS:
-            new_value = data.get(key)
-            if new_value is None:
-                continue
-            new_value = bool(new_value)
-            old_value = self._active.get(key)
-            self._active[key] = new_value
-
-            if old_value is False and new_value is True:
-                self.hass.loop.call_later(
-                    self._alarm_delay,
-                    lambda k=key: self.hass.async_create_task(self._maybe_notify(k)),
-                )
-                _LOGGER.debug("%s triggered, will notify after %ss", key, self._alarm_delay)
-            elif old_value is True and new_value is False:
-                self._pending_gated.discard(key)
-                _LOGGER.debug("%s cleared", key)
+        raised, cleared = self._tracker.update(data)
+        for key in raised:
+            self.hass.loop.call_later(
+                self._alarm_delay,
+                lambda k=key: self.hass.async_create_task(self._maybe_notify(k)),
+            )
+            _LOGGER.debug("%s triggered, will notify after %ss", key, self._alarm_delay)
+        for key in cleared:
+            self._pending_gated.discard(key)
+            _LOGGER.debug("%s cleared", key)
 
     async def _maybe_notify(self, key: str) -> None:
         """Send the notification if the alarm/warning is still active after the delay.
@@ -108,11 +119,11 @@ class AlarmMonitor:
         since that's the one that would wake you up for a non-urgent warning.
         """
         data = self._hub.data
-        if not isinstance(data, dict) or not data.get(key):
+        if not isinstance(data, Mapping) or not data.get(key):
             _LOGGER.debug("%s was cleared before the notification delay elapsed", key)
             return
 
-        description = _DESCRIPTIONS.get(key, key)
+        description = ALARM_DESCRIPTIONS.get(key, key)
         message = f"{self.name} {description}"
 
         if self._notify_alarms_persistent:
@@ -147,8 +158,8 @@ class AlarmMonitor:
         self._pending_gated.clear()
 
         for key in pending:
-            if isinstance(data, dict) and data.get(key):
-                description = _DESCRIPTIONS.get(key, key)
+            if isinstance(data, Mapping) and data.get(key):
+                description = ALARM_DESCRIPTIONS.get(key, key)
                 self.hass.async_create_task(self._send_mobile(f"{self.name} {description}"))
 
     def _send_persistent(self, key: str, message: str) -> None:
@@ -0,0 +1,162 @@
+"""Import long-term statistics for hours the recorder missed.
+
+The hub keeps hourly statistics of every measurement sensor in memory. When states
+could not be written or recorded for a whole hour (during a slow startup or
+database migration, or a recorder backlog), the recorder has no statistics for it;
+those hours are imported afterwards, one bulk import per sensor, instead of
+replaying states. An hour is kept until the recorder has statistics for it, so an
+import that did not make it is repeated on the next run.
+
+Needs Home Assistant 2025.12 or later for the mean_type and unit_class metadata.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMeanType, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_import_statistics, statistics_during_period
+from homeassistant.components.sensor import UNIT_CONVERTERS, SensorStateClass
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .core.statistics import HourlyStatistics
+from .sensor_types import SENSOR_TYPES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Minute past each hour at which missed hours are looked for; the recorder compiles
+# the statistics of an hour in the first minutes after it.
+BACKFILL_MINUTE = 15
+# Seconds after the end of an hour before it is considered compiled by the recorder.
+COMPILE_MARGIN = 600
+
+MEASUREMENT_KEYS = tuple(
+    key for key, description in SENSOR_TYPES.items() if description.state_class == SensorStateClass.MEASUREMENT
+)
+
+
+class StatisticsBackfill:
+    """Hourly statistics of one hub, and their import for the hours the recorder lacks."""
+
+    def __init__(self, hass: HomeAssistant, name: str, statistics: HourlyStatistics) -> None:
+        self._hass = hass
+        self._name = name
+        self.statistics = statistics
+        self._running = False
+
+    @callback
+    def async_start(self) -> Callable[[], None]:
+        """Look for missed hours once the recorder is up, and every hour after; returns the stop callback."""
+
+        async def _async_first_run() -> None:
+            await get_instance(self._hass).async_db_ready
+            await self.async_backfill()
+
+        if "recorder" not in self._hass.config.components:
+            _LOGGER.debug("Recorder not loaded, no statistics backfill for %s", self._name)
+            return lambda: None
+
+        task = self._hass.async_create_background_task(_async_first_run(), f"{DOMAIN} {self._name} backfill")
+
+        @callback
+        def _hourly(_now: datetime) -> None:
+            self._hass.async_create_background_task(self.async_backfill(), f"{DOMAIN} {self._name} backfill")
+
+        cancel_hourly = async_track_utc_time_change(self._hass, _hourly, minute=BACKFILL_MINUTE, second=0)
+
+        @callback
+        def _stop() -> None:
+            task.cancel()
+            cancel_hourly()
+
+        return _stop
+
+    async def async_backfill(self) -> None:
+        """Import the buffered hours the recorder has no statistics for; forget the hours it has."""
+        if self._running or "recorder" not in self._hass.config.components:
+            return
+        hours = self.statistics.complete_hours(time.time() - COMPILE_MARGIN)
+        if not hours:
+            return
+        if get_instance(self._hass).backlog:
+            # States of these hours may still be queued; look again on the next run.
+            return
+        self._running = True
+        try:
+            await self._async_import_missing(hours)
+        finally:
+            self._running = False
+
+    async def _async_import_missing(self, hours: dict) -> None:
+        registry = er.async_get(self._hass)
+        entity_ids: dict[str, str] = {}
+        for key in MEASUREMENT_KEYS:
+            entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{self._name}_{key}")
+            entry = registry.async_get(entity_id) if entity_id is not None else None
+            if entry is not None and not entry.disabled:
+                entity_ids[key] = entity_id
+        if not entity_ids:
+            self.statistics.discard(hours)
+            return
+
+        start = dt_util.utc_from_timestamp(min(hours))
+        end = dt_util.utc_from_timestamp(max(hours)) + timedelta(hours=1)
+        existing = await get_instance(self._hass).async_add_executor_job(
+            statistics_during_period, self._hass, start, end, set(entity_ids.values()), "hour", None, {"mean"}
+        )
+
+        imported = 0
+        confirmed = set(hours)
+        for key, entity_id in entity_ids.items():
+            recorded = {int(row["start"]) for row in existing.get(entity_id, ())}
+            missing = sorted(hour for hour, stats in hours.items() if key in stats and hour not in recorded)
+            if not missing:
+                continue
+            # Kept until the next run finds the imported hours in the database.
+            confirmed.difference_update(missing)
+            description = SENSOR_TYPES[key]
+            unit = description.native_unit_of_measurement
+            convert = None
+            converter = UNIT_CONVERTERS.get(description.device_class)
+            state = self._hass.states.get(entity_id)
+            state_unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) if state is not None else None
+            if state_unit is not None and state_unit != unit and converter is not None:
+                # The statistics are kept in the unit the state is shown in.
+                convert = converter.converter_factory(unit, state_unit)
+                unit = state_unit
+
+            statistics = []
+            for hour in missing:
+                stats = hours[hour][key]
+                values = (stats.mean, stats.min, stats.max)
+                if convert is not None:
+                    values = tuple(convert(value) for value in values)
+                statistics.append(
+                    StatisticData(
+                        start=dt_util.utc_from_timestamp(hour), mean=values[0], min=values[1], max=values[2]
+                    )
+                )
+            metadata = StatisticMetaData(
+                mean_type=StatisticMeanType.ARITHMETIC,
+                has_sum=False,
+                name=None,
+                source="recorder",
+                statistic_id=entity_id,
+                unit_class=converter.UNIT_CLASS if converter is not None else None,
+                unit_of_measurement=unit,
+            )
+            async_import_statistics(self._hass, metadata, statistics)
+            imported += len(statistics)
+
+        if imported:
+            _LOGGER.info("Imported %s missed hourly statistics of %s", imported, self._name)
+        self.statistics.discard(confirmed)
@@ -4,9 +4,20 @@ from __future__ import annotations
 
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity
 from homeassistant.const import CONF_NAME
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity_registry import RegistryEntryDisabler
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ALARM_BITS, DOMAIN, GATED_WARNING_KEYS, alarm_data_key
+from .const import (
+    ALARM_BITS,
+    ALARM_ENTITIES_COMPACT,
+    CONF_ALARM_ENTITIES,
+    DEFAULT_ALARM_ENTITIES,
+    DOMAIN,
+    GATED_WARNING_KEYS,
+    alarm_data_key,
+)
+from .core.alarms import active_alarms
 
 
 async def async_setup_entry(hass, entry, async_add_entities) -> None:
@@ -15,13 +26,46 @@ async def async_setup_entry(hass, entry, async_add_entities) -> None:
     hub = hass.data[DOMAIN][hub_name]["hub"]
     device_info = hass.data[DOMAIN][hub_name]["device_info"]
 
-    entities: list = [SupplyCondensationAlarmSensor(hub_name, hub, device_info)]
+    compact = entry.data.get(CONF_ALARM_ENTITIES, DEFAULT_ALARM_ENTITIES) == ALARM_ENTITIES_COMPACT
+    entity_registry = er.async_get(hass)
+
+    entities: list = []
+    if await hub.async_supported_keys(("supply_condensation_alarm",)):
+        entities.append(SupplyCondensationAlarmSensor(hub_name, hub, device_info))
+    newly_compact: set[str] = set()
     for reg_str, bits in ALARM_BITS.items():
+        register_entity_id = entity_registry.async_get_entity_id(
+            "binary_sensor", DOMAIN, f"{hub_name}_alarm_{reg_str}"
+        )
+        if compact:
+            if register_entity_id is None:
+                newly_compact.add(reg_str)
+            entities.append(AlarmRegisterSensor(hub_name, hub, device_info, reg_str, bits))
+        elif register_entity_id is not None:
+            entity_registry.async_remove(register_entity_id)
+
         for bit_pos, description in bits:
-            entities.append(AlarmBitSensor(hub_name, hub, device_info, reg_str, bit_pos, description))
+            entities.append(
+                AlarmBitSensor(hub_name, hub, device_info, reg_str, bit_pos, description, enabled_default=not compact)
+            )
 
     async_add_entities(entities)
 
+    # Switching to compact mode disables the per-bit sensors once; ones the user
+    # enables again afterwards are left alone. Switching back re-enables them.
+    for reg_str, bits in ALARM_BITS.items():
+        for bit_pos, _ in bits:
+            entity_id = entity_registry.async_get_entity_id(
+                "binary_sensor", DOMAIN, f"{hub_name}_{alarm_data_key(reg_str, bit_pos)}"
+            )
+            if entity_id is None:
+                continue
+            registry_entry = entity_registry.async_get(entity_id)
+            if reg_str in newly_compact and registry_entry.disabled_by is None:
+                entity_registry.async_update_entity(entity_id, disabled_by=RegistryEntryDisabler.INTEGRATION)
+            elif not compact and registry_entry.disabled_by is RegistryEntryDisabler.INTEGRATION:
+                entity_registry.async_update_entity(entity_id, disabled_by=None)
+
 
 class SupplyCondensationAlarmSensor(CoordinatorEntity, BinarySensorEntity):
     """Binary sensor that triggers when supply air dewpoint approaches room temperature."""
@@ -32,21 +76,14 @@ class SupplyCondensationAlarmSensor(CoordinatorEntity, BinarySensorEntity):
     def __init__(self, platform_name, hub, device_info) -> None:
         self._platform_name = platform_name
         self._attr_device_info = device_info
+        self._attr_name = f"{platform_name} condensation alarm"
+        self._attr_unique_id = f"{platform_name}_supply_condensation_alarm"
         super().__init__(coordinator=hub)
 
-    @property
-    def name(self):
-        return f"{self._platform_name} condensation alarm"
-
-    @property
-    def unique_id(self):
-        return f"{self._platform_name}_supply_condensation_alarm"
-
     @property
     def is_on(self):
-        if not self.coordinator.data:
-            return None
-        return self.coordinator.data.get("supply_condensation_alarm")
+        data = self.coordinator.data
+        return data.get("supply_condensation_alarm") if data is not None else None
 
     @property
     def state(self) -> str | None:
@@ -55,6 +92,13 @@ class SupplyCondensationAlarmSensor(CoordinatorEntity, BinarySensorEntity):
             return None
         return "warning" if val else "no warning"
 
+    @property
+    def extra_state_attributes(self):
+        data = self.coordinator.data
+        if data is not None and data.is_stale("supply_condensation_alarm"):
+            return {"stale": True}
+        return None
+
 
 class AlarmBitSensor(CoordinatorEntity, BinarySensorEntity):
     """Binary sensor for a single bit in an alarm bitmask register."""
@@ -62,32 +106,96 @@ class AlarmBitSensor(CoordinatorEntity, BinarySensorEntity):
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
     _attr_icon = "mdi:alert-circle"
 
-    def __init__(self, platform_name, hub, device_info, reg_str, bit_pos, description) -> None:
+    def __init__(
+        self, platform_name, hub, device_info, reg_str, bit_pos, description, enabled_default: bool = True
+    ) -> None:
         self._platform_name = platform_name
         self._attr_device_info = device_info
+        self._attr_entity_registry_enabled_default = enabled_default
         self._data_key = alarm_data_key(reg_str, bit_pos)
         self._description = description
+        self._attr_name = f"{platform_name} {description}"
+        self._attr_unique_id = f"{platform_name}_{self._data_key}"
+        if self._data_key in GATED_WARNING_KEYS:
+            self._on_state, self._off_state = "warning", "no warning"
+        else:
+            self._on_state, self._off_state = "alarm", "no alarm"
         super().__init__(coordinator=hub)
 
     @property
-    def name(self):
-        return f"{self._platform_name} {self._description}"
+    def is_on(self):
+        data = self.coordinator.data
+        return data.get(self._data_key) if data is not None else None
+
+    @property
+    def state(self) -> str | None:
+        val = self.is_on
+        if val is None:
+            return None
+        return self._on_state if val else self._off_state
 
     @property
-    def unique_id(self):
-        return f"{self._platform_name}_{self._data_key}"
+    def extra_state_attributes(self):
+        data = self.coordinator.data
+        if data is not None and data.is_stale(self._data_key):
+            return {"stale": True}
+        return None
+
+
+class AlarmRegisterSensor(CoordinatorEntity, BinarySensorEntity):
+    """Binary sensor for a whole alarm bitmask register, listing its active bits.
+
+    It is on while any bit is set, but only the alarm bits make its state "alarm";
+    with just warning bits set (see GATED_WARNING_KEYS) the state is "warning".
+    """
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_icon = "mdi:alert-circle"
+
+    def __init__(self, platform_name, hub, device_info, reg_str, bits) -> None:
+        self._platform_name = platform_name
+        self._attr_device_info = device_info
+        self._reg_str = reg_str
+        self._register = int(reg_str)
+        self._data_key = alarm_data_key(reg_str, bits[0][0])
+        self._warning_mask = sum(
+            1 << bit_pos for bit_pos, _ in bits if alarm_data_key(reg_str, bit_pos) in GATED_WARNING_KEYS
+        )
+        self._alarm_mask = sum(1 << bit_pos for bit_pos, _ in bits) & ~self._warning_mask
+        self._attr_name = f"{platform_name} alarm register {reg_str}"
+        self._attr_unique_id = f"{platform_name}_alarm_{reg_str}"
+        super().__init__(coordinator=hub)
+
+    def _raw(self) -> int | None:
+        data = self.coordinator.data
+        return data.raw(self._register) if data is not None else None
 
     @property
     def is_on(self):
-        if not self.coordinator.data:
+        raw = self._raw()
+        if raw is None:
             return None
-        return self.coordinator.data.get(self._data_key)
+        return bool(raw & (self._alarm_mask | self._warning_mask))
 
     @property
     def state(self) -> str | None:
-        val = self.is_on
-        if val is None:
+        raw = self._raw()
+        if raw is None:
             return None
-        if self._data_key in GATED_WARNING_KEYS:
-            return "warning" if val else "no warning"
-        return "alarm" if val else "no alarm"
+        if raw & self._alarm_mask:
+            return "alarm"
+        if raw & self._warning_mask:
+            return "warning"
+        return "no alarm"
+
+    @property
+    def extra_state_attributes(self):
+        raw = self._raw()
+        if raw is None:
+            return None
+        alarms = active_alarms(self._reg_str, raw & self._alarm_mask)
+        warnings = active_alarms(self._reg_str, raw & self._warning_mask)
+        attributes = {"alarms": alarms, "warnings": warnings, "count": len(alarms) + len(warnings)}
+        if self.coordinator.data.is_stale(self._data_key):
+            attributes["stale"] = True
+        return attributes
@@ -6,6 +6,7 @@ import asyncio
 import ipaddress
 import logging
 import re
+from functools import partial
 
 import serial.tools.list_ports
 import voluptuous as vol
@@ -24,16 +25,24 @@ from .const import (
     ALLOWED_DEVICE_IDS,
     ALLOWED_PARITIES,
     ALLOWED_STOPBITS,
+    ALARM_ENTITIES_COMPACT,
+    ALARM_ENTITIES_PER_BIT,
+    CLIENT_BUILTIN,
+    CLIENT_PYMODBUS,
     CONF_ALARM_DELAY,
+    CONF_ALARM_ENTITIES,
     CONF_ALARM_NOTIFICATION_TITLE,
     CONF_BAUDRATE,
     CONF_BYTESIZE,
+    CONF_CLIENT,
     CONF_CONNECTION_ERROR_DELAY,
     CONF_CONNECTION_ERROR_NOTIFICATION_TITLE,
     CONF_CONTROL_TYPE,
     CONF_DEVICE,
     CONF_DEVICE_ID,
     CONF_DEWPOINT_DELTA,
+    CONF_FIXED_RATE,
+    CONF_HISTORY_DAYS,
     CONF_MODE,
     CONF_NOTIFY_ALARMS_MOBILE,
     CONF_NOTIFY_ALARMS_PERSISTENT,
@@ -42,19 +51,24 @@ from .const import (
     CONF_NOTIFY_CONNECTION_ERRORS_PERSISTENT,
     CONF_NOTIFY_CONNECTION_ERRORS_SERVICES,
     CONF_PARITY,
+    CONF_STALE_MAX_AGE,
     CONF_STOPBITS,
     CONTROL_TYPE_0_10V,
     CONTROL_TYPE_MANUAL,
     CONTROL_TYPE_RF,
     DEFAULT_ALARM_DELAY,
+    DEFAULT_ALARM_ENTITIES,
     DEFAULT_ALARM_NOTIFICATION_TITLE,
     DEFAULT_BAUDRATE,
+    DEFAULT_CLIENT,
     DEFAULT_CONTROL_TYPE,
     DEFAULT_BYTESIZE,
     DEFAULT_CONNECTION_ERROR_DELAY,
     DEFAULT_CONNECTION_ERROR_NOTIFICATION_TITLE,
     DEFAULT_DEWPOINT_DELTA,
     DEFAULT_DEVICE_ID,
+    DEFAULT_FIXED_RATE,
+    DEFAULT_HISTORY_DAYS,
     DEFAULT_NAME,
     DEFAULT_NOTIFY_ALARMS_MOBILE,
     DEFAULT_NOTIFY_ALARMS_PERSISTENT,
@@ -65,12 +79,17 @@ from .const import (
     DEFAULT_PARITY,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_MAX_AGE,
     DEFAULT_STOPBITS,
     DOMAIN,
+    LIVE_OPTIONS,
     MODE_SERIAL,
     MODE_TCP,
     MODES,
+    NETWORK_MODES,
 )
+from .core.probe import benchmark, identify
+from .options import async_apply_live_options
 
 
 def host_valid(host: str) -> bool:
@@ -87,6 +106,7 @@ def _connection_unique_id(data: dict) -> str:
     mode = data[CONF_MODE]
     if mode == MODE_SERIAL:
         return f"{MODE_SERIAL}:{data[CONF_DEVICE]}:{data.get(CONF_DEVICE_ID, DEFAULT_DEVICE_ID)}"
+    # All network modes share one id per gateway endpoint, whatever the framing.
     return f"{MODE_TCP}:{data[CONF_HOST]}:{data[CONF_PORT]}:{data.get(CONF_DEVICE_ID, DEFAULT_DEVICE_ID)}"
 
 
@@ -254,12 +274,61 @@ def _control_type_selector(default_value: str):
     )
 
 
+def _alarm_entities_selector():
+    return selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                selector.SelectOptionDict(value=ALARM_ENTITIES_PER_BIT, label="Per alarm bit"),
+                selector.SelectOptionDict(value=ALARM_ENTITIES_COMPACT, label="Per alarm register"),
+            ],
+            mode=selector.SelectSelectorMode.DROPDOWN,
+        )
+    )
+
+
+def _client_selector():
+    return selector.SelectSelector(
+        selector.SelectSelectorConfig(
+            options=[
+                selector.SelectOptionDict(value=CLIENT_PYMODBUS, label="pymodbus"),
+                selector.SelectOptionDict(value=CLIENT_BUILTIN, label="Built-in (read-only)"),
+            ],
+            mode=selector.SelectSelectorMode.DROPDOWN,
+        )
+    )
+
+
 def _normalize_device_id(data: dict) -> dict:
     normalized = dict(data)
     normalized[CONF_DEVICE_ID] = DEFAULT_DEVICE_ID
     return normalized
 
 
+def _connection_kwargs(data: dict) -> dict:
+    """Return the ModbusTransport connection arguments for a (candidate) entry."""
+    if data[CONF_MODE] == MODE_SERIAL:
+        return {
+            "device": data[CONF_DEVICE],
+            "baudrate": int(data.get(CONF_BAUDRATE, DEFAULT_BAUDRATE)),
+            "bytesize": int(data.get(CONF_BYTESIZE, DEFAULT_BYTESIZE)),
+            "parity": data.get(CONF_PARITY, DEFAULT_PARITY),
+            "stopbits": int(data.get(CONF_STOPBITS, DEFAULT_STOPBITS)),
+        }
+    return {"host": data[CONF_HOST], "port": data[CONF_PORT]}
+
+
+async def _answering_network_modes(hass: HomeAssistant, data: dict) -> list[str]:
+    """Probe the endpoint concurrently in the other network modes; return those a unit answers in."""
+    modes = sorted(NETWORK_MODES - {data[CONF_MODE]})
+    models = await asyncio.gather(
+        *(
+            hass.async_add_executor_job(partial(identify, mode, DEFAULT_DEVICE_ID, **_connection_kwargs(data)))
+            for mode in modes
+        )
+    )
+    return [mode for mode, model in zip(modes, models) if model is not None]
+
+
 async def _get_serial_ports() -> list[str]:
     loop = asyncio.get_running_loop()
     return await loop.run_in_executor(
@@ -289,6 +358,8 @@ class ComfoAirConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         self._data: dict = {}
         self._reconfigure_data: dict = {}
+        # Network modes the unit answered in when the probe of the chosen one failed.
+        self._detected_modes: list[str] = []
 
     @staticmethod
     @callback
@@ -297,24 +368,29 @@ class ComfoAirConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def async_step_user(self, user_input=None) -> FlowResult:
         if user_input is not None:
-            self._data = _normalize_device_id(user_input)
-            if self._data[CONF_MODE] == MODE_SERIAL:
-                return await self.async_step_serial()
-            return await self.async_step_tcp()
+            # Keeps the connection settings entered before, when coming back from a failed probe.
+            self._data = _normalize_device_id({**self._data, **user_input})
+            return await self.async_step_connection()
 
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema(
                 {
-                    vol.Required(CONF_NAME, default=DEFAULT_NAME): str,
+                    vol.Required(CONF_NAME, default=self._data.get(CONF_NAME, DEFAULT_NAME)): str,
                     vol.Required(CONF_DEVICE_ID, default=str(DEFAULT_DEVICE_ID)): _device_id_selector(
                         DEFAULT_DEVICE_ID
                     ),
-                    vol.Required(CONF_MODE, default=MODE_TCP): vol.In(MODES),
+                    vol.Required(CONF_MODE, default=self._data.get(CONF_MODE, MODE_TCP)): vol.In(MODES),
                 }
             ),
         )
 
+    async def async_step_connection(self, user_input=None) -> FlowResult:
+        """Show the connection settings of the chosen mode again."""
+        if self._data[CONF_MODE] == MODE_SERIAL:
+            return await self.async_step_serial()
+        return await self.async_step_tcp()
+
     async def async_step_tcp(self, user_input=None) -> FlowResult:
         errors: dict[str, str] = {}
 
@@ -335,7 +411,7 @@ class ComfoAirConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         DEFAULT_SCAN_INTERVAL,
                     ),
                 }
-                return await self.async_step_control_type()
+                return await self.async_step_probe()
 
         return self.async_show_form(
             step_id="tcp",
@@ -346,6 +422,8 @@ class ComfoAirConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_serial(self, user_input=None) -> FlowResult:
         errors: dict[str, str] = {}
         serial_ports = await _get_serial_ports()
+        # Only the port the user picks is probed: other ports may be radio sticks that
+        # other integrations have open.
         default_device = self._data.get(CONF_DEVICE) or (serial_ports[0] if serial_ports else "")
 
         if user_input is not None:
@@ -361,7 +439,7 @@ class ComfoAirConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         DEFAULT_SCAN_INTERVAL,
                     ),
                 }
-                return await self.async_step_control_type()
+                return await self.async_step_probe()
 
         return self.async_show_form(
             step_id="serial",
@@ -369,6 +447,65 @@ class ComfoAirConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_probe(self, user_input=None) -> FlowResult:
+        """Test the connection, time a few polls and propose a polling interval that fits them.
+
+        The form is only shown when the unit answered; otherwise a menu offers to try
+        again, to change the connection, or to switch to a mode the unit does answer in.
+        """
+        if user_input is not None:
+            self._data[CONF_SCAN_INTERVAL] = user_input[CONF_SCAN_INTERVAL]
+            return await self.async_step_control_type()
+
+        result = await self.hass.async_add_executor_job(
+            partial(benchmark, self._data[CONF_MODE], DEFAULT_DEVICE_ID, **_connection_kwargs(self._data))
+        )
+        if result is None:
+            self._detected_modes = []
+            if self._data[CONF_MODE] in NETWORK_MODES:
+                self._detected_modes = await _answering_network_modes(self.hass, self._data)
+            if self._detected_modes:
+                return self.async_show_menu(
+                    step_id="probe_mode_mismatch",
+                    menu_options=["use_detected_mode", "probe", "connection", "user"],
+                    description_placeholders={
+                        "mode": self._data[CONF_MODE],
+                        "detected_modes": ", ".join(self._detected_modes),
+                    },
+                )
+            return self.async_show_menu(
+                step_id="probe_failed",
+                menu_options=["probe", "connection", "user"],
+                description_placeholders={"mode": self._data[CONF_MODE]},
+            )
+
+        return self.async_show_form(
+            step_id="probe",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=max(self._data[CONF_SCAN_INTERVAL], result.recommended_scan_interval),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                }
+            ),
+            description_placeholders={
+                "model": str(result.model or "-"),
+                "firmware": result.firmware_version or "-",
+                "latency": f"{result.latency * 1000:.1f}",
+                "poll_time": f"{result.poll_time * 1000:.0f}",
+                "polls_per_second": f"{result.polls_per_second:.1f}",
+                "recommended": str(result.recommended_scan_interval),
+                "failed_polls": str(result.failed_polls),
+                "polls": str(result.polls),
+            },
+        )
+
+    async def async_step_use_detected_mode(self, user_input=None) -> FlowResult:
+        """Switch to the first mode the unit answered in, and test the connection again."""
+        self._data[CONF_MODE] = self._detected_modes[0]
+        return await self.async_step_probe()
+
     async def async_step_control_type(self, user_input=None) -> FlowResult:
         errors: dict[str, str] = {}
 
@@ -445,7 +582,8 @@ class ComfoAirConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             merged = _normalize_device_id({**entry.data, **self._reconfigure_data, **user_input})
-            merged[CONF_MODE] = MODE_TCP
+            if merged.get(CONF_MODE) not in NETWORK_MODES:
+                merged[CONF_MODE] = MODE_TCP
             host = merged[CONF_HOST].strip().lower()
             merged[CONF_HOST] = host
 
@@ -509,7 +647,6 @@ class ComfoAirConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 else:
                     self._async_abort_entries_match(
                         {
-                            CONF_MODE: MODE_TCP,
                             CONF_HOST: merged[CONF_HOST],
                             CONF_PORT: merged[CONF_PORT],
                             CONF_DEVICE_ID: merged[CONF_DEVICE_ID],
@@ -548,8 +685,13 @@ class ComfoAirOptionsFlow(config_entries.OptionsFlow):
             data[CONF_NOTIFY_CONNECTION_ERRORS_SERVICES] = _normalize_services(
                 user_input.get(CONF_NOTIFY_CONNECTION_ERRORS_SERVICES)
             )
+            current = self.config_entry.data
+            changed = {key for key in data.keys() | current.keys() if data.get(key) != current.get(key)}
             self.hass.config_entries.async_update_entry(self.config_entry, data=data)
-            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+            if changed <= LIVE_OPTIONS and self.config_entry.state is config_entries.ConfigEntryState.LOADED:
+                await async_apply_live_options(self.hass, self.config_entry)
+            else:
+                await self.hass.config_entries.async_reload(self.config_entry.entry_id)
             return self.async_create_entry(title="", data={})
 
         mode = self.config_entry.data.get(CONF_MODE, MODE_TCP)
@@ -565,6 +707,26 @@ class ComfoAirOptionsFlow(config_entries.OptionsFlow):
                 CONF_DEWPOINT_DELTA,
                 default=self.config_entry.data.get(CONF_DEWPOINT_DELTA, DEFAULT_DEWPOINT_DELTA),
             ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=5.0)),
+            vol.Optional(
+                CONF_FIXED_RATE,
+                default=self.config_entry.data.get(CONF_FIXED_RATE, DEFAULT_FIXED_RATE),
+            ): bool,
+            vol.Optional(
+                CONF_STALE_MAX_AGE,
+                default=self.config_entry.data.get(CONF_STALE_MAX_AGE, DEFAULT_STALE_MAX_AGE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+            vol.Optional(
+                CONF_ALARM_ENTITIES,
+                default=self.config_entry.data.get(CONF_ALARM_ENTITIES, DEFAULT_ALARM_ENTITIES),
+            ): _alarm_entities_selector(),
+            vol.Optional(
+                CONF_CLIENT,
+                default=self.config_entry.data.get(CONF_CLIENT, DEFAULT_CLIENT),
+            ): _client_selector(),
+            vol.Optional(
+                CONF_HISTORY_DAYS,
+                default=self.config_entry.data.get(CONF_HISTORY_DAYS, DEFAULT_HISTORY_DAYS),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3660)),
             **_notification_schema_fields(self.hass, self.config_entry.data),
         }
 
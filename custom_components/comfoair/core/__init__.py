@@ -0,0 +1,6 @@
+"""Home Assistant independent core of the ComfoAir integration.
+
+Transport, read plan, decoding and derived values, usable without Home Assistant.
+Modules in this package only import each other, so it can also be run on its own
+from the integration folder, e.g. ``python -m core --help``.
+"""
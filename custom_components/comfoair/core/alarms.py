@@ -0,0 +1,56 @@
+"""Alarm and warning decoding for the ComfoAir alarm registers."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from .const import ALARM_BITS, alarm_data_key
+
+# Data key -> description of every alarm the integration reports.
+ALARM_DESCRIPTIONS: dict[str, str] = {
+    alarm_data_key(reg_str, bit_pos): description
+    for reg_str, bits in ALARM_BITS.items()
+    for bit_pos, description in bits
+}
+ALARM_DESCRIPTIONS["supply_condensation_alarm"] = "condensation alarm"
+
+ALL_ALARM_KEYS: frozenset[str] = frozenset(ALARM_DESCRIPTIONS)
+
+# Register -> [(mask, description)] for decoding a whole alarm register at once.
+_REGISTER_MASKS: dict[str, list[tuple[int, str]]] = {
+    reg_str: [(1 << bit_pos, description) for bit_pos, description in bits] for reg_str, bits in ALARM_BITS.items()
+}
+
+
+def active_alarms(reg_str: str, raw: int) -> list[str]:
+    """Return the descriptions of the bits set in a raw alarm register word."""
+    return [description for mask, description in _REGISTER_MASKS[reg_str] if raw & mask]
+
+
+class AlarmTracker:
+    """Remembers the alarm states of the previous snapshot and reports the changes."""
+
+    def __init__(self) -> None:
+        self._active: dict[str, bool] = {}
+
+    def update(self, data: Mapping[str, Any]) -> tuple[list[str], list[str]]:
+        """Return the alarm keys that were raised and cleared since the previous call.
+
+        Keys without a value (not read yet, or unavailable) are skipped and keep
+        their previous state. The first value seen for a key is not a transition.
+        """
+        raised: list[str] = []
+        cleared: list[str] = []
+        for key in ALL_ALARM_KEYS:
+            value = data.get(key)
+            if value is None:
+                continue
+            value = bool(value)
+            previous = self._active.get(key)
+            self._active[key] = value
+            if previous is False and value:
+                raised.append(key)
+            elif previous is True and not value:
+                cleared.append(key)
+        return raised, cleared
@@ -0,0 +1,344 @@
+"""Offline analysis of recorded ComfoAir data with NumPy.
+
+Loads history files of the integration (see history.py) and captures of the
+command line poller (JSON lines or CSV) into arrays, computes the same derived
+values as the integration for all samples at once, and summarizes them per day.
+Files are independent, so a report over many units can spread them over worker
+processes. Run from the integration folder:
+
+    python -m core.analysis comfoair/zehnder.history
+    python -m core.analysis units/*.history --workers 8 --start 2026-01-01 --output report.csv
+
+Needs NumPy, which the integration itself does not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import sys
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError as err:
+    raise ImportError("the analysis tool needs NumPy: pip install numpy") from err
+
+from .const import REGISTER_SCALING
+from .history import (
+    BLOCK_HEADER,
+    BLOCK_SIZE,
+    BLOCK_SLOTS,
+    FILE_HEADER,
+    KEY_FLAG,
+    MAGIC,
+    RECORD_SIZE,
+    VERSION,
+)
+from .psychrometrics import AIR_STREAMS, DERIVED_INPUTS
+from .snapshot import REGISTER_SLOTS, SLOT_COUNT
+
+# Registers the derived values are computed from; only these are loaded.
+INPUT_REGISTERS = tuple(sorted({register for inputs in DERIVED_INPUTS.values() for register in inputs}, key=int))
+# Blocks of a history file decoded at once, which bounds the memory used while loading.
+CHUNK_BLOCKS = 4096
+
+_BLOCK_HEADER_DTYPE = np.dtype([("start", "<f8"), ("sequence", "<u8"), ("used", "<u4")])
+_RECORD_DTYPE = np.dtype([("seconds", "<f4"), ("mask", "<u8"), ("payload", "u1", (SLOT_COUNT,))])
+
+
+@dataclass(slots=True)
+class Samples:
+    """Polls of one unit: times in seconds since the epoch, and per data key the values (NaN if missing)."""
+
+    name: str
+    times: np.ndarray
+    values: dict[str, np.ndarray]
+
+
+def decode_registers(words: dict[str, np.ndarray], valid: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Decode raw words per register key like the integration does, NaN where missing or out of range."""
+    values: dict[str, np.ndarray] = {}
+    for key, raw in words.items():
+        scaling = REGISTER_SCALING[key]
+        value = raw.astype(np.int32)
+        if scaling.signed:
+            value = np.where(value >= 0x8000, value - 0x10000, value)
+        value = value * scaling.scale
+        if scaling.precision is not None:
+            value = np.round(value, scaling.precision)
+        ok = valid[key].copy()
+        if scaling.min_value is not None:
+            ok &= value >= scaling.min_value
+        if scaling.max_value is not None:
+            ok &= value <= scaling.max_value
+        values[key] = np.where(ok, value, np.nan)
+    return values
+
+
+def load_history(path: str, registers: Sequence[str] = INPUT_REGISTERS) -> Samples:
+    """Load the polls in a history file, decoding only the given register keys."""
+    slots = np.array([REGISTER_SLOTS[int(key)] for key in registers])
+    with open(path, "rb") as file:
+        mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic, version, slot_count, block_slots, blocks, _head, _sequence = FILE_HEADER.unpack_from(mm, 0)
+        if (magic, version, slot_count, block_slots) != (MAGIC, VERSION, SLOT_COUNT, BLOCK_SLOTS):
+            raise ValueError(f"{path} is not a history file of this version")
+        headers = np.ndarray(
+            (blocks,), _BLOCK_HEADER_DTYPE, buffer=mm, offset=FILE_HEADER.size, strides=(BLOCK_SIZE,)
+        )
+        records = np.ndarray(
+            (blocks, BLOCK_SLOTS),
+            _RECORD_DTYPE,
+            buffer=mm,
+            offset=FILE_HEADER.size + BLOCK_HEADER.size,
+            strides=(BLOCK_SIZE, RECORD_SIZE),
+        )
+        order = np.argsort(headers["sequence"], kind="stable")
+        order = order[headers["sequence"][order] > 0]
+
+        times, words, masks = [], [], []
+        for first in range(0, len(order), CHUNK_BLOCKS):
+            chunk = order[first : first + CHUNK_BLOCKS]
+            chunk_times, chunk_words, chunk_masks = _decode_blocks(headers[chunk], records[chunk], slots)
+            times.append(chunk_times)
+            words.append(chunk_words)
+            masks.append(chunk_masks)
+        del headers, records
+    finally:
+        mm.close()
+
+    all_words = np.concatenate(words) if words else np.zeros((0, len(slots)), np.uint16)
+    all_masks = np.concatenate(masks) if masks else np.zeros((0, len(slots)), bool)
+    values = decode_registers(
+        {key: all_words[:, column] for column, key in enumerate(registers)},
+        {key: all_masks[:, column] for column, key in enumerate(registers)},
+    )
+    name = os.path.splitext(os.path.basename(path))[0]
+    return Samples(name, np.concatenate(times) if times else np.zeros(0), values)
+
+
+def _decode_blocks(
+    headers: np.ndarray, records: np.ndarray, slots: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Rebuild times, words (for slots) and fresh masks of whole blocks, in order."""
+    used = np.arange(BLOCK_SLOTS) < headers["used"][:, None]
+    flat = records[used]
+    starts = np.broadcast_to(headers["start"][:, None], used.shape)[used]
+    is_key_slot = (flat["mask"] & np.uint64(KEY_FLAG)) != 0
+
+    # A key record takes two slots, so runs of key slots have even length: the
+    # record starts at the even positions within a run.
+    index = np.arange(len(flat))
+    run_start = is_key_slot & ~np.concatenate(([False], is_key_slot[:-1]))
+    run_first = np.maximum.accumulate(np.where(run_start, index, 0))
+    key_first = is_key_slot & ((index - run_first) % 2 == 0)
+    record = ~is_key_slot | key_first
+
+    rows = flat[record]
+    is_key = key_first[record]
+    times = starts[record] + rows["seconds"].astype(np.float64)
+    masks = ((rows["mask"][:, None] >> slots.astype(np.uint64)) & np.uint64(1)).astype(bool)
+
+    # Key words: the payloads of both slots of the record, as little-endian words.
+    key_rows = np.flatnonzero(key_first)
+    key_payload = np.concatenate((flat["payload"][key_rows], flat["payload"][key_rows + 1]), axis=1)
+    key_words = key_payload.view("<u2")[:, slots].astype(np.int64)
+
+    # Words are the last key's words plus the deltas since; the deltas of key records count as 0.
+    deltas = rows["payload"][:, slots].view(np.int8).astype(np.int64)
+    deltas[is_key] = 0
+    running = np.cumsum(deltas, axis=0)
+    segment = np.cumsum(is_key) - 1
+    words = (key_words[segment] + running - running[is_key][segment]) & 0xFFFF
+    return times, words.astype(np.uint16), masks
+
+
+def load_capture(path: str) -> Samples:
+    """Load a capture of the command line poller, JSON lines or CSV (by extension)."""
+    keys = (*INPUT_REGISTERS, *DERIVED_INPUTS)
+    times: list[float] = []
+    columns: dict[str, list[float]] = {key: [] for key in keys}
+    with open(path, encoding="utf-8", newline="") as file:
+        rows: Iterable[dict] = csv.DictReader(file) if path.endswith(".csv") else map(json.loads, file)
+        for row in rows:
+            times.append(datetime.fromisoformat(row["time"]).timestamp())
+            for key in keys:
+                columns[key].append(_number(row.get(key)))
+    name = os.path.splitext(os.path.basename(path))[0]
+    values = {key: np.array(column, dtype=np.float64) for key, column in columns.items()}
+    return Samples(name, np.array(times, dtype=np.float64), values)
+
+
+def _number(value) -> float:
+    if value is None or value == "":
+        return np.nan
+    if isinstance(value, str):
+        if value in ("True", "False"):
+            return float(value == "True")
+        return float(value)
+    return float(value)
+
+
+def load(path: str) -> Samples:
+    """Load a history file or a capture, by extension."""
+    if path.endswith((".jsonl", ".json", ".csv")):
+        return load_capture(path)
+    return load_history(path)
+
+
+def derive(values: dict[str, np.ndarray], dewpoint_delta: float = 1.0) -> dict[str, np.ndarray]:
+    """Compute the integration's derived values for all samples at once.
+
+    Same formulas and rounding as psychrometrics.derive_values; NaN where it gives None.
+    The condensation alarm is 1.0 or 0.0, so its daily mean is the share of the day it was on.
+    """
+    derived: dict[str, np.ndarray] = {}
+    with np.errstate(all="ignore"):
+        for prefix, temp_reg, rh_reg in AIR_STREAMS:
+            temp = values[temp_reg]
+            e = values[rh_reg] / 100.0 * 6.112 * np.exp(17.67 * temp / (temp + 243.5))
+            abs_hum = np.round(0.622 * e / (1013.25 - e), 4)
+            derived[f"{prefix}_absolute_humidity"] = abs_hum
+            derived[f"{prefix}_enthalpy"] = np.round(1.006 * temp + abs_hum * (2501 + 1.86 * temp), 1)
+            ln_e = np.log(np.where(e > 0, e, np.nan) / 6.112)
+            derived[f"{prefix}_dewpoint"] = np.round(243.5 * ln_e / (17.67 - ln_e), 1)
+
+        t_supply = values["303"]
+        t_extract = values["304"]
+        efficiency = np.round(np.clip(t_supply / t_extract * 100, 0.0, 100.0), 1)
+        derived["temperature_efficiency"] = np.where(np.abs(t_extract) >= 1.0, efficiency, np.nan)
+        derived["flow_balance"] = np.round(values["313"] - values["312"], 0)
+
+        supply_dewpoint = derived["supply_dewpoint"]
+        alarm = (supply_dewpoint >= t_extract - dewpoint_delta).astype(np.float64)
+        derived["supply_condensation_alarm"] = np.where(
+            np.isnan(supply_dewpoint) | np.isnan(t_extract), np.nan, alarm
+        )
+    return derived
+
+
+def daily_summary(samples: Samples, keys: Sequence[str]) -> list[dict]:
+    """Return per local day and key the number of values, mean, minimum and maximum."""
+    if not len(samples.times):
+        return []
+    order = np.argsort(samples.times, kind="stable")
+    times = samples.times[order]
+
+    # Local midnights from the first to the last day; DST makes days differ in length.
+    first = datetime.fromtimestamp(times[0]).date()
+    last = datetime.fromtimestamp(times[-1]).date()
+    days = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+    midnights = np.array([datetime(day.year, day.month, day.day).timestamp() for day in days])
+    bounds = np.searchsorted(times, midnights)
+    ends = np.append(bounds[1:], len(times))
+    present = ends > bounds
+
+    rows: list[dict] = []
+    for key in keys:
+        data = samples.values[key][order]
+        valid = ~np.isnan(data)
+        counts = np.add.reduceat(valid, bounds[present]).astype(np.int64)
+        sums = np.add.reduceat(np.where(valid, data, 0.0), bounds[present])
+        mins = np.minimum.reduceat(np.where(valid, data, np.inf), bounds[present])
+        maxs = np.maximum.reduceat(np.where(valid, data, -np.inf), bounds[present])
+        for day, count, total, low, high in zip(
+            (d for d, p in zip(days, present) if p), counts, sums, mins, maxs
+        ):
+            if count:
+                rows.append(
+                    {
+                        "unit": samples.name,
+                        "date": day.isoformat(),
+                        "key": key,
+                        "count": int(count),
+                        "mean": round(float(total / count), 4),
+                        "min": float(low),
+                        "max": float(high),
+                    }
+                )
+    return rows
+
+
+def summarize_file(
+    path: str, dewpoint_delta: float = 1.0, start: float | None = None, end: float | None = None
+) -> list[dict]:
+    """Load one file, derive the values and return its daily summary rows."""
+    samples = load(path)
+    if start is not None or end is not None:
+        keep = (samples.times >= (start if start is not None else -np.inf)) & (
+            samples.times < (end if end is not None else np.inf)
+        )
+        samples = Samples(samples.name, samples.times[keep], {key: v[keep] for key, v in samples.values.items()})
+    samples.values.update(derive(samples.values, dewpoint_delta))
+    return daily_summary(samples, (*INPUT_REGISTERS, *DERIVED_INPUTS))
+
+
+def summarize_files(
+    paths: Sequence[str],
+    workers: int = 1,
+    dewpoint_delta: float = 1.0,
+    start: float | None = None,
+    end: float | None = None,
+) -> list[dict]:
+    """Summarize several files, in workers processes if more than one."""
+    if workers <= 1 or len(paths) <= 1:
+        results = [summarize_file(path, dewpoint_delta, start, end) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+            results = list(
+                executor.map(
+                    summarize_file,
+                    paths,
+                    [dewpoint_delta] * len(paths),
+                    [start] * len(paths),
+                    [end] * len(paths),
+                )
+            )
+    return [row for rows in results for row in rows]
+
+
+def _midnight(value: str, days: int = 0) -> float:
+    """Local midnight starting the day value (YYYY-MM-DD), plus days days."""
+    day = date.fromisoformat(value) + timedelta(days=days)
+    return datetime(day.year, day.month, day.day).timestamp()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Write the daily summary of the given files as CSV; returns the process exit code."""
+    parser = argparse.ArgumentParser(prog="python -m core.analysis", description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", help="history files, or poller captures (.jsonl or .csv)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default 1)")
+    parser.add_argument("--dewpoint-delta", type=float, default=1.0, help="condensation alarm margin (°C)")
+    parser.add_argument("--start", help="first day (YYYY-MM-DD)")
+    parser.add_argument("--end", help="last day (YYYY-MM-DD)")
+    parser.add_argument("--output", help="CSV file to write (default stdout)")
+    args = parser.parse_args(argv)
+
+    rows = summarize_files(
+        args.files,
+        workers=args.workers,
+        dewpoint_delta=args.dewpoint_delta,
+        start=_midnight(args.start) if args.start else None,
+        end=_midnight(args.end, 1) if args.end else None,
+    )
+    stream = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(stream, fieldnames=("unit", "date", "key", "count", "mean", "min", "max"))
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
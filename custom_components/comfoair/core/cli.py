@@ -0,0 +1,234 @@
+"""Headless ComfoAir poller for bench tests of gateways and buses.
+
+Polls a unit with the same read plan and decoding as the Home Assistant
+integration and streams the snapshots as JSON lines or CSV, or measures the bus
+with --benchmark. Run from the integration folder:
+
+    python -m core --host 192.168.1.50
+    python -m core --mode serial --device /dev/ttyUSB0 --format csv --keys 300,303,304
+    python -m core --host 192.168.1.50 --benchmark --count 200
+    python -m core --host 192.168.1.50 --benchmark --profile
+    python -m core --host 192.168.1.50 --scan 0-999
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import csv
+import json
+import logging
+import pstats
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, TextIO
+
+from .const import (
+    CLIENT_PYMODBUS,
+    CLIENTS,
+    DEFAULT_BAUDRATE,
+    DEFAULT_BYTESIZE,
+    DEFAULT_DEVICE_ID,
+    DEFAULT_PARITY,
+    DEFAULT_PORT,
+    DEFAULT_STOPBITS,
+    MODE_SERIAL,
+    MODE_TCP,
+    MODES,
+)
+from .poller import MIN_POLL_DEADLINE, ModbusPoller
+from .snapshot import ComfoAirSnapshot
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m core", description=__doc__.splitlines()[0])
+    connection = parser.add_argument_group("connection")
+    connection.add_argument("--mode", choices=MODES, default=MODE_TCP)
+    connection.add_argument("--host", help="gateway host (network modes)")
+    connection.add_argument("--port", type=int, default=DEFAULT_PORT)
+    connection.add_argument("--device", help="serial port (serial mode)")
+    connection.add_argument("--baudrate", type=int, default=DEFAULT_BAUDRATE)
+    connection.add_argument("--bytesize", type=int, default=DEFAULT_BYTESIZE)
+    connection.add_argument("--parity", default=DEFAULT_PARITY)
+    connection.add_argument("--stopbits", type=int, default=DEFAULT_STOPBITS)
+    connection.add_argument("--device-id", type=int, default=DEFAULT_DEVICE_ID)
+    connection.add_argument(
+        "--client", choices=CLIENTS, default=CLIENT_PYMODBUS, help="Modbus client implementation (default pymodbus)"
+    )
+
+    polling = parser.add_argument_group("polling")
+    polling.add_argument(
+        "--interval", type=float, help="seconds between poll starts (default 5, or 0 with --benchmark)"
+    )
+    polling.add_argument("--count", type=int, help="number of polls (default unlimited, or 100 with --benchmark)")
+    polling.add_argument("--keys", help="comma separated data keys to read and output (default all)")
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    output.add_argument("--benchmark", action="store_true", help="report transactions/s and poll latency instead")
+    output.add_argument("--profile", action="store_true", help="print a cProfile report of the polls to stderr")
+    output.add_argument(
+        "--scan", metavar="FIRST-LAST", help="print which holding registers in this address range the unit supports"
+    )
+    output.add_argument("-v", "--verbose", action="store_true", help="log debug output to stderr")
+
+    args = parser.parse_args(argv)
+    if args.mode == MODE_SERIAL and not args.device:
+        parser.error("--device is required in serial mode")
+    if args.mode != MODE_SERIAL and not args.host:
+        parser.error(f"--host is required in {args.mode} mode")
+    if args.scan is not None:
+        try:
+            first, last = (int(address) for address in args.scan.split("-"))
+        except ValueError:
+            parser.error("--scan takes a range of addresses, like 0-999")
+        if not 0 <= first <= last <= 0xFFFF:
+            parser.error("--scan addresses must be 0-65535, first no higher than last")
+        args.scan = (first, last)
+    if args.interval is None:
+        args.interval = 0.0 if args.benchmark else 5.0
+    if args.count is None:
+        args.count = 100 if args.benchmark else 0
+    return args
+
+
+def _connection_status(failed_ranges: list[tuple[int, int]], read_any: bool) -> str:
+    if not read_any:
+        return "Failed"
+    return "Partial" if failed_ranges else "OK"
+
+
+class _Writer:
+    """Writes snapshots as JSON lines or CSV rows."""
+
+    def __init__(self, stream: TextIO, fmt: str, keys: list[str] | None) -> None:
+        self._stream = stream
+        self._format = fmt
+        self._keys = keys
+        self._csv: csv.DictWriter | None = None
+
+    def write(self, status: str, snapshot: ComfoAirSnapshot) -> None:
+        if self._keys is None:
+            # All decoded, derived and static keys, fixed after the first poll.
+            self._keys = [key for key in snapshot if key != "acquired_monotonic"]
+        row: dict[str, Any] = {"time": datetime.now().isoformat(timespec="milliseconds"), "status": status}
+        for key in self._keys:
+            row[key] = snapshot.get(key)
+        if self._format == "jsonl":
+            self._stream.write(json.dumps(row, separators=(",", ":")) + "\n")
+        else:
+            if self._csv is None:
+                self._csv = csv.DictWriter(self._stream, fieldnames=list(row), extrasaction="ignore")
+                self._csv.writeheader()
+            self._csv.writerow(row)
+        self._stream.flush()
+
+
+def _report(poller: ModbusPoller, latencies: list[float], failed_polls: int, elapsed: float) -> None:
+    polls = len(latencies)
+    print(f"polls:            {polls} ({failed_polls} with failed ranges)")
+    print(f"transactions:     {poller.transactions} in {elapsed:.2f}s = {poller.transactions / elapsed:.1f}/s")
+    print(f"polls/s:          {polls / elapsed:.2f}")
+    print(f"poll overruns:    {poller.poll_overruns}")
+    if polls >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        print(
+            "poll latency ms:  "
+            f"min {min(latencies) * 1000:.1f}  p50 {cuts[49] * 1000:.1f}  p90 {cuts[89] * 1000:.1f}  "
+            f"p99 {cuts[98] * 1000:.1f}  max {max(latencies) * 1000:.1f}"
+        )
+    elif polls:
+        print(f"poll latency ms:  {latencies[0] * 1000:.1f}")
+
+
+def _scan(poller: ModbusPoller, first: int, last: int) -> int:
+    """Print the support map of the registers from first to last as JSON, and the cost of the scan."""
+    start = time.monotonic()
+    scanner = poller.register_scanner(first, last)
+    try:
+        # Reads the model and firmware the map belongs to.
+        _snapshot, _failed_ranges, read_any = poller.read_realtime_data()
+        if not read_any:
+            print("The unit did not answer", file=sys.stderr)
+            return 1
+        while not scanner.done:
+            scanner.step(100)
+    finally:
+        poller.reset_client()
+
+    support_map = scanner.support_map(poller.static_data.get("112"), poller.static_data.get("firmware_version"))
+    json.dump(support_map.as_dict(), sys.stdout)
+    sys.stdout.write("\n")
+    elapsed = time.monotonic() - start
+    print(f"{last - first + 1} addresses in {scanner.requests} requests, {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the poller; returns the process exit code."""
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    poller = ModbusPoller(
+        "cli",
+        args.mode,
+        args.device_id,
+        poll_deadline=max(args.interval, MIN_POLL_DEADLINE),
+        host=args.host,
+        port=args.port,
+        device=args.device,
+        baudrate=args.baudrate,
+        bytesize=args.bytesize,
+        parity=args.parity,
+        stopbits=args.stopbits,
+        client=args.client,
+    )
+    if args.scan is not None:
+        return _scan(poller, *args.scan)
+    keys = [key.strip() for key in args.keys.split(",") if key.strip()] if args.keys else None
+    if keys is not None:
+        poller.set_consumed_keys(keys)
+    writer = None if args.benchmark else _Writer(sys.stdout, args.format, keys)
+
+    latencies: list[float] = []
+    failed_polls = 0
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+    start = time.monotonic()
+    next_poll = start
+    try:
+        while not args.count or len(latencies) < args.count:
+            poll_start = time.monotonic()
+            snapshot, failed_ranges, read_any = poller.read_realtime_data()
+            latencies.append(time.monotonic() - poll_start)
+            if failed_ranges:
+                failed_polls += 1
+            if writer is not None:
+                writer.write(_connection_status(failed_ranges, read_any), snapshot)
+
+            if args.interval:
+                # Fixed rate: polls start on multiples of the interval; late ones are skipped.
+                now = time.monotonic()
+                next_poll += args.interval
+                if next_poll < now:
+                    next_poll += (int((now - next_poll) / args.interval) + 1) * args.interval
+                time.sleep(next_poll - now)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        poller.reset_client()
+
+    if args.benchmark:
+        _report(poller, latencies, failed_polls, time.monotonic() - start)
+    if profiler is not None:
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+    return 0
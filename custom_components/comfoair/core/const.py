@@ -0,0 +1,166 @@
+"""Home Assistant independent constants for the ComfoAir Modbus interface."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+MODE_TCP = "tcp"
+MODE_RTU_OVER_TCP = "rtuovertcp"
+MODE_UDP = "udp"
+MODE_SERIAL = "serial"
+MODES = [MODE_TCP, MODE_RTU_OVER_TCP, MODE_UDP, MODE_SERIAL]
+# Modes that talk to a network gateway (host/port) instead of a local serial port.
+NETWORK_MODES = {MODE_TCP, MODE_RTU_OVER_TCP, MODE_UDP}
+
+# Modbus client implementations: pymodbus, or the built-in FC03-only client.
+CLIENT_PYMODBUS = "pymodbus"
+CLIENT_BUILTIN = "builtin"
+CLIENTS = [CLIENT_PYMODBUS, CLIENT_BUILTIN]
+
+DEFAULT_PORT = 502
+DEFAULT_DEVICE_ID = 1
+DEFAULT_BAUDRATE = 19200
+DEFAULT_BYTESIZE = 8
+DEFAULT_PARITY = "E"
+DEFAULT_STOPBITS = 1
+
+# Modbus exception code for a request that covers an address the unit does not have.
+ILLEGAL_DATA_ADDRESS = 2
+# Protocol limit for one FC03 request.
+MAX_REGISTERS = 125
+
+STATIC_READ_RANGES = [
+    (105, 1),
+    (110, 4),
+    (115, 16),
+]
+
+READ_RANGES = [
+    (101, 1),
+    (300, 23),
+    (325, 3),
+    (328, 7),
+    (336, 3),
+    (344, 2),
+    (400, 3),
+]
+
+ALARM_BITS: dict[str, list[tuple[int, str]]] = {
+    "400": [
+        (0, "T20 temperature sensor"),
+        (1, "T21 temperature sensor"),
+        (2, "T22 temperature sensor"),
+        (3, "T11 temperature sensor"),
+        (4, "T12 temperature sensor"),
+        (5, "RH20 humidity sensor"),
+        (6, "RH22 humidity sensor"),
+        (7, "RH11 humidity sensor"),
+        (8, "RH12 humidity sensor"),
+        (9, "dp12 pressure sensor"),
+        (10, "dp22 pressure sensor"),
+        (11, "exhaust fan speed sensor"),
+        (12, "supply fan speed sensor"),
+        (13, "filter warning"),
+        (14, "filter error"),
+    ],
+    "402": [
+        (0, "preheater overheat"),
+        (1, "preheater location"),
+        (2, "preheater error"),
+        (3, "bypass motor extract"),
+        (4, "bypass motor outdoor"),
+        (5, "frost protection warning"),
+    ],
+}
+
+def alarm_data_key(reg_str: str | int, bit_pos: int) -> str:
+    """Coordinator data key for a single ALARM_BITS entry."""
+    return f"alarm_{reg_str}_{bit_pos}"
+
+
+# Alarm bit data keys whose description contains "warning"; these are gated to
+# the 07:00-23:00 notification window.
+GATED_WARNING_KEYS: set[str] = {
+    alarm_data_key(reg_str, bit_pos)
+    for reg_str, bits in ALARM_BITS.items()
+    for bit_pos, description in bits
+    if "warning" in description.lower()
+}
+
+ON_OFF_STATUS = {
+    0: "OFF",
+    1: "ON",
+}
+
+ENUM_REGISTERS: dict[str, dict[int, str]] = {
+    "101": {
+        0: "Error",
+        1: "Initializing",
+        2: "Self Test",
+        3: "Waiting",
+        10: "Normal",
+        20: "Standby",
+        42: "Maintenance",
+    },
+    "105": {0: "NL", 1: "DE", 2: "FR", 3: "EN"},
+    "111": {0: "Right", 1: "Left"},
+    "112": {0: "E300 P", 2: "E300 RF", 3: "E400 RF"},
+    "325": {0: "Reset bypass position", 1: "End position reached", 2: "Active"},
+    "344": {0: "HRV", 1: "ERV"},
+    "345": {0: "Disabled", 1: "Enabled"},
+}
+
+FIRMWARE_REGISTER = 110
+
+BOOLEAN_REGISTERS = {
+    "318",
+    "319",
+    "337",
+    "338",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class RegisterScaling:
+    """How a numeric register word is turned into a value.
+
+    Values outside min_value-max_value are implausible and decode as None.
+    """
+
+    scale: float = 1.0
+    signed: bool = False
+    precision: int | None = None
+    min_value: float | None = None
+    max_value: float | None = None
+
+
+REGISTER_SCALING: dict[str, RegisterScaling] = {
+    "300": RegisterScaling(scale=0.1, signed=True, precision=1),
+    "301": RegisterScaling(scale=0.1, signed=True, precision=1),
+    "303": RegisterScaling(scale=0.1, signed=True, precision=1),
+    "304": RegisterScaling(scale=0.1, signed=True, precision=1),
+    "305": RegisterScaling(scale=0.1, signed=True, precision=1),
+    "306": RegisterScaling(scale=0.1, precision=1, min_value=0, max_value=100),
+    "307": RegisterScaling(scale=0.1, precision=1, min_value=0, max_value=100),
+    "308": RegisterScaling(scale=0.1, precision=1, min_value=0, max_value=100),
+    "309": RegisterScaling(scale=0.1, precision=1, min_value=0, max_value=100),
+    "310": RegisterScaling(scale=0.1, precision=1, min_value=0, max_value=100),
+    "311": RegisterScaling(scale=0.1, precision=1, min_value=0, max_value=100),
+    "312": RegisterScaling(precision=0),
+    "313": RegisterScaling(precision=0),
+    "314": RegisterScaling(precision=0),
+    "315": RegisterScaling(precision=0),
+    "316": RegisterScaling(scale=0.01, precision=1),
+    "317": RegisterScaling(scale=0.01, precision=1),
+    "320": RegisterScaling(precision=0),
+    "321": RegisterScaling(precision=0),
+    "322": RegisterScaling(scale=0.1, signed=True, precision=1),
+    "326": RegisterScaling(precision=0, min_value=0, max_value=100),
+    "327": RegisterScaling(precision=0, min_value=0, max_value=100),
+    "328": RegisterScaling(precision=0),
+    "329": RegisterScaling(precision=0),
+    "330": RegisterScaling(precision=0),
+    "331": RegisterScaling(precision=0),
+    "334": RegisterScaling(precision=0),
+    "336": RegisterScaling(precision=0),
+}
@@ -0,0 +1,233 @@
+"""Minimal built-in Modbus client that only reads holding registers (function code 0x03).
+
+The integration never issues anything but FC03, so this client skips the pymodbus
+stack: requests are packed into a preallocated buffer, responses are received into
+another one and the register words are copied from it into an array in one call.
+TCP and UDP use MBAP framing; RTU-over-TCP and serial use RTU framing with CRC.
+Serial needs pyserial, which is imported on connect.
+"""
+
+from __future__ import annotations
+
+import socket
+import struct
+import sys
+from array import array
+
+from .const import MAX_REGISTERS, MODE_RTU_OVER_TCP, MODE_SERIAL, MODE_UDP
+
+READ_HOLDING_REGISTERS = 0x03
+
+# MBAP header (transaction id, protocol id, length, unit id) plus the FC03 PDU.
+_MBAP_REQUEST = struct.Struct(">HHHBBHH")
+_MBAP_HEADER = struct.Struct(">HHHB")
+_RTU_REQUEST = struct.Struct(">BBHH")
+_CRC = struct.Struct("<H")
+
+# Largest response: MBAP header, function code, byte count and 125 words.
+_RESPONSE_SIZE = _MBAP_HEADER.size + 2 + 2 * MAX_REGISTERS
+
+_SWAP_WORDS = sys.byteorder == "little"
+
+
+def _crc16_table() -> array:
+    table = array("H")
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC16_TABLE = _crc16_table()
+
+
+def crc16(data) -> int:
+    """Modbus RTU CRC-16 of a bytes-like object."""
+    crc = 0xFFFF
+    table = _CRC16_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+class ModbusFrameError(OSError):
+    """The unit answered with an exception, or with a frame that does not fit the request."""
+
+
+class ModbusExceptionResponse(ModbusFrameError):
+    """The unit answered with a Modbus exception; the frame was complete, so the stream is in step."""
+
+    def __init__(self, exception_code: int) -> None:
+        super().__init__(f"exception response, code {exception_code}")
+        self.exception_code = exception_code
+
+
+class Fc03Client:
+    """Reads holding registers from one unit over TCP, UDP, RTU-over-TCP or serial.
+
+    Mirrors the connected/connect/close part of the pymodbus client API, so the
+    transport can reconnect either client the same way. Errors are raised as OSError
+    (timeouts, closed connections, ModbusFrameError); after one the connection must
+    be closed, since the stream may be out of step; not after a
+    ModbusExceptionResponse, whose frame was received whole.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        device_id: int,
+        host: str | None = None,
+        port: int | None = None,
+        device: str | None = None,
+        baudrate: int | None = None,
+        bytesize: int | None = None,
+        parity: str | None = None,
+        stopbits: int | None = None,
+        timeout: float = 3,
+    ) -> None:
+        self._mode = mode
+        self._unit = device_id
+        self._host = host
+        self._port = port
+        self._device = device
+        self._baudrate = baudrate
+        self._bytesize = bytesize
+        self._parity = parity
+        self._stopbits = stopbits
+        self._timeout = timeout
+        self._rtu = mode in (MODE_SERIAL, MODE_RTU_OVER_TCP)
+
+        self._socket: socket.socket | None = None
+        self._serial = None
+        self._transaction_id = 0
+        self._request = bytearray(_RTU_REQUEST.size + _CRC.size if self._rtu else _MBAP_REQUEST.size)
+        self._response = bytearray(_RESPONSE_SIZE)
+        self._response_view = memoryview(self._response)
+
+    @property
+    def connected(self) -> bool:
+        return self._socket is not None or self._serial is not None
+
+    def connect(self) -> bool:
+        """Open the connection; returns False (after closing) if that failed."""
+        self.close()
+        try:
+            if self._mode == MODE_SERIAL:
+                import serial
+
+                self._serial = serial.Serial(
+                    port=self._device,
+                    baudrate=self._baudrate,
+                    bytesize=self._bytesize,
+                    parity=self._parity,
+                    stopbits=self._stopbits,
+                    timeout=self._timeout,
+                )
+            elif self._mode == MODE_UDP:
+                self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self._socket.settimeout(self._timeout)
+                self._socket.connect((self._host, self._port))
+            else:
+                self._socket = socket.create_connection((self._host, self._port), timeout=self._timeout)
+                self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (OSError, ValueError):
+            # pyserial raises SerialException (an OSError) or ValueError for bad settings.
+            self.close()
+            return False
+        return True
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        if self._serial is not None:
+            self._serial.close()
+            self._serial = None
+
+    def read_holding_registers(self, address: int, count: int) -> array:
+        """Read count holding registers starting at address, as an array of unsigned words."""
+        if not 1 <= count <= MAX_REGISTERS:
+            raise ValueError(f"count must be 1-{MAX_REGISTERS}, got {count}")
+        if self._rtu:
+            return self._read_rtu(address, count)
+        return self._read_mbap(address, count)
+
+    def _read_mbap(self, address: int, count: int) -> array:
+        self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+        _MBAP_REQUEST.pack_into(
+            self._request, 0, self._transaction_id, 0, 6, self._unit, READ_HOLDING_REGISTERS, address, count
+        )
+        view = self._response_view
+        if self._mode == MODE_UDP:
+            self._socket.send(self._request)
+            received = self._socket.recv_into(view)
+            if received < _MBAP_HEADER.size + 2:
+                raise ModbusFrameError(f"short UDP response of {received} bytes")
+        else:
+            self._socket.sendall(self._request)
+            self._receive(view[: _MBAP_HEADER.size])
+            length = _MBAP_HEADER.unpack_from(view)[2]
+            if not 2 <= length - 1 <= _RESPONSE_SIZE - _MBAP_HEADER.size:
+                raise ModbusFrameError(f"invalid MBAP length {length}")
+            received = _MBAP_HEADER.size + length - 1
+            self._receive(view[_MBAP_HEADER.size : received])
+
+        transaction_id, _protocol, _length, unit = _MBAP_HEADER.unpack_from(view)
+        if transaction_id != self._transaction_id or unit != self._unit:
+            raise ModbusFrameError(f"response for transaction {transaction_id} unit {unit}")
+        return self._unpack(_MBAP_HEADER.size, received, count)
+
+    def _read_rtu(self, address: int, count: int) -> array:
+        request = self._request
+        _RTU_REQUEST.pack_into(request, 0, self._unit, READ_HOLDING_REGISTERS, address, count)
+        _CRC.pack_into(request, _RTU_REQUEST.size, crc16(memoryview(request)[: _RTU_REQUEST.size]))
+        if self._serial is not None:
+            self._serial.reset_input_buffer()
+            self._serial.write(request)
+        else:
+            self._socket.sendall(request)
+
+        # Unit id, function code and byte count (or exception code), then the rest.
+        view = self._response_view
+        self._receive(view[:3])
+        if view[1] & 0x80:
+            size = 5
+        else:
+            size = 3 + view[2] + _CRC.size
+            if size > len(view):
+                raise ModbusFrameError(f"invalid byte count {view[2]}")
+        self._receive(view[3:size])
+        if crc16(view[: size - _CRC.size]) != _CRC.unpack_from(view, size - _CRC.size)[0]:
+            raise ModbusFrameError("CRC mismatch")
+        if view[0] != self._unit:
+            raise ModbusFrameError(f"response from unit {view[0]}")
+        return self._unpack(1, size - _CRC.size, count)
+
+    def _unpack(self, pdu: int, end: int, count: int) -> array:
+        """Check the FC03 PDU at response[pdu:end] and return its words."""
+        response = self._response
+        function = response[pdu]
+        if function == READ_HOLDING_REGISTERS | 0x80:
+            raise ModbusExceptionResponse(response[pdu + 1])
+        if function != READ_HOLDING_REGISTERS or response[pdu + 1] != 2 * count or end - pdu - 2 != 2 * count:
+            raise ModbusFrameError(f"unexpected response to reading {count} registers")
+        words = array("H")
+        words.frombytes(self._response_view[pdu + 2 : end])
+        if _SWAP_WORDS:
+            words.byteswap()
+        return words
+
+    def _receive(self, view: memoryview) -> None:
+        """Fill view from the connection, or raise TimeoutError / ConnectionError."""
+        while view:
+            if self._serial is not None:
+                received = self._serial.readinto(view)
+                if not received:
+                    raise TimeoutError("serial read timed out")
+            else:
+                received = self._socket.recv_into(view)
+                if not received:
+                    raise ConnectionError("connection closed by the gateway")
+            view = view[received:]
@@ -0,0 +1,187 @@
+"""Streaming filters for noisy measurements, updated once per poll.
+
+A filter keeps a few numbers of state and does a fixed amount of work per sample,
+so smoothing a value at the source costs next to nothing compared with a template
+or statistics sensor in Home Assistant re-evaluating every state change. Filtered
+values are published under their own key, <source key>_<kind>, next to the raw one.
+
+Samples are timed with the midpoint of the request that read the register (see
+RequestTiming), so irregular polls, retries and slow ranges do not skew the result.
+A sample is only taken when the register was read again; a stale or missing value
+leaves the filter as it was.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import insort
+from collections import deque
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+FILTER_EMA = "ema"
+FILTER_MEDIAN = "median"
+FILTER_RATE = "rate"
+FILTER_KINDS = (FILTER_EMA, FILTER_MEDIAN, FILTER_RATE)
+
+
+@dataclass(frozen=True, slots=True)
+class FilterSpec:
+    """A filter on one value.
+
+    window is the time constant in seconds for ema, and the number of samples for
+    median and rate. A rate is given per per_seconds (60: change per minute). The
+    output is rounded to precision decimals, so a smoothed value that holds steady
+    does not produce a new state every poll.
+    """
+
+    kind: str
+    window: float
+    precision: int | None = None
+    per_seconds: float = 60.0
+
+
+def filtered_key(source: str, kind: str) -> str:
+    return f"{source}_{kind}"
+
+
+def filter_source(key: str) -> str | None:
+    """Return the key a filtered key is computed from, or None if key is not a filtered key."""
+    source, _, kind = key.rpartition("_")
+    return source if source and kind in FILTER_KINDS else None
+
+
+class EmaFilter:
+    """Exponential moving average with a time constant, weighted by the time between samples."""
+
+    __slots__ = ("_tau", "_value", "_time")
+
+    def __init__(self, time_constant: float) -> None:
+        self._tau = time_constant
+        self._value: float | None = None
+        self._time = 0.0
+
+    def update(self, value: float, sample_time: float) -> float | None:
+        if self._value is None:
+            self._value = value
+        else:
+            elapsed = sample_time - self._time
+            if elapsed <= 0:
+                return self._value
+            self._value += (1.0 - math.exp(-elapsed / self._tau)) * (value - self._value)
+        self._time = sample_time
+        return self._value
+
+
+class MedianFilter:
+    """Median of the last window samples; removes single-sample spikes.
+
+    The window is small and fixed, so keeping it sorted is a constant amount of work.
+    """
+
+    __slots__ = ("_samples", "_sorted", "_time")
+
+    def __init__(self, window: int) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._sorted: list[float] = []
+        self._time: float | None = None
+
+    def update(self, value: float, sample_time: float) -> float | None:
+        samples = self._samples
+        if self._time is not None and sample_time <= self._time:
+            return self._median()
+        if len(samples) == samples.maxlen:
+            self._sorted.remove(samples[0])
+        samples.append(value)
+        insort(self._sorted, value)
+        self._time = sample_time
+        return self._median()
+
+    def _median(self) -> float | None:
+        ordered = self._sorted
+        if not ordered:
+            return None
+        middle = len(ordered) // 2
+        if len(ordered) % 2:
+            return ordered[middle]
+        return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+class RateFilter:
+    """Change per per_seconds between the oldest and newest of the last window samples."""
+
+    __slots__ = ("_samples", "_per_seconds")
+
+    def __init__(self, window: int, per_seconds: float) -> None:
+        self._samples: deque[tuple[float, float]] = deque(maxlen=max(window, 2))
+        self._per_seconds = per_seconds
+
+    def update(self, value: float, sample_time: float) -> float | None:
+        samples = self._samples
+        if not samples or sample_time > samples[-1][1]:
+            samples.append((value, sample_time))
+        if len(samples) < 2:
+            return None
+        first_value, first_time = samples[0]
+        last_value, last_time = samples[-1]
+        return (last_value - first_value) / (last_time - first_time) * self._per_seconds
+
+
+def _make_filter(spec: FilterSpec) -> EmaFilter | MedianFilter | RateFilter:
+    if spec.kind == FILTER_EMA:
+        return EmaFilter(spec.window)
+    if spec.kind == FILTER_MEDIAN:
+        return MedianFilter(int(spec.window))
+    if spec.kind == FILTER_RATE:
+        return RateFilter(int(spec.window), spec.per_seconds)
+    raise ValueError(f"Unknown filter kind {spec.kind!r}")
+
+
+class FilterBank:
+    """The filters of one unit, by filtered key, with their state between polls.
+
+    Not thread safe; only the thread that polls updates it.
+    """
+
+    def __init__(self, specs: Mapping[str, Sequence[FilterSpec]]) -> None:
+        self._filters: dict[str, tuple[str, FilterSpec, EmaFilter | MedianFilter | RateFilter]] = {
+            filtered_key(source, spec.kind): (source, spec, _make_filter(spec))
+            for source, source_specs in specs.items()
+            for spec in source_specs
+        }
+        self._outputs: dict[str, float | None] = {}
+
+    @property
+    def keys(self) -> frozenset[str]:
+        return frozenset(self._filters)
+
+    def update(self, snapshot: Any, keys: Iterable[str] | None = None) -> tuple[dict[str, Any], frozenset[str]]:
+        """Feed the registers read in snapshot to the filters of keys (all if None).
+
+        Returns the filtered values, and the filtered keys whose source value is stale
+        or missing; those keep their last output.
+        """
+        values: dict[str, Any] = {}
+        stale: set[str] = set()
+        for key in self._filters if keys is None else keys:
+            entry = self._filters.get(key)
+            if entry is None:
+                continue
+            source, spec, stream = entry
+            value = snapshot.get(source)
+            timing = snapshot.timing(source)
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and timing is not None
+                and not snapshot.is_stale(source)
+            ):
+                output = stream.update(float(value), timing.monotonic)
+                if output is not None and spec.precision is not None:
+                    output = round(output, spec.precision)
+                self._outputs[key] = output
+            else:
+                stale.add(key)
+            values[key] = self._outputs.get(key)
+        return values, frozenset(stale)
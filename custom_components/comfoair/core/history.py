@@ -0,0 +1,342 @@
+"""Persistent history of the raw register words of every poll, outside any database.
+
+One memory-mapped file per unit holds a ring of fixed-size blocks; once all blocks
+are used, the oldest one is overwritten. A block is made of fixed-size record slots
+of SLOT_COUNT bytes payload each. The first record of a block is a key record
+holding the full words of one poll, spread over two slots. Every following poll is
+a delta record in a single slot, holding the signed 8-bit change of each word since
+the previous poll. A poll with a change that does not fit is stored as a key record
+again. Temperatures, humidities and flows change by less than that per poll, so a
+poll takes about half the space of its raw words.
+
+Every record also carries the poll's timestamp and a bit mask of the words that
+were read in that poll (or are still current); other words read back as None.
+The file survives restarts. Each open starts a new block.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Iterable
+
+from .snapshot import REGISTER_SLOTS, SLOT_COUNT, ComfoAirSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"CAHIST\x00\x00"
+VERSION = 1
+# Record slots per block. A block is written sequentially and read back as a whole.
+BLOCK_SLOTS = 256
+# Seconds a block may span; record timestamps are stored as a float32 offset from the block start.
+MAX_BLOCK_SPAN = 86400.0
+
+# magic, version, slot count, slots per block, block count, last written block, next block sequence
+FILE_HEADER = struct.Struct("<8sHHIIIQ")
+# start time, sequence (0 = never written), record slots used
+BLOCK_HEADER = struct.Struct("<dQI")
+# seconds since the block start, fresh word mask (plus KEY_FLAG)
+RECORD_HEADER = struct.Struct("<fQ")
+KEY_FLAG = 1 << 63
+_NO_BLOCK = 0xFFFFFFFF
+
+RECORD_SIZE = RECORD_HEADER.size + SLOT_COUNT
+BLOCK_SIZE = BLOCK_HEADER.size + BLOCK_SLOTS * RECORD_SIZE
+_SWAP_BYTES = sys.byteorder != "little"
+
+if SLOT_COUNT > 63:
+    raise ImportError("history records cannot hold more than 63 register slots")
+
+
+def blocks_for(retention: float, interval: float) -> int:
+    """Return the blocks needed to keep retention seconds of polls every interval seconds."""
+    return max(2, math.ceil(retention / interval / (BLOCK_SLOTS - 1)) + 1)
+
+
+def _allocate(file, size: int) -> None:
+    """Reserve size bytes of disk space for file.
+
+    Done up front, since writing to a sparse mapping on a full disk kills the process.
+    """
+    if hasattr(os, "posix_fallocate"):
+        os.posix_fallocate(file.fileno(), 0, size)
+    else:
+        file.truncate(size)
+
+
+class HistoryStore:
+    """Ring buffer of raw poll words in a memory-mapped file.
+
+    append() and close() may be called from one thread while query() runs on
+    others; a query skips blocks that were overwritten while it read them. close()
+    waits for running queries, and a query of a closed store finds nothing.
+    """
+
+    def __init__(self, path: str, blocks: int) -> None:
+        self.path = path
+        self.blocks = blocks
+        self._lock = threading.Lock()
+        # Queries reading the mapped file; close() waits for them.
+        self._readers = 0
+        self._readers_done = threading.Condition(self._lock)
+        self._file = None
+        self._mm: mmap.mmap | None = None
+        self._open()
+
+        # Writer state: the block being filled and the words as of the last record.
+        self._block: int | None = None
+        self._start = 0.0
+        self._used = 0
+        self._words = array("H", bytes(2 * SLOT_COUNT))
+
+    def _open(self) -> None:
+        size = FILE_HEADER.size + self.blocks * BLOCK_SIZE
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as existing:
+                header = existing.read(FILE_HEADER.size)
+            if len(header) == FILE_HEADER.size:
+                magic, version, slot_count, block_slots, blocks, _head, _sequence = FILE_HEADER.unpack(header)
+                if (magic, version, slot_count, block_slots) != (MAGIC, VERSION, SLOT_COUNT, BLOCK_SLOTS):
+                    _LOGGER.warning("History file %s has an unknown layout, moving it aside", self.path)
+                    os.replace(self.path, f"{self.path}.bak")
+                elif blocks != self.blocks:
+                    self._resize(blocks)
+
+        created = not os.path.exists(self.path)
+        self._file = open(self.path, "w+b" if created else "r+b")
+        try:
+            if created:
+                _allocate(self._file, size)
+            self._mm = mmap.mmap(self._file.fileno(), size)
+        except BaseException:
+            self._file.close()
+            if created:
+                os.remove(self.path)
+            raise
+        if created:
+            FILE_HEADER.pack_into(self._mm, 0, MAGIC, VERSION, SLOT_COUNT, BLOCK_SLOTS, self.blocks, _NO_BLOCK, 1)
+            _LOGGER.info("Created history file %s (%s blocks, %.1f MB)", self.path, self.blocks, size / 1e6)
+
+    def _resize(self, old_blocks: int) -> None:
+        """Copy the newest blocks of a file with old_blocks blocks into one with self.blocks blocks."""
+        _LOGGER.info("Resizing history file %s from %s to %s blocks", self.path, old_blocks, self.blocks)
+        tmp_path = f"{self.path}.tmp"
+        with open(self.path, "rb") as old, open(tmp_path, "w+b") as new:
+            _magic, _version, _slots, _block_slots, _blocks, _head, next_sequence = FILE_HEADER.unpack(
+                old.read(FILE_HEADER.size)
+            )
+            order = []
+            for index in range(old_blocks):
+                old.seek(FILE_HEADER.size + index * BLOCK_SIZE)
+                _start, sequence, _used = BLOCK_HEADER.unpack(old.read(BLOCK_HEADER.size))
+                if sequence:
+                    order.append((sequence, index))
+            order.sort()
+            kept = order[-self.blocks :]
+            _allocate(new, FILE_HEADER.size + self.blocks * BLOCK_SIZE)
+            for new_index, (_sequence, index) in enumerate(kept):
+                old.seek(FILE_HEADER.size + index * BLOCK_SIZE)
+                new.seek(FILE_HEADER.size + new_index * BLOCK_SIZE)
+                new.write(old.read(BLOCK_SIZE))
+            new.seek(0)
+            head = len(kept) - 1 if kept else _NO_BLOCK
+            new.write(
+                FILE_HEADER.pack(MAGIC, VERSION, SLOT_COUNT, BLOCK_SLOTS, self.blocks, head, next_sequence)
+            )
+        os.replace(tmp_path, self.path)
+
+    def close(self) -> None:
+        """Flush the file and unmap it; later appends are ignored."""
+        with self._lock:
+            self._readers_done.wait_for(lambda: not self._readers)
+            if self._mm is None:
+                return
+            self._mm.flush()
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+    def append(self, timestamp: float, snapshot: ComfoAirSnapshot) -> None:
+        """Record the words of a poll taken at timestamp (seconds since the epoch)."""
+        words, mask = snapshot.fresh_words()
+        with self._lock:
+            mm = self._mm
+            if mm is None:
+                return
+            previous = self._words
+            new_block = self._block is None or timestamp - self._start > MAX_BLOCK_SPAN
+            key = new_block or self._used + 1 > BLOCK_SLOTS
+            if not key:
+                # Stale or missing words keep their previous value, so they never force a key record.
+                try:
+                    deltas = array(
+                        "b",
+                        [
+                            word - previous[slot] if mask >> slot & 1 else 0
+                            for slot, word in enumerate(words)
+                        ],
+                    )
+                except OverflowError:
+                    key = True
+            if key:
+                if new_block or self._used + 2 > BLOCK_SLOTS:
+                    self._start_block(mm, timestamp)
+                self._write_key(mm, timestamp, mask, words)
+                self._words = array("H", words)
+            else:
+                offset = self._slot_offset(self._used)
+                RECORD_HEADER.pack_into(mm, offset, timestamp - self._start, mask)
+                mm[offset + RECORD_HEADER.size : offset + RECORD_SIZE] = deltas.tobytes()
+                self._set_used(mm, self._used + 1)
+                for slot in range(SLOT_COUNT):
+                    if mask >> slot & 1:
+                        previous[slot] = words[slot]
+
+    def _slot_offset(self, slot: int) -> int:
+        return FILE_HEADER.size + self._block * BLOCK_SIZE + BLOCK_HEADER.size + slot * RECORD_SIZE
+
+    def _set_used(self, mm: mmap.mmap, used: int) -> None:
+        # The slot count is updated after the record is written, so readers never see half a record.
+        self._used = used
+        struct.pack_into("<I", mm, FILE_HEADER.size + self._block * BLOCK_SIZE + 16, used)
+
+    def _start_block(self, mm: mmap.mmap, timestamp: float) -> None:
+        """Take the block after the last written one (the oldest, once the ring is full)."""
+        _magic, _version, _slots, _block_slots, _blocks, head, sequence = FILE_HEADER.unpack_from(mm, 0)
+        if self._block is not None:
+            # Flush the finished block, so a power cut loses at most the block being filled.
+            start = FILE_HEADER.size + self._block * BLOCK_SIZE
+            page_start = start - start % mmap.ALLOCATIONGRANULARITY
+            mm.flush(page_start, start + BLOCK_SIZE - page_start)
+        self._block = 0 if head == _NO_BLOCK else (head + 1) % self.blocks
+        self._start = timestamp
+        self._used = 0
+        BLOCK_HEADER.pack_into(mm, FILE_HEADER.size + self._block * BLOCK_SIZE, timestamp, sequence, 0)
+        FILE_HEADER.pack_into(
+            mm, 0, MAGIC, VERSION, SLOT_COUNT, BLOCK_SLOTS, self.blocks, self._block, sequence + 1
+        )
+
+    def _write_key(self, mm: mmap.mmap, timestamp: float, mask: int, words: array) -> None:
+        if _SWAP_BYTES:
+            words = array("H", words)
+            words.byteswap()
+        payload = words.tobytes()
+        for part in range(2):
+            offset = self._slot_offset(self._used + part)
+            RECORD_HEADER.pack_into(mm, offset, timestamp - self._start, mask | KEY_FLAG)
+            mm[offset + RECORD_HEADER.size : offset + RECORD_SIZE] = payload[
+                part * SLOT_COUNT : (part + 1) * SLOT_COUNT
+            ]
+        self._set_used(mm, self._used + 2)
+
+    def query(
+        self, start: float, end: float, addresses: Iterable[int] | None = None, limit: int | None = None
+    ) -> tuple[list[float], dict[int, list[int | None]]]:
+        """Return the polls from start up to end (seconds since the epoch) as columns.
+
+        Returns the poll timestamps and, per register address, the raw words of those
+        polls, None where the word was not read. addresses defaults to all realtime
+        registers. At most limit polls are returned, the earliest ones.
+        Words are decoded straight from the mapped file; only the requested
+        registers are reconstructed.
+        """
+        addresses = list(REGISTER_SLOTS if addresses is None else addresses)
+        slots = [REGISTER_SLOTS[address] for address in addresses]
+        times: list[float] = []
+        columns: list[list[int | None]] = [[] for _ in slots]
+        with self._lock:
+            mm = self._mm
+            if mm is None:
+                return times, dict(zip(addresses, columns))
+            self._readers += 1
+        try:
+            self._query_blocks(mm, start, end, slots, limit, times, columns)
+        finally:
+            with self._lock:
+                self._readers -= 1
+                self._readers_done.notify_all()
+        return times, dict(zip(addresses, columns))
+
+    def _query_blocks(
+        self,
+        mm: mmap.mmap,
+        start: float,
+        end: float,
+        slots: list[int],
+        limit: int | None,
+        times: list[float],
+        columns: list[list[int | None]],
+    ) -> None:
+        blocks = []
+        for index in range(self.blocks):
+            block_start, sequence, _used = BLOCK_HEADER.unpack_from(mm, FILE_HEADER.size + index * BLOCK_SIZE)
+            if sequence:
+                blocks.append((sequence, block_start, index))
+        blocks.sort()
+
+        for position, (sequence, block_start, index) in enumerate(blocks):
+            if block_start > end:
+                break
+            if position + 1 < len(blocks) and blocks[position + 1][1] < start:
+                # The next block starts before the range, so this one ends before it.
+                continue
+            block_times, block_columns = self._read_block(mm, index, block_start, slots, start, end)
+            if BLOCK_HEADER.unpack_from(mm, FILE_HEADER.size + index * BLOCK_SIZE)[1] != sequence:
+                # Overwritten by the writer while being read.
+                continue
+            times.extend(block_times)
+            for column, block_column in zip(columns, block_columns):
+                column.extend(block_column)
+            if limit is not None and len(times) >= limit:
+                del times[limit:]
+                for column in columns:
+                    del column[limit:]
+                break
+
+    def _read_block(
+        self, mm: mmap.mmap, index: int, block_start: float, slots: list[int], start: float, end: float
+    ) -> tuple[list[float], list[list[int | None]]]:
+        base = FILE_HEADER.size + index * BLOCK_SIZE
+        used = struct.unpack_from("<I", mm, base + 16)[0]
+        times: list[float] = []
+        columns: list[list[int | None]] = [[] for _ in slots]
+        current = [0] * len(slots)
+        position = 0
+        while position < used:
+            offset = base + BLOCK_HEADER.size + position * RECORD_SIZE
+            seconds, mask = RECORD_HEADER.unpack_from(mm, offset)
+            if mask & KEY_FLAG:
+                if position + 2 > used:
+                    break
+                payload = mm[offset + RECORD_HEADER.size : offset + RECORD_SIZE] + mm[
+                    offset + RECORD_SIZE + RECORD_HEADER.size : offset + 2 * RECORD_SIZE
+                ]
+                words = array("H", payload)
+                if _SWAP_BYTES:
+                    words.byteswap()
+                current = [words[slot] for slot in slots]
+                position += 2
+            else:
+                deltas = mm[offset + RECORD_HEADER.size : offset + RECORD_SIZE]
+                for column, slot in enumerate(slots):
+                    delta = deltas[slot]
+                    if delta:
+                        current[column] = (current[column] + (delta - 256 if delta > 127 else delta)) & 0xFFFF
+                position += 1
+
+            timestamp = block_start + seconds
+            if timestamp < start:
+                continue
+            if timestamp > end:
+                break
+            times.append(timestamp)
+            for column, slot in enumerate(slots):
+                columns[column].append(current[column] if mask >> slot & 1 else None)
+        return times, columns
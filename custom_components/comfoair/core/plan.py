@@ -0,0 +1,94 @@
+"""Read plan: which register ranges a poll requests, and how often."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from .const import MAX_REGISTERS, READ_RANGES
+from .filters import filter_source
+from .psychrometrics import DERIVED_INPUTS
+from .snapshot import REGISTER_SLOTS
+
+
+def registers_for_key(key: str) -> set[int]:
+    """Return the realtime register addresses a data key is decoded, derived or filtered from."""
+    source = filter_source(key)
+    if source is not None:
+        return registers_for_key(source)
+    if key in DERIVED_INPUTS:
+        return {int(register) for register in DERIVED_INPUTS[key]}
+    if key.startswith("alarm_"):
+        # alarm_<register> and alarm_<register>_<bit>
+        key = key.split("_")[1]
+    if key.isdigit() and int(key) in REGISTER_SLOTS:
+        return {int(key)}
+    return set()
+
+
+def build_read_plan(
+    registers: Iterable[int],
+    slow_registers: Iterable[int] = (),
+    slow_interval: float = 0,
+    unsupported: Iterable[int] = (),
+) -> list[tuple[int, int, float]]:
+    """Shrink READ_RANGES to the (start, count, refresh interval) requests covering the given registers.
+
+    Each range is cut down to the span between its first and last needed register;
+    gaps inside a span are still read, since one request is cheaper than two, unless
+    they hold an address the unit is known not to support (from its profile or a
+    register scan), which is never read. Ranges without any needed
+    register are dropped. A span whose needed registers are all slow only has to be
+    read every slow_interval seconds; otherwise its slow registers come along with
+    the realtime ones for free.
+    """
+    needed = set(registers)
+    slow = set(slow_registers)
+    unsupported = set(unsupported)
+    plan: list[tuple[int, int, float]] = []
+    for start, count in READ_RANGES:
+        wanted: list[int] = []
+        # One past the range ends the last span, like an unsupported address.
+        for address in range(start, start + count + 1):
+            if address == start + count or address in unsupported:
+                if wanted:
+                    interval = slow_interval if slow.issuperset(wanted) else 0
+                    plan.append((wanted[0], wanted[-1] - wanted[0] + 1, interval))
+                    wanted = []
+            elif address in needed:
+                wanted.append(address)
+    return plan
+
+
+def merge_extra_ranges(
+    planned: Sequence[tuple[int, int]], extra: Iterable[tuple[int, int]], max_count: int = MAX_REGISTERS
+) -> list[tuple[tuple[int, int], list[tuple[int, int]]]]:
+    """Fold extra (start, count) ranges into the planned ranges they overlap or adjoin.
+
+    Returns the requests that read the extra ranges, each as ((start, count), the
+    planned ranges it also covers). An extra range next to a planned one widens that
+    request instead of costing one of its own; ranges are only joined while the
+    request stays within max_count registers, and never across a gap.
+    """
+    # (start, end, is_planned); groups are runs of spans joined into one request.
+    spans = sorted(
+        [(start, start + count, True) for start, count in planned]
+        + [(start, start + count, False) for start, count in extra]
+    )
+    groups: list[list[tuple[int, int, bool]]] = []
+    group_end = 0
+    for start, end, is_planned in spans:
+        if groups and start <= group_end and max(end, group_end) - groups[-1][0][0] <= max_count:
+            groups[-1].append((start, end, is_planned))
+            group_end = max(group_end, end)
+        else:
+            groups.append([(start, end, is_planned)])
+            group_end = end
+
+    requests: list[tuple[tuple[int, int], list[tuple[int, int]]]] = []
+    for group in groups:
+        if all(is_planned for _, _, is_planned in group):
+            continue
+        start = group[0][0]
+        end = max(end for _, end, _ in group)
+        requests.append(((start, end - start), [(s, e - s) for s, e, is_planned in group if is_planned]))
+    return requests
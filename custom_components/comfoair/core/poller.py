@@ -0,0 +1,512 @@
+"""Modbus polling of a ComfoAir unit: read plan, retries and decoding.
+
+Nothing here depends on Home Assistant; the integration's hub runs a poller on its
+worker thread, and the command line tool runs one directly.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Collection, Iterable, Mapping, Sequence
+from datetime import datetime
+from typing import Any
+
+from .alarms import ALL_ALARM_KEYS
+from .const import CLIENT_PYMODBUS, ENUM_REGISTERS, FIRMWARE_REGISTER, READ_RANGES, STATIC_READ_RANGES
+from .filters import FilterBank, FilterSpec
+from .plan import build_read_plan, merge_extra_ranges, registers_for_key
+from .profiles import RegisterProfile, select_profile
+from .psychrometrics import DERIVED_INPUTS, derive_values, with_dependencies
+from .scan import RegisterScanner, SupportMap
+from .snapshot import KEY_DECODERS, REGISTER_SLOTS, ComfoAirSnapshot, LastGoodCache
+from .transport import REQUEST_TIMEOUT, ModbusTransport, RequestTiming
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_READ_RETRIES = 3
+# Retries (beyond the first attempt per range) allowed in a single poll, across all ranges.
+MAX_POLL_RETRIES = 3
+RETRY_DELAY = 0.3
+# A poll may take at most one scan interval, but never less than this many seconds.
+MIN_POLL_DEADLINE = 5
+
+
+def format_firmware_version(raw_value: int) -> str | None:
+    """Convert raw firmware register to a readable firmware version string."""
+    if raw_value <= 0:
+        return None
+
+    major = raw_value // 10000
+    minor = (raw_value % 10000) // 100
+    patch = raw_value % 100
+
+    if patch > 0:
+        return f"{major}.{minor:02d}.{patch:02d}"
+    return f"{major}.{minor:02d}"
+
+
+def _plan_registers(read_plan: Iterable[tuple[int, int, float]]) -> set[int]:
+    return {address for start, count, _ in read_plan for address in range(start, start + count)}
+
+
+class ModbusPoller:
+    """Reads and decodes the registers of one ComfoAir unit.
+
+    Not thread safe: all calls must come from one thread (or be serialized), since
+    they share the Modbus transport.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        mode: str,
+        device_id: int,
+        poll_deadline: float,
+        host: str | None = None,
+        port: int | None = None,
+        device: str | None = None,
+        baudrate: int | None = None,
+        bytesize: int | None = None,
+        parity: str | None = None,
+        stopbits: int | None = None,
+        dewpoint_delta: float = 1.0,
+        last_good: LastGoodCache | None = None,
+        client: str = CLIENT_PYMODBUS,
+        request_timeout: float = REQUEST_TIMEOUT,
+        filters: Mapping[str, Sequence[FilterSpec]] | None = None,
+    ) -> None:
+        self._name = name
+        self._dewpoint_delta = float(dewpoint_delta)
+
+        # The client is created lazily, on the thread that polls.
+        self._transport = ModbusTransport(
+            mode,
+            device_id,
+            host=host,
+            port=port,
+            device=device,
+            baudrate=baudrate,
+            bytesize=bytesize,
+            parity=parity,
+            stopbits=stopbits,
+            client=client,
+            timeout=request_timeout,
+        )
+        self.static_data: dict = {}
+        self.last_successful_read: datetime | None = None
+        # Polls that hit their deadline or retry budget.
+        self.poll_overruns = 0
+        self._poll_deadline = poll_deadline
+        self._retries_left = MAX_POLL_RETRIES
+        self._poll_overrun = False
+        self._deferred_ranges: set[tuple[int, int]] = set()
+        self._last_good = last_good if last_good is not None else LastGoodCache(0)
+
+        # Until the unit's profile and the used keys are known everything is read and
+        # derived. Plan entries are (start, count, refresh interval in seconds).
+        self._profile: RegisterProfile | None = None
+        self._support_map: SupportMap | None = None
+        self._consumed_keys: frozenset[str] | None = None
+        self._read_plan: list[tuple[int, int, float]] = [(start, count, 0) for start, count in READ_RANGES]
+        self._range_read_at: dict[tuple[int, int], float] = {}
+        self._derived_keys: frozenset[str] = frozenset(DERIVED_INPUTS)
+        # Streaming filters on register values; None: all of them are updated.
+        self._filters = FilterBank(filters or {})
+        self._filter_keys: frozenset[str] | None = None
+        # Words of the extra ranges read along with the last poll, by (start, count).
+        self.extra_words: dict[tuple[int, int], list[int]] = {}
+
+    def update_settings(self, poll_deadline: float, dewpoint_delta: float) -> None:
+        """Apply changed options; takes effect from the next poll."""
+        self._poll_deadline = poll_deadline
+        self._dewpoint_delta = float(dewpoint_delta)
+
+    @property
+    def transactions(self) -> int:
+        """Modbus requests sent so far."""
+        return self._transport.transactions
+
+    @property
+    def decoders(self) -> Mapping[str, tuple[int, Callable[[int], Any]]]:
+        """Data key -> (slot, decoder) table of the unit's register profile."""
+        return self._profile.decoders if self._profile is not None else KEY_DECODERS
+
+    def reset_client(self) -> None:
+        """Close the current Modbus client, if any, so the next read reconnects."""
+        self._transport.close()
+
+    def set_consumed_keys(self, keys: Iterable[str] | None) -> None:
+        """Limit reads, derived and filtered values to the data keys that enabled entities use.
+
+        None restores the full read plan. Alarm keys are always kept, so the alarm
+        monitor keeps working with all alarm entities disabled.
+        """
+        if keys is None:
+            self._consumed_keys = None
+            derived_keys = frozenset(DERIVED_INPUTS)
+            self._filter_keys = None
+        else:
+            self._consumed_keys = frozenset(keys) | ALL_ALARM_KEYS
+            derived_keys = with_dependencies(self._consumed_keys)
+            self._filter_keys = self._consumed_keys & self._filters.keys
+
+        if derived_keys != self._derived_keys:
+            _LOGGER.debug("Derived values for %s: %s", self._name, sorted(derived_keys))
+        self._derived_keys = derived_keys
+        self._update_read_plan()
+
+    @property
+    def read_plan(self) -> list[tuple[int, int, float]]:
+        """(start, count, refresh interval) requests of a poll."""
+        return self._read_plan
+
+    def set_support_map(self, support_map: SupportMap | None) -> None:
+        """Leave registers a scan found unsupported out of the read plan.
+
+        The map only applies once the unit's model and firmware are read and match it.
+        """
+        self._support_map = support_map
+        self._update_read_plan()
+
+    @property
+    def unsupported_registers(self) -> frozenset[int]:
+        """Registers the support map of this unit's model and firmware says it does not have."""
+        support_map = self._support_map
+        if support_map is None or not self.static_data:
+            return frozenset()
+        if not support_map.matches(self.static_data.get("112"), self.static_data.get("firmware_version")):
+            return frozenset()
+        return support_map.unsupported
+
+    def register_scanner(self, first: int, last: int) -> RegisterScanner:
+        """Return a scan of the registers from first to last over this poller's connection.
+
+        Its steps must run on the thread that polls, like every other call here.
+        """
+        return RegisterScanner(self._transport, first, last)
+
+    def _update_read_plan(self) -> None:
+        """Rebuild the read plan from the unit's profile, the support map and the consumed keys.
+
+        The plan is replaced as a whole, so a poll running on another thread sees
+        either the old or the new one.
+        """
+        profile = self._profile
+        unsupported = self.unsupported_registers
+        supported = (profile.registers if profile is not None else frozenset(REGISTER_SLOTS)) - unsupported
+        if self._consumed_keys is None:
+            wanted = set(supported)
+        else:
+            wanted: set[int] = set()
+            for key in (*self._consumed_keys, *self._derived_keys):
+                wanted |= registers_for_key(key)
+            wanted &= supported
+
+        if profile is not None:
+            unsupported |= profile.unsupported
+            read_plan = build_read_plan(wanted, profile.slow_registers, profile.slow_interval, unsupported)
+        else:
+            read_plan = build_read_plan(wanted, unsupported=unsupported)
+
+        if read_plan != self._read_plan:
+            _LOGGER.debug("Read plan for %s: %s", self._name, read_plan)
+            # Words of registers that are no longer read would otherwise pass for fresh ones forever.
+            self._last_good.invalidate(_plan_registers(self._read_plan) - _plan_registers(read_plan))
+        self._read_plan = read_plan
+
+    def live_plan(self, registers: Iterable[int]) -> list[tuple[int, int]]:
+        """Return the fewest (start, count) requests covering the supported ones among registers."""
+        profile = self._profile
+        unsupported = self.unsupported_registers
+        supported = (profile.registers if profile is not None else frozenset(REGISTER_SLOTS)) - unsupported
+        if profile is not None:
+            unsupported |= profile.unsupported
+        return [
+            (start, count) for start, count, _ in build_read_plan(set(registers) & supported, unsupported=unsupported)
+        ]
+
+    def read_live(
+        self, plan: Iterable[tuple[int, int]], keys: Collection[str]
+    ) -> tuple[dict[str, Any], RequestTiming | None]:
+        """Read the requests of a live plan once, without retries.
+
+        Returns the decoded values of the register keys in keys that were read, and
+        the timing of the last request that got an answer.
+        """
+        decoders = self.decoders
+        values: dict[str, Any] = {}
+        timing: RequestTiming | None = None
+        for start, count in plan:
+            registers = self._transport.read_holding_registers(start, count)
+            if registers is None:
+                continue
+            timing = self._transport.last_timing
+            for offset, word in enumerate(registers):
+                key = str(start + offset)
+                decoder = decoders.get(key)
+                if key in keys and decoder is not None:
+                    values[key] = decoder[1](word)
+        return values, timing
+
+    def supports(self, key: str) -> bool:
+        """Return True if the unit's register profile has every register key needs."""
+        registers = registers_for_key(key)
+        if registers & self.unsupported_registers:
+            return False
+        if self._profile is None:
+            return True
+        return self._profile.supports(registers)
+
+    def _read_ranges(
+        self, ranges: list[tuple[int, int]], deadline: float
+    ) -> tuple[list[tuple[int, list[int], RequestTiming]], list[tuple[int, int]]]:
+        """Read a list of (start, count) register ranges within the poll deadline and retry budget.
+
+        Returns (start, registers, timing of the successful request) chunks and the
+        ranges that failed.
+
+        Each range gets up to MAX_READ_RETRIES attempts, but retries also draw from the
+        per-poll budget in self._retries_left. Once the deadline passes or the budget is
+        spent, the remaining ranges are skipped and reported as failed, so the poll returns
+        promptly with whatever was read.
+        """
+        chunks: list[tuple[int, list[int], RequestTiming]] = []
+        failed_ranges: list[tuple[int, int]] = []
+
+        for index, (start, count) in enumerate(ranges):
+            if time.monotonic() >= deadline:
+                self._poll_overrun = True
+                failed_ranges.extend(ranges[index:])
+                _LOGGER.warning("Poll deadline reached, skipping ranges %s", ranges[index:])
+                break
+
+            success = False
+            for attempt in range(MAX_READ_RETRIES):
+                if attempt > 0:
+                    if self._retries_left <= 0 or time.monotonic() + RETRY_DELAY >= deadline:
+                        self._poll_overrun = True
+                        break
+                    self._retries_left -= 1
+                    time.sleep(RETRY_DELAY)
+
+                registers = self._transport.read_holding_registers(start, count)
+                if registers is not None:
+                    chunks.append((start, registers, self._transport.last_timing))
+                    _LOGGER.debug(
+                        "Read %s registers from %s-%s on attempt %s",
+                        count,
+                        start,
+                        start + count - 1,
+                        attempt + 1,
+                    )
+                    success = True
+                    break
+                _LOGGER.warning(
+                    "Attempt %s failed for range %s-%s",
+                    attempt + 1,
+                    start,
+                    start + count - 1,
+                )
+            if not success:
+                failed_ranges.append((start, count))
+
+        if failed_ranges:
+            _LOGGER.warning("Some ranges failed: %s. Proceeding with available data.", failed_ranges)
+
+        return chunks, failed_ranges
+
+    def _prioritized_ranges(self) -> list[tuple[int, int]]:
+        """Return the ranges due in this poll, with those missed in the previous poll first.
+
+        A range with a refresh interval is due once that long has passed since it was last read.
+        """
+        now = time.monotonic()
+        due = [
+            (start, count)
+            for start, count, interval in self._read_plan
+            if not interval
+            or (start, count) not in self._range_read_at
+            or now - self._range_read_at[(start, count)] >= interval
+        ]
+        deferred = [r for r in due if r in self._deferred_ranges]
+        return deferred + [r for r in due if r not in self._deferred_ranges]
+
+    def _read_extra_ranges(
+        self, extra_ranges: set[tuple[int, int]], ranges: list[tuple[int, int]], deadline: float
+    ) -> tuple[list[tuple[int, list[int], RequestTiming]], list[tuple[int, int]]]:
+        """Read extra ranges together with the due ranges they overlap or adjoin.
+
+        A request that widens a due range, or reads extra ranges on their own, gets a
+        single attempt outside the retry budget: an address the unit does not have
+        fails the whole request, and the due ranges in it are then read on their own
+        as usual. Returns the chunks of the due ranges read this way and the due
+        ranges still to be read.
+        """
+        chunks: list[tuple[int, list[int], RequestTiming]] = []
+        done: set[tuple[int, int]] = set()
+        for (start, count), covered in merge_extra_ranges(ranges, extra_ranges):
+            if covered == [(start, count)]:
+                # The extra ranges lie within a due range, which is read anyway.
+                continue
+            if time.monotonic() >= deadline:
+                break
+            registers = self._transport.read_holding_registers(start, count)
+            if registers is None:
+                _LOGGER.debug("Extra read of %s-%s failed", start, start + count - 1)
+                continue
+            self._store_extra_words(extra_ranges, start, registers)
+            for covered_start, covered_count in covered:
+                offset = covered_start - start
+                chunks.append(
+                    (covered_start, registers[offset : offset + covered_count], self._transport.last_timing)
+                )
+                done.add((covered_start, covered_count))
+        return chunks, [r for r in ranges if r not in done]
+
+    def _store_extra_words(self, extra_ranges: set[tuple[int, int]], start: int, registers) -> None:
+        for extra_start, extra_count in extra_ranges:
+            offset = extra_start - start
+            if 0 <= offset <= len(registers) - extra_count and (extra_start, extra_count) not in self.extra_words:
+                self.extra_words[(extra_start, extra_count)] = list(registers[offset : offset + extra_count])
+
+    def _read_static_data(self, deadline: float) -> None:
+        """Read static device registers once and cache them in static_data."""
+        _LOGGER.debug("Start reading static data")
+        chunks, failed_ranges = self._read_ranges(STATIC_READ_RANGES, deadline)
+
+        if len(failed_ranges) == len(STATIC_READ_RANGES):
+            return
+
+        registers = {
+            start + offset: value for start, values, _timing in chunks for offset, value in enumerate(values)
+        }
+
+        static: dict = {}
+
+        for register in ("105", "111", "112"):
+            reg_int = int(register)
+            if reg_int in registers:
+                raw = registers[reg_int]
+                static[register] = ENUM_REGISTERS[register].get(raw, raw)
+            else:
+                static[register] = None
+
+        if FIRMWARE_REGISTER in registers:
+            static["firmware_version"] = format_firmware_version(registers[FIRMWARE_REGISTER])
+        else:
+            static["firmware_version"] = None
+
+        bl_reg = FIRMWARE_REGISTER + 3
+        if bl_reg in registers:
+            raw_bl = registers[bl_reg]
+            if raw_bl > 0:
+                bl_major = raw_bl // 100
+                bl_minor = raw_bl % 100
+                static["bootloader_version"] = f"{bl_major}.{bl_minor:02d}"
+                static["hardware_version"] = f"{bl_minor:02d}"
+            else:
+                static["bootloader_version"] = None
+                static["hardware_version"] = None
+        else:
+            static["bootloader_version"] = None
+            static["hardware_version"] = None
+
+        serial_chars = [
+            chr(registers[reg])
+            for reg in range(115, 131)
+            if reg in registers and 0x20 <= registers[reg] <= 0x7E
+        ]
+        static["serial_number"] = "".join(serial_chars).rstrip() or None
+
+        self.static_data = static
+
+        try:
+            self._profile = select_profile(static["112"], static["firmware_version"])
+        except (OSError, ValueError) as err:
+            _LOGGER.error("Could not select a register profile, reading all registers: %s", err)
+        else:
+            _LOGGER.info(
+                "Using register profile %s for model %s, firmware %s",
+                self._profile.name,
+                static["112"],
+                static["firmware_version"],
+            )
+        # The profile and a support map for this model and firmware apply from now on.
+        self._update_read_plan()
+        _LOGGER.debug("Finished reading static data")
+
+    def read_realtime_data(
+        self, extra_ranges: Iterable[tuple[int, int]] = ()
+    ) -> tuple[ComfoAirSnapshot, list[tuple[int, int]], bool]:
+        """Read realtime sensor values within the poll deadline and retry budget.
+
+        Returns the snapshot, the ranges that could not be read (served from the
+        last-good cache where possible) and whether anything was read at all. Any
+        extra (start, count) ranges are read along, merged into the poll's own requests
+        where they overlap or adjoin; their words end up in extra_words.
+        """
+        poll_start = time.monotonic()
+        deadline = poll_start + self._poll_deadline
+        self._retries_left = MAX_POLL_RETRIES
+        self._poll_overrun = False
+
+        if not self.static_data:
+            self._read_static_data(deadline)
+
+        _LOGGER.debug("Start reading realtime data")
+        acquired = time.monotonic()
+        ranges = self._prioritized_ranges()
+        extra_ranges = set(extra_ranges)
+        self.extra_words = {}
+        merged_chunks: list[tuple[int, list[int], RequestTiming]] = []
+        if extra_ranges:
+            merged_chunks, ranges = self._read_extra_ranges(extra_ranges, ranges, deadline)
+        chunks, failed_ranges = self._read_ranges(ranges, deadline)
+        for start, registers, _timing in chunks:
+            # Extra ranges within a due range.
+            self._store_extra_words(extra_ranges, start, registers)
+        chunks = merged_chunks + chunks
+        self._deferred_ranges = set(failed_ranges)
+        for start, registers, _timing in chunks:
+            self._range_read_at[(start, len(registers))] = acquired
+
+        if self._poll_overrun or time.monotonic() > deadline:
+            self.poll_overruns += 1
+            _LOGGER.warning(
+                "Poll took %.1fs (deadline %ss), %s overruns so far",
+                time.monotonic() - poll_start,
+                self._poll_deadline,
+                self.poll_overruns,
+            )
+
+        # Derived values are filled in below, before the snapshot is handed out.
+        values: dict = {}
+        snapshot = self._last_good.snapshot(chunks, failed_ranges, acquired, values, self.static_data, self.decoders)
+
+        # Only the derived values that are used are computed.
+        derived = self._derived_keys
+        values.update(derive_values(snapshot, derived, self._dewpoint_delta))
+
+        # Filters take one sample per register read, timed by its request.
+        filtered, stale_values = self._filters.update(snapshot, self._filter_keys)
+        values.update(filtered)
+
+        # Monotonic time at which the realtime reads of this snapshot started.
+        values["acquired_monotonic"] = acquired
+
+        if failed_ranges:
+            stale_values |= frozenset(
+                key
+                for key, inputs in DERIVED_INPUTS.items()
+                if key in derived
+                and any(snapshot.is_stale(register) for register in inputs)
+            )
+        if stale_values:
+            snapshot = snapshot.with_stale_values(stale_values)
+
+        if chunks:
+            # When the last response of this poll came in.
+            self.last_successful_read = datetime.fromtimestamp(max(timing.received_time for _, _, timing in chunks))
+        _LOGGER.debug("Finished reading realtime data")
+        return snapshot, failed_ranges, bool(chunks)
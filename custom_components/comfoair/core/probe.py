@@ -0,0 +1,132 @@
+"""Pre-flight checks of a connection: does a ComfoAir unit answer, and how fast.
+
+Used by the config flow before an entry is created. Everything here blocks, so
+callers on an event loop run it in an executor; probes of different endpoints
+can run concurrently, since each uses its own connection.
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from .const import CLIENT_BUILTIN, CLIENT_PYMODBUS, ENUM_REGISTERS
+from .poller import ModbusPoller
+from .transport import ModbusTransport
+
+# Seconds a probe request may take; a unit on a working bus answers well within this.
+PROBE_TIMEOUT = 1.0
+# Polls timed by benchmark(), and the time it may spend on them in total.
+BENCHMARK_POLLS = 10
+BENCHMARK_BUDGET = 5.0
+# A poll should take at most this fraction of the scan interval, leaving room for
+# retries and a busy bus.
+POLL_SHARE = 0.25
+# A unit may fail up to this fraction of the timed polls and still pass: a flaky bus
+# is covered by the poller's retries and last-good values, a dead one is not.
+MAX_FAILED_SHARE = 0.5
+MODEL_REGISTER = 112
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    """Outcome of benchmark() for one endpoint."""
+
+    model: str | None
+    firmware_version: str | None
+    # Mean round trip of a request (sent to answer received), and median seconds per
+    # full poll of the read plan.
+    latency: float
+    poll_time: float
+    # Slowest poll seen, which the recommendation is based on.
+    max_poll_time: float
+    polls_per_second: float
+    recommended_scan_interval: int
+    # Polls timed, and how many of them had a range that failed; those are not in the times.
+    polls: int
+    failed_polls: int
+
+
+def recommended_scan_interval(poll_time: float) -> int:
+    """Return the shortest whole-second scan interval a poll of poll_time seconds fits in comfortably."""
+    return max(1, math.ceil(poll_time / POLL_SHARE))
+
+
+def identify(mode: str, device_id: int, client: str = CLIENT_BUILTIN, **connection: Any) -> str | None:
+    """Read the model register once; returns the model name, or None if nothing answered.
+
+    connection holds the ModbusTransport keyword arguments (host, port, device, ...).
+    The built-in client is the default here since it does not retry, so an endpoint
+    that does not answer fails after a single PROBE_TIMEOUT.
+    """
+    transport = ModbusTransport(mode, device_id, client=client, timeout=PROBE_TIMEOUT, **connection)
+    try:
+        registers = transport.read_holding_registers(MODEL_REGISTER, 1)
+    finally:
+        transport.close()
+    if registers is None:
+        return None
+    raw = registers[0]
+    return str(ENUM_REGISTERS[str(MODEL_REGISTER)].get(raw, raw))
+
+
+def benchmark(
+    mode: str,
+    device_id: int,
+    client: str = CLIENT_PYMODBUS,
+    polls: int = BENCHMARK_POLLS,
+    budget: float = BENCHMARK_BUDGET,
+    **connection: Any,
+) -> ProbeResult | None:
+    """Time full polls of the read plan; returns None if the unit did not answer.
+
+    Stops after polls polls, or earlier once budget seconds have passed. The first
+    poll also reads the static registers and is not timed. A single identify() read
+    goes first, so an endpoint that does not answer fails fast instead of after the
+    poller's retries. Polls with a failed range are counted, not timed; more than
+    MAX_FAILED_SHARE of them counts as no answer.
+    """
+    if identify(mode, device_id, **connection) is None:
+        return None
+    poller = ModbusPoller(
+        "probe", mode, device_id, poll_deadline=budget, client=client, request_timeout=PROBE_TIMEOUT, **connection
+    )
+    poll_times: list[float] = []
+    failed_polls = 0
+    round_trips: list[float] = []
+    try:
+        _snapshot, _failed, read_any = poller.read_realtime_data()
+        if not read_any:
+            return None
+        start = time.monotonic()
+        while len(poll_times) + failed_polls < polls and time.monotonic() - start < budget:
+            poll_start = time.monotonic()
+            snapshot, failed_ranges, _read_any = poller.read_realtime_data()
+            if failed_ranges:
+                # Retries and timeouts would skew the times.
+                failed_polls += 1
+                continue
+            poll_times.append(time.monotonic() - poll_start)
+            # One timing per request of this poll; slow registers not due keep older ones.
+            timings = {timing for _start, _count, timing in snapshot.range_timings()}
+            round_trips.extend(timing.round_trip for timing in timings if timing.sent_monotonic >= poll_start)
+    finally:
+        poller.reset_client()
+
+    if not poll_times or failed_polls > MAX_FAILED_SHARE * (len(poll_times) + failed_polls):
+        return None
+    poll_time = statistics.median(poll_times)
+    return ProbeResult(
+        model=poller.static_data.get("112"),
+        firmware_version=poller.static_data.get("firmware_version"),
+        latency=statistics.fmean(round_trips) if round_trips else 0.0,
+        poll_time=poll_time,
+        max_poll_time=max(poll_times),
+        polls_per_second=1 / poll_time if poll_time else math.inf,
+        recommended_scan_interval=recommended_scan_interval(max(poll_times)),
+        polls=len(poll_times) + failed_polls,
+        failed_polls=failed_polls,
+    )
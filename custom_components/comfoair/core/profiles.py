@@ -0,0 +1,121 @@
+"""Model- and firmware-specific register profiles for the ComfoAir integration.
+
+The profiles are declared in profiles.json: the realtime registers with their
+refresh class (and optionally their scaling), and per model/firmware the registers
+a unit does not support or decodes differently. New models only need an entry there.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from .snapshot import REGISTER_SLOTS, build_key_decoders
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILES_FILE = Path(__file__).with_name("profiles.json")
+
+REFRESH_REALTIME = "realtime"
+
+
+@dataclass(frozen=True)
+class RegisterProfile:
+    """Compiled register profile, shared by every hub with the same model and firmware."""
+
+    name: str
+    # Realtime registers the unit supports.
+    registers: frozenset[int]
+    # Realtime registers the profile declares unsupported; never read, not even in a gap.
+    unsupported: frozenset[int]
+    # Supported registers that only need reading every slow_interval seconds.
+    slow_registers: frozenset[int]
+    slow_interval: float
+    decoders: Mapping[str, tuple[int, Callable[[int], Any]]]
+
+    def supports(self, registers: set[int]) -> bool:
+        """Return True if all given registers are supported."""
+        return registers <= self.registers
+
+
+def _version_tuple(version: str | None) -> tuple[int, ...] | None:
+    if not version:
+        return None
+    try:
+        return tuple(int(part) for part in version.split("."))
+    except ValueError:
+        return None
+
+
+@cache
+def _load_definitions() -> dict[str, Any]:
+    """Read profiles.json once. Does blocking I/O, so call it from the worker thread."""
+    return json.loads(PROFILES_FILE.read_text(encoding="utf-8"))
+
+
+def _matches(definition: Mapping[str, Any], model: str | None, firmware: tuple[int, ...] | None) -> bool:
+    if "models" in definition and model not in definition["models"]:
+        return False
+    if "firmware_min" in definition:
+        if firmware is None or firmware < _version_tuple(definition["firmware_min"]):
+            return False
+    if "firmware_max" in definition:
+        if firmware is None or firmware >= _version_tuple(definition["firmware_max"]):
+            return False
+    return True
+
+
+@cache
+def _compile_profile(index: int) -> RegisterProfile:
+    definitions = _load_definitions()
+    definition = definitions["profiles"][index]
+    refresh_classes: dict[str, float] = definitions["refresh_classes"]
+
+    registers: dict[str, dict[str, Any]] = {
+        key: dict(attributes) for key, attributes in definitions["registers"].items()
+    }
+    for key, attributes in definition.get("registers", {}).items():
+        registers.setdefault(key, {}).update(attributes)
+    for key in definition.get("unsupported", ()):
+        registers.pop(key, None)
+
+    for key in [key for key in registers if int(key) not in REGISTER_SLOTS]:
+        _LOGGER.warning("Register %s in profile %s is not in a read range, ignoring it", key, definition["name"])
+        del registers[key]
+
+    slow_classes = {refresh for refresh in refresh_classes if refresh != REFRESH_REALTIME}
+    return RegisterProfile(
+        name=definition["name"],
+        registers=frozenset(int(key) for key in registers),
+        unsupported=frozenset(int(key) for key in definition.get("unsupported", ()) if int(key) in REGISTER_SLOTS),
+        slow_registers=frozenset(
+            int(key) for key, attributes in registers.items() if attributes.get("refresh") in slow_classes
+        ),
+        # One slow interval keeps the read plan simple; it is the shortest slow class.
+        slow_interval=min((refresh_classes[refresh] for refresh in slow_classes), default=0),
+        decoders=MappingProxyType(
+            build_key_decoders(
+                (int(key) for key in registers),
+                {key: attributes for key, attributes in registers.items() if "scale" in attributes or "signed" in attributes},
+            )
+        ),
+    )
+
+
+@cache
+def select_profile(model: str | None, firmware_version: str | None) -> RegisterProfile:
+    """Return the first profile matching the unit's model and firmware version.
+
+    Does blocking I/O on first use, so call it from the worker thread.
+    """
+    firmware = _version_tuple(firmware_version)
+    for index, definition in enumerate(_load_definitions()["profiles"]):
+        if _matches(definition, model, firmware):
+            return _compile_profile(index)
+    raise ValueError(f"No register profile matches model {model} firmware {firmware_version}")
@@ -0,0 +1,123 @@
+"""Values derived from the ComfoAir temperature, humidity and flow registers."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Collection, Mapping
+from typing import Any
+
+# (prefix, temperature register, humidity register) per air stream.
+AIR_STREAMS = (
+    ("extract", "304", "308"),
+    ("exhaust", "305", "309"),
+    ("intake", "300", "306"),
+    ("supply", "303", "307"),
+)
+
+# Register keys each derived value is computed from.
+DERIVED_INPUTS: dict[str, tuple[str, ...]] = {
+    **{
+        f"{prefix}_{kind}": (temp_reg, rh_reg)
+        for prefix, temp_reg, rh_reg in AIR_STREAMS
+        for kind in ("absolute_humidity", "enthalpy", "dewpoint")
+    },
+    "temperature_efficiency": ("303", "304"),
+    "flow_balance": ("313", "312"),
+    "supply_condensation_alarm": ("303", "307", "304"),
+}
+
+# Derived values that are computed from other derived values.
+DERIVED_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    **{f"{prefix}_enthalpy": (f"{prefix}_absolute_humidity",) for prefix, _, _ in AIR_STREAMS},
+    "supply_condensation_alarm": ("supply_dewpoint",),
+}
+
+
+def with_dependencies(keys: Collection[str]) -> frozenset[str]:
+    """Return the derived keys among keys, plus the derived keys they are computed from."""
+    pending = [key for key in keys if key in DERIVED_INPUTS]
+    derived: set[str] = set()
+    while pending:
+        key = pending.pop()
+        if key not in derived:
+            derived.add(key)
+            pending.extend(DERIVED_DEPENDENCIES.get(key, ()))
+    return frozenset(derived)
+
+
+def absolute_humidity(temp_c: float, rh_percent: float) -> float | None:
+    """Absolute humidity in kg/kg dry air (mixing ratio)."""
+    try:
+        e_s = 6.112 * math.exp(17.67 * temp_c / (temp_c + 243.5))
+        e = (rh_percent / 100.0) * e_s
+        return round(0.622 * e / (1013.25 - e), 4)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def dewpoint(temp_c: float, rh_percent: float) -> float | None:
+    """Dew point temperature in °C (Magnus formula)."""
+    try:
+        e = (rh_percent / 100.0) * 6.112 * math.exp(17.67 * temp_c / (temp_c + 243.5))
+        ln_e = math.log(e / 6.112)
+        return round(243.5 * ln_e / (17.67 - ln_e), 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def enthalpy(temp_c: float, abs_humidity: float) -> float | None:
+    """Enthalpy of moist air in kJ/kg dry air."""
+    try:
+        return round(1.006 * temp_c + abs_humidity * (2501 + 1.86 * temp_c), 1)
+    except (TypeError, ValueError):
+        return None
+
+
+def derive_values(data: Mapping[str, Any], keys: Collection[str], dewpoint_delta: float) -> dict[str, Any]:
+    """Compute the derived values in keys from the decoded registers in data.
+
+    keys must include the dependencies of each key, see with_dependencies.
+    """
+    values: dict[str, Any] = {}
+    for prefix, temp_reg, rh_reg in AIR_STREAMS:
+        abs_key = f"{prefix}_absolute_humidity"
+        enthalpy_key = f"{prefix}_enthalpy"
+        dewpoint_key = f"{prefix}_dewpoint"
+        if abs_key not in keys and dewpoint_key not in keys:
+            continue
+        temp = data.get(temp_reg)
+        rh = data.get(rh_reg)
+        if abs_key in keys:
+            abs_hum = absolute_humidity(temp, rh) if temp is not None and rh is not None else None
+            values[abs_key] = abs_hum
+            if enthalpy_key in keys:
+                values[enthalpy_key] = enthalpy(temp, abs_hum) if temp is not None and abs_hum is not None else None
+        if dewpoint_key in keys:
+            values[dewpoint_key] = dewpoint(temp, rh) if temp is not None and rh is not None else None
+
+    if "temperature_efficiency" in keys:
+        t_supply = data.get("303")
+        t_extract = data.get("304")
+        if t_supply is not None and t_extract is not None and abs(t_extract) >= 1.0:
+            raw = (t_supply / t_extract) * 100
+            values["temperature_efficiency"] = round(max(0.0, min(100.0, raw)), 1)
+        else:
+            values["temperature_efficiency"] = None
+
+    if "flow_balance" in keys:
+        supply_flow = data.get("313")
+        extract_flow = data.get("312")
+        if supply_flow is not None and extract_flow is not None:
+            values["flow_balance"] = round(supply_flow - extract_flow, 0)
+        else:
+            values["flow_balance"] = None
+
+    if "supply_condensation_alarm" in keys:
+        supply_dewpoint = values["supply_dewpoint"]
+        t_extract = data.get("304")
+        if supply_dewpoint is not None and t_extract is not None:
+            values["supply_condensation_alarm"] = supply_dewpoint >= (t_extract - dewpoint_delta)
+        else:
+            values["supply_condensation_alarm"] = None
+
+    return values
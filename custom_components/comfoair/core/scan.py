@@ -0,0 +1,132 @@
+"""Discovery of the holding registers a unit supports.
+
+A unit answers a read with Illegal Data Address as soon as the range holds one
+address it does not have. The scan reads as many registers at once as it can, up
+to 125: a request the unit rejects is bisected down to its first unsupported
+address, and after a successful read the next one is twice as long. A run of supported
+registers costs a few requests however long it is; only each unsupported address
+takes a request of its own, which no scan based on the exception can avoid.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from .const import ILLEGAL_DATA_ADDRESS, MAX_REGISTERS
+from .transport import ModbusTransport
+
+
+@dataclass(frozen=True, slots=True)
+class SupportMap:
+    """Which addresses from first to last a unit with this model and firmware supports.
+
+    Addresses in neither set could not be scanned (the unit did not answer).
+    """
+
+    model: str | None
+    firmware_version: str | None
+    first: int
+    last: int
+    supported: frozenset[int]
+    unsupported: frozenset[int]
+
+    def matches(self, model: str | None, firmware_version: str | None) -> bool:
+        """Return True if the map was made on a unit with this model and firmware."""
+        return self.model == model and self.firmware_version == firmware_version
+
+    def as_dict(self) -> dict[str, Any]:
+        """JSON-serializable form, with the address sets as [first, last] ranges."""
+        return {
+            "model": self.model,
+            "firmware_version": self.firmware_version,
+            "first": self.first,
+            "last": self.last,
+            "supported": address_ranges(self.supported),
+            "unsupported": address_ranges(self.unsupported),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SupportMap:
+        return cls(
+            model=data["model"],
+            firmware_version=data["firmware_version"],
+            first=data["first"],
+            last=data["last"],
+            supported=frozenset(a for first, last in data["supported"] for a in range(first, last + 1)),
+            unsupported=frozenset(a for first, last in data["unsupported"] for a in range(first, last + 1)),
+        )
+
+
+def address_ranges(addresses: Iterable[int]) -> list[list[int]]:
+    """Collapse addresses into sorted [first, last] runs."""
+    ranges: list[list[int]] = []
+    for address in sorted(addresses):
+        if ranges and ranges[-1][1] == address - 1:
+            ranges[-1][1] = address
+        else:
+            ranges.append([address, address])
+    return ranges
+
+
+class RegisterScanner:
+    """Scan of the addresses from first to last, run a limited number of requests at a time.
+
+    Not thread safe; the transport must only be used from the thread that runs step().
+    """
+
+    def __init__(self, transport: ModbusTransport, first: int, last: int) -> None:
+        self._transport = transport
+        self.first = first
+        self.last = last
+        self.supported: set[int] = set()
+        self.unsupported: set[int] = set()
+        self.requests = 0
+        self._address = first
+        self._size = MAX_REGISTERS
+        # Once a request was rejected: the end of a range known to hold an unsupported address.
+        self._bad_before: int | None = None
+
+    @property
+    def done(self) -> bool:
+        return self._address > self.last
+
+    def step(self, max_requests: int) -> None:
+        """Send up to max_requests requests, continuing where the previous step stopped.
+
+        A request that fails for another reason than Illegal Data Address is skipped;
+        its addresses end up in neither set.
+        """
+        transport = self._transport
+        sent = 0
+        while self._address <= self.last and sent < max_requests:
+            address = self._address
+            if self._bad_before is not None:
+                if self._bad_before - address == 1:
+                    self.unsupported.add(address)
+                    self._address += 1
+                    self._bad_before = None
+                    self._size = 1
+                    continue
+                count = (self._bad_before - address) // 2
+            else:
+                count = min(self._size, self.last + 1 - address)
+
+            sent += 1
+            if transport.read_holding_registers(address, count) is not None:
+                self.supported.update(range(address, address + count))
+                self._address += count
+                self._size = min(count * 2, MAX_REGISTERS)
+            elif transport.last_exception_code == ILLEGAL_DATA_ADDRESS:
+                self._bad_before = address + count
+            else:
+                self._address += count
+                self._bad_before = None
+        self.requests += sent
+
+    def support_map(self, model: str | None, firmware_version: str | None) -> SupportMap:
+        """The result so far, for a unit of this model and firmware."""
+        return SupportMap(
+            model, firmware_version, self.first, self.last, frozenset(self.supported), frozenset(self.unsupported)
+        )
@@ -0,0 +1,328 @@
+"""Compact, array-backed coordinator data for the ComfoAir integration."""
+
+from __future__ import annotations
+
+import logging
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from itertools import chain
+from types import MappingProxyType
+from typing import Any
+
+from .const import (
+    ALARM_BITS,
+    BOOLEAN_REGISTERS,
+    ENUM_REGISTERS,
+    ON_OFF_STATUS,
+    READ_RANGES,
+    REGISTER_SCALING,
+    RegisterScaling,
+    alarm_data_key,
+)
+from .transport import RequestTiming
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _build_register_slots() -> dict[int, int]:
+    slots: dict[int, int] = {}
+    for start, count in READ_RANGES:
+        for address in range(start, start + count):
+            slots[address] = len(slots)
+    return slots
+
+
+# Register address -> slot in the raw word array. Shared by every snapshot.
+REGISTER_SLOTS: Mapping[int, int] = MappingProxyType(_build_register_slots())
+SLOT_COUNT = len(REGISTER_SLOTS)
+_SLOT_ADDRESSES = tuple(REGISTER_SLOTS)
+_EMPTY_WORDS = array("H", bytes(2 * SLOT_COUNT))
+_NO_TIMINGS: tuple[RequestTiming | None, ...] = (None,) * SLOT_COUNT
+
+
+def _compile_register_decoder(
+    key: str, scale: float | None = None, signed: bool | None = None
+) -> Callable[[int], Any]:
+    """Return a function turning a raw word into the value for register key.
+
+    scale and signed override REGISTER_SCALING, e.g. from a register profile.
+    """
+    if key in ENUM_REGISTERS:
+        mapping = ENUM_REGISTERS[key]
+        return lambda raw: mapping.get(raw, raw)
+
+    if key in BOOLEAN_REGISTERS:
+        return lambda raw: ON_OFF_STATUS.get(raw, raw)
+
+    scaling = REGISTER_SCALING.get(key, RegisterScaling())
+    scale = scaling.scale if scale is None else scale
+    signed = scaling.signed if signed is None else signed
+    precision = scaling.precision
+    min_value = scaling.min_value
+    max_value = scaling.max_value
+
+    def decode(raw: int) -> float | None:
+        if signed and raw >= 0x8000:
+            raw -= 0x10000
+        value = raw * scale
+        if precision is not None:
+            value = round(value, precision)
+        if (min_value is not None and value < min_value) or (max_value is not None and value > max_value):
+            _LOGGER.debug("%s: value %s outside range %s-%s", key, value, min_value, max_value)
+            return None
+        return value
+
+    return decode
+
+
+def _compile_alarm_decoder(bit_pos: int) -> Callable[[int], bool]:
+    mask = 1 << bit_pos
+    return lambda raw: bool(raw & mask)
+
+
+def build_key_decoders(
+    registers: Iterable[int] | None = None,
+    overrides: Mapping[str, Mapping[str, Any]] | None = None,
+) -> dict[str, tuple[int, Callable[[int], Any]]]:
+    """Compile the data key -> (slot, decoder) table.
+
+    Only register keys in registers are included (all of them if None); overrides
+    maps a register key to scale/signed replacing the entity description's. Alarm
+    keys are always included.
+    """
+    supported = None if registers is None else set(registers)
+    overrides = overrides or {}
+    decoders: dict[str, tuple[int, Callable[[int], Any]]] = {}
+    for address, slot in REGISTER_SLOTS.items():
+        key = str(address)
+        if key not in REGISTER_SCALING and key not in ENUM_REGISTERS and key not in BOOLEAN_REGISTERS:
+            continue
+        if supported is not None and address not in supported:
+            continue
+        override = overrides.get(key, {})
+        decoders[key] = (slot, _compile_register_decoder(key, override.get("scale"), override.get("signed")))
+    for reg_str, bits in ALARM_BITS.items():
+        slot = REGISTER_SLOTS[int(reg_str)]
+        for bit_pos, _ in bits:
+            decoders[alarm_data_key(reg_str, bit_pos)] = (slot, _compile_alarm_decoder(bit_pos))
+    return decoders
+
+
+# Data key -> (slot, decoder). Scaling, enum mapping, rounding and range validation
+# happen on access.
+KEY_DECODERS: Mapping[str, tuple[int, Callable[[int], Any]]] = MappingProxyType(build_key_decoders())
+
+
+class ComfoAirSnapshot(Mapping[str, Any]):
+    """Read-only coordinator data for one poll, backed by the raw register words.
+
+    Register and alarm keys are decoded from the word array when accessed, with the
+    decoder table of the unit's register profile. Derived and status values live in a
+    small per-poll dict, and the static device data is shared between snapshots rather
+    than copied. Words that failed to read in this poll but are served from the
+    last-good cache are flagged as stale. Each word keeps the timing of the request
+    that read it, stale ones too, so consumers can tell how old a value really is.
+    """
+
+    __slots__ = ("_words", "_valid", "_stale", "_values", "_stale_values", "_static", "_decoders", "_timings")
+
+    def __init__(
+        self,
+        words: array,
+        valid: bytearray,
+        stale: bytearray,
+        values: dict[str, Any],
+        stale_values: frozenset[str],
+        static: Mapping[str, Any],
+        decoders: Mapping[str, tuple[int, Callable[[int], Any]]] = KEY_DECODERS,
+        timings: Sequence[RequestTiming | None] = _NO_TIMINGS,
+    ) -> None:
+        self._words = words
+        self._valid = valid
+        self._stale = stale
+        self._values = values
+        self._stale_values = stale_values
+        self._static = static
+        self._decoders = decoders
+        self._timings = timings
+
+    @classmethod
+    def empty(cls, static: Mapping[str, Any] | None = None) -> ComfoAirSnapshot:
+        """Snapshot without any register values."""
+        return cls(_EMPTY_WORDS, bytearray(SLOT_COUNT), bytearray(SLOT_COUNT), {}, frozenset(), static or {})
+
+    def raw(self, address: int) -> int | None:
+        """Return the undecoded word for a register address, or None if it is not available."""
+        slot = REGISTER_SLOTS.get(address)
+        if slot is None or not self._valid[slot]:
+            return None
+        return self._words[slot]
+
+    def fresh_words(self) -> tuple[array, int]:
+        """Return the raw words by slot, and a bit mask of the slots holding a current word.
+
+        A slot is current if it was read in this poll, or was not due and is still valid;
+        missing and stale slots are left out of the mask.
+        """
+        valid = self._valid
+        stale = self._stale
+        mask = 0
+        for slot in range(SLOT_COUNT):
+            if valid[slot] and not stale[slot]:
+                mask |= 1 << slot
+        return self._words, mask
+
+    def is_stale(self, key: str) -> bool:
+        """Return True if the value for key comes from the last-good cache instead of this poll."""
+        decoder = self._decoders.get(key)
+        if decoder is not None:
+            return bool(self._stale[decoder[0]])
+        return key in self._stale_values
+
+    def timing(self, key: str) -> RequestTiming | None:
+        """Return the timing of the request that read the word behind a register or alarm key.
+
+        None for other keys and for registers without a value.
+        """
+        decoder = self._decoders.get(key)
+        if decoder is None or not self._valid[decoder[0]]:
+            return None
+        return self._timings[decoder[0]]
+
+    def range_timings(self) -> list[tuple[int, int, RequestTiming]]:
+        """Return (start address, count, timing) for each run of valid registers read by one request."""
+        runs: list[tuple[int, int, RequestTiming]] = []
+        valid = self._valid
+        previous = None
+        for slot, timing in enumerate(self._timings):
+            if timing is None or not valid[slot]:
+                previous = None
+                continue
+            address = _SLOT_ADDRESSES[slot]
+            if timing is previous and runs[-1][0] + runs[-1][1] == address:
+                start, count, _ = runs[-1]
+                runs[-1] = (start, count + 1, timing)
+            else:
+                runs.append((address, 1, timing))
+            previous = timing
+        return runs
+
+    def replace(self, **values: Any) -> ComfoAirSnapshot:
+        """Return a snapshot sharing this one's registers, with some values replaced."""
+        return ComfoAirSnapshot(
+            self._words,
+            self._valid,
+            self._stale,
+            {**self._values, **values},
+            self._stale_values,
+            self._static,
+            self._decoders,
+            self._timings,
+        )
+
+    def with_stale_values(self, keys: frozenset[str]) -> ComfoAirSnapshot:
+        """Return a snapshot sharing this one's data, with the given value keys flagged as stale."""
+        return ComfoAirSnapshot(
+            self._words, self._valid, self._stale, self._values, keys, self._static, self._decoders, self._timings
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        decoder = self._decoders.get(key)
+        if decoder is not None:
+            slot, decode = decoder
+            return decode(self._words[slot]) if self._valid[slot] else None
+        if key in self._values:
+            return self._values[key]
+        return self._static[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        decoder = self._decoders.get(key)
+        if decoder is not None:
+            slot, decode = decoder
+            return decode(self._words[slot]) if self._valid[slot] else None
+        if key in self._values:
+            return self._values[key]
+        return self._static.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._decoders or key in self._values or key in self._static
+
+    def __iter__(self) -> Iterator[str]:
+        return chain(self._decoders, self._values, self._static)
+
+    def __len__(self) -> int:
+        return len(self._decoders) + len(self._values) + len(self._static)
+
+    def __repr__(self) -> str:
+        return f"ComfoAirSnapshot({dict(self)!r})"
+
+
+class LastGoodCache:
+    """Last successfully read word per register slot, with the timing of the request that read it.
+
+    Only used from the hub's worker thread.
+    """
+
+    def __init__(self, max_age: float) -> None:
+        self.max_age = max_age
+        self._words = array("H", _EMPTY_WORDS)
+        # Monotonic time each word was sampled, see RequestTiming.monotonic.
+        self._times = array("d", bytes(8 * SLOT_COUNT))
+        self._timings: list[RequestTiming | None] = list(_NO_TIMINGS)
+        self._valid = bytearray(SLOT_COUNT)
+
+    def snapshot(
+        self,
+        chunks: list[tuple[int, list[int], RequestTiming]],
+        failed_ranges: list[tuple[int, int]],
+        acquired: float,
+        values: dict[str, Any],
+        static: Mapping[str, Any],
+        decoders: Mapping[str, tuple[int, Callable[[int], Any]]] = KEY_DECODERS,
+    ) -> ComfoAirSnapshot:
+        """Store freshly read (start address, registers, request timing) chunks and build a snapshot.
+
+        Slots of the (start, count) ranges that failed in this poll keep their last-good
+        word, flagged as stale, until it is older than max_age (counted from acquired,
+        the monotonic start of the poll); after that they read as None. Slots that were
+        not due in this poll (a slow refresh class) keep their word unflagged; registers
+        that leave the read plan are dropped with invalidate.
+        """
+        for start, registers, timing in chunks:
+            slot = REGISTER_SLOTS[start]
+            count = len(registers)
+            # The built-in client already returns an array of words.
+            self._words[slot : slot + count] = registers if type(registers) is array else array("H", registers)
+            self._times[slot : slot + count] = array("d", (timing.monotonic,)) * count
+            self._timings[slot : slot + count] = [timing] * count
+            self._valid[slot : slot + count] = b"\x01" * count
+
+        stale = bytearray(SLOT_COUNT)
+        for start, count in failed_ranges:
+            first = REGISTER_SLOTS[start]
+            for slot in range(first, first + count):
+                if not self._valid[slot]:
+                    continue
+                if acquired - self._times[slot] > self.max_age:
+                    self._valid[slot] = 0
+                else:
+                    stale[slot] = 1
+
+        return ComfoAirSnapshot(
+            array("H", self._words),
+            bytearray(self._valid),
+            stale,
+            values,
+            frozenset(),
+            static,
+            decoders,
+            tuple(self._timings),
+        )
+
+    def invalidate(self, addresses: Iterable[int]) -> None:
+        """Forget the words of registers that are no longer polled, so they read as None instead of frozen."""
+        for address in addresses:
+            slot = REGISTER_SLOTS.get(address)
+            if slot is not None:
+                self._valid[slot] = 0
+                self._timings[slot] = None
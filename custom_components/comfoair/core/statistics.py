@@ -0,0 +1,76 @@
+"""Hourly mean, minimum and maximum of polled values, kept until they are stored elsewhere.
+
+The integration imports these as long-term statistics for hours the recorder has
+none of, for example while it was not writing states.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+# Hours kept; older ones are dropped, whether they were stored or not.
+MAX_HOURS = 72
+
+
+@dataclass(slots=True)
+class HourStatistics:
+    """Aggregate of the values of one key within one hour."""
+
+    count: int
+    total: float
+    min: float
+    max: float
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count
+
+
+class HourlyStatistics:
+    """Per UTC hour and key, the statistics of the fresh numeric values of each poll.
+
+    Stale values (served from the last-good cache) and missing values are left out,
+    so an hour only reflects what was actually read.
+    """
+
+    def __init__(self, keys: Iterable[str], max_hours: int = MAX_HOURS) -> None:
+        self.keys = tuple(keys)
+        self._max_hours = max_hours
+        self._hours: dict[int, dict[str, HourStatistics]] = {}
+
+    def add(self, timestamp: float, data: Mapping[str, Any]) -> None:
+        """Add the values in data (a snapshot) of a poll at timestamp (seconds since the epoch)."""
+        hour = int(timestamp // 3600) * 3600
+        stats = self._hours.get(hour)
+        if stats is None:
+            stats = self._hours[hour] = {}
+            for old in sorted(self._hours)[: -self._max_hours]:
+                del self._hours[old]
+        is_stale = getattr(data, "is_stale", None)
+        for key in self.keys:
+            value = data.get(key)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if is_stale is not None and is_stale(key):
+                continue
+            entry = stats.get(key)
+            if entry is None:
+                stats[key] = HourStatistics(1, value, value, value)
+            else:
+                entry.count += 1
+                entry.total += value
+                if value < entry.min:
+                    entry.min = value
+                elif value > entry.max:
+                    entry.max = value
+
+    def complete_hours(self, before: float) -> dict[int, dict[str, HourStatistics]]:
+        """Return the hours (by start timestamp) that ended at or before before."""
+        return {hour: stats for hour, stats in self._hours.items() if hour + 3600 <= before and stats}
+
+    def discard(self, hours: Iterable[int]) -> None:
+        """Forget hours that no longer need to be kept."""
+        for hour in hours:
+            self._hours.pop(hour, None)
@@ -0,0 +1,208 @@
+"""Modbus transport: one client per unit, created and reconnected on demand.
+
+The client is pymodbus or the built-in FC03 client (see fc03.py). Either is
+imported on the first connect rather than at module import, so the register map,
+decoding and the command line help load without pymodbus.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from array import array
+from dataclasses import dataclass
+
+from .const import CLIENT_BUILTIN, CLIENT_PYMODBUS, ILLEGAL_DATA_ADDRESS, MODE_RTU_OVER_TCP, MODE_SERIAL, MODE_UDP
+
+_LOGGER = logging.getLogger(__name__)
+
+# Default seconds a single request may take before the client gives up on it.
+REQUEST_TIMEOUT = 3
+
+
+@dataclass(frozen=True, slots=True)
+class RequestTiming:
+    """When a read request was sent and its response received, on the monotonic and the wall clock.
+
+    The unit sampled the words somewhere in between; the midpoints are the best
+    estimate of when, whatever the poll's retries and other requests around it took.
+    """
+
+    sent_monotonic: float
+    received_monotonic: float
+    sent_time: float
+    received_time: float
+
+    @property
+    def monotonic(self) -> float:
+        return (self.sent_monotonic + self.received_monotonic) / 2
+
+    @property
+    def time(self) -> float:
+        return (self.sent_time + self.received_time) / 2
+
+    @property
+    def round_trip(self) -> float:
+        return self.received_monotonic - self.sent_monotonic
+
+
+class ModbusTransport:
+    """Reads holding registers from one unit over TCP, UDP, RTU-over-TCP or serial.
+
+    Not thread safe: all calls must come from one thread, since they share the client.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        device_id: int,
+        host: str | None = None,
+        port: int | None = None,
+        device: str | None = None,
+        baudrate: int | None = None,
+        bytesize: int | None = None,
+        parity: str | None = None,
+        stopbits: int | None = None,
+        client: str = CLIENT_PYMODBUS,
+        timeout: float = REQUEST_TIMEOUT,
+    ) -> None:
+        self._mode = mode
+        self._timeout = timeout
+        self._builtin = client == CLIENT_BUILTIN
+        self._unit = int(device_id)
+        self._host = host
+        self._port = int(port) if port is not None else None
+        self._device = device
+        self._baudrate = int(baudrate) if baudrate is not None else None
+        self._bytesize = int(bytesize) if bytesize is not None else None
+        self._parity = parity
+        self._stopbits = int(stopbits) if stopbits is not None else None
+
+        self._client = None
+        # Errors that mean the connection is broken; extended once pymodbus is loaded.
+        self._communication_errors: tuple[type[BaseException], ...] = (OSError,)
+        # Modbus requests sent.
+        self.transactions = 0
+        # Exception code the unit answered the last read with, if it answered with one.
+        self.last_exception_code: int | None = None
+        # Timing of the last read that got a response.
+        self.last_timing: RequestTiming | None = None
+
+    def _create_client(self):
+        if self._builtin:
+            from .fc03 import Fc03Client
+
+            _LOGGER.debug("Built-in FC03 client initialized (mode=%s)", self._mode)
+            return Fc03Client(
+                self._mode,
+                self._unit,
+                host=self._host,
+                port=self._port,
+                device=self._device,
+                baudrate=self._baudrate,
+                bytesize=self._bytesize,
+                parity=self._parity,
+                stopbits=self._stopbits,
+                timeout=self._timeout,
+            )
+
+        from pymodbus import FramerType
+        from pymodbus.client import ModbusSerialClient, ModbusTcpClient, ModbusUdpClient
+        from pymodbus.exceptions import ConnectionException, ModbusIOException
+
+        self._communication_errors = (ConnectionException, ModbusIOException, OSError)
+
+        if self._mode == MODE_SERIAL:
+            _LOGGER.debug(
+                "Modbus client initialized for %s (baudrate=%s, bytesize=%s, parity=%s, stopbits=%s)",
+                self._device,
+                self._baudrate,
+                self._bytesize,
+                self._parity,
+                self._stopbits,
+            )
+            return ModbusSerialClient(
+                port=self._device,
+                baudrate=self._baudrate,
+                bytesize=self._bytesize,
+                parity=self._parity,
+                stopbits=self._stopbits,
+                timeout=self._timeout,
+            )
+        _LOGGER.debug("Modbus client initialized for %s:%s (mode=%s)", self._host, self._port, self._mode)
+        if self._mode == MODE_UDP:
+            return ModbusUdpClient(host=self._host, port=self._port, timeout=self._timeout)
+        # RTU-over-TCP: the gateway forwards raw RTU frames (with CRC) transparently.
+        framer = FramerType.RTU if self._mode == MODE_RTU_OVER_TCP else FramerType.SOCKET
+        return ModbusTcpClient(host=self._host, port=self._port, framer=framer, timeout=self._timeout)
+
+    def close(self) -> None:
+        """Close the current client, if any, so the next read reconnects."""
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+            self._client = None
+
+    def read_holding_registers(self, address: int, count: int) -> list[int] | array | None:
+        """Read count holding registers from address, reconnecting first if needed.
+
+        Returns None if the read failed or came back short; if the unit answered with a
+        Modbus exception, its code is in last_exception_code. An Illegal Data Address
+        answer keeps the connection, so probing for unsupported registers is cheap.
+        """
+        self.last_exception_code = None
+        try:
+            if self._client is None or not self._client.connected:
+                _LOGGER.debug("Modbus client not connected, attempting reconnect...")
+                self.close()
+                self._client = self._create_client()
+                if not self._client.connect():
+                    _LOGGER.error("Modbus reconnect failed")
+                    return None
+
+            self.transactions += 1
+            sent_monotonic = time.monotonic()
+            sent_time = time.time()
+            if self._builtin:
+                registers = self._client.read_holding_registers(address, count)
+                self.last_timing = RequestTiming(sent_monotonic, time.monotonic(), sent_time, time.time())
+                return registers
+
+            response = self._client.read_holding_registers(
+                address=address,
+                count=count,
+                device_id=self._unit,
+            )
+            self.last_timing = RequestTiming(sent_monotonic, time.monotonic(), sent_time, time.time())
+
+            if response is None:
+                return None
+
+            if response.isError():
+                self.last_exception_code = getattr(response, "exception_code", None)
+                if self.last_exception_code == ILLEGAL_DATA_ADDRESS:
+                    _LOGGER.debug("Registers %s-%s not supported by the unit", address, address + count - 1)
+                    return None
+                _LOGGER.warning("Forcing reconnect due to Modbus error frame")
+                self.close()
+                return None
+
+            registers = getattr(response, "registers", None)
+            if registers is None or len(registers) < count:
+                return None
+            _LOGGER.debug("Successfully read %s registers from %s-%s", len(registers), address, address + count - 1)
+            return registers[:count]
+        except self._communication_errors as err:
+            # The built-in client raises exception responses (ModbusExceptionResponse).
+            self.last_exception_code = getattr(err, "exception_code", None)
+            if self.last_exception_code == ILLEGAL_DATA_ADDRESS:
+                _LOGGER.debug("Registers %s-%s not supported by the unit", address, address + count - 1)
+                return None
+            _LOGGER.error("Modbus communication error while reading %s-%s: %s", address, address + count - 1, err)
+            self.close()
+            return None
+        except Exception as err:
+            _LOGGER.exception("Unexpected error while reading %s-%s: %s", address, address + count - 1, err)
+            return None
@@ -0,0 +1,55 @@
+"""Diagnostics of the ComfoAir integration."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .hub import ComfoAirHub
+
+TO_REDACT = {CONF_HOST, "serial_number"}
+STATIC_KEYS = ("105", "111", "112", "firmware_version", "bootloader_version", "serial_number")
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the entry's settings, the read plan and when each register range of the last poll was read."""
+    diagnostics: dict[str, Any] = {"entry": async_redact_data(dict(entry.data), TO_REDACT)}
+    item = hass.data.get(DOMAIN, {}).get(entry.data[CONF_NAME])
+    if item is None:
+        return diagnostics
+
+    hub: ComfoAirHub = item["hub"]
+    diagnostics["read_plan"] = [
+        {"start": start, "count": count, "refresh_interval": interval} for start, count, interval in await hub.async_read_plan()
+    ]
+    diagnostics["support_map"] = hub.support_map.as_dict() if hub.support_map is not None else None
+    diagnostics["history"] = hub.history is not None
+
+    snapshot = hub.data
+    if snapshot is None:
+        return diagnostics
+    diagnostics["static"] = async_redact_data({key: snapshot.get(key) for key in STATIC_KEYS}, TO_REDACT)
+    diagnostics["connection_status"] = snapshot.get("connection_status")
+    diagnostics["poll_overruns"] = snapshot.get("poll_overruns")
+    diagnostics["skipped_ticks"] = snapshot.get("skipped_ticks")
+    # Ranges served from the last-good cache show the timing of the poll that did read them.
+    now = time.monotonic()
+    diagnostics["ranges"] = [
+        {
+            "start": start,
+            "count": count,
+            "sent": dt_util.utc_from_timestamp(timing.sent_time).isoformat(),
+            "received": dt_util.utc_from_timestamp(timing.received_time).isoformat(),
+            "round_trip": round(timing.round_trip, 4),
+            "age": round(now - timing.monotonic, 3),
+        }
+        for start, count, timing in snapshot.range_timings()
+    ]
+    return diagnostics
@@ -2,80 +2,64 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
-import threading
 import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-from pymodbus.client import ModbusSerialClient, ModbusTcpClient
-from pymodbus.exceptions import ConnectionException, ModbusIOException
 from homeassistant.components.persistent_notification import async_create as create_persistent_notification
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
 
-from .const import (
-    BOOLEAN_REGISTERS,
-    DOMAIN,
-    ENUM_REGISTERS,
-    FIRMWARE_REGISTER,
-    MODE_SERIAL,
-    ON_OFF_STATUS,
-    ALARM_BITS,
-    READ_RANGES,
-    STATIC_READ_RANGES,
-    SENSOR_TYPES,
-    alarm_data_key,
-)
+from .const import CLIENT_PYMODBUS, DOMAIN, SENSOR_FILTERS
+from .core.history import HistoryStore, blocks_for
+from .core.poller import MIN_POLL_DEADLINE, ModbusPoller
+from .core.scan import SupportMap
+from .core.snapshot import ComfoAirSnapshot, LastGoodCache
+from .core.statistics import HourlyStatistics
+from .worker import ModbusWorker
+
+if TYPE_CHECKING:
+    from .backfill import StatisticsBackfill
 
 _LOGGER = logging.getLogger(__name__)
 
-MAX_READ_RETRIES = 3
+# Seconds an unloaded hub's connection stays open for a reload of the entry to take over.
+PARKED_CONNECTION_TIMEOUT = 30
+# Seconds a register read waits for its poll beyond one scan interval and poll deadline.
+REGISTER_READ_MARGIN = 5
+# Requests of a register scan per worker job; polls run in between.
+SCAN_REQUESTS_PER_JOB = 25
+SUPPORT_MAP_STORAGE_VERSION = 1
+# Fired with the values of each live mode read.
+EVENT_LIVE_DATA = f"{DOMAIN}_live_data"
 
 
-class ComfoAirHub(DataUpdateCoordinator[dict]):
-    """Thread safe wrapper class for pymodbus."""
+def support_map_store(hass, name: str) -> Store[dict[str, Any]]:
+    """Storage of the register support map of the hub called name."""
+    return Store(hass, SUPPORT_MAP_STORAGE_VERSION, f"{DOMAIN}.{name}.registers")
 
-    @staticmethod
-    def _calc_absolute_humidity(temp_c: float, rh_percent: float) -> float | None:
-        """Absolute humidity in kg/kg dry air (mixing ratio)."""
-        try:
-            e_s = 6.112 * math.exp(17.67 * temp_c / (temp_c + 243.5))
-            e = (rh_percent / 100.0) * e_s
-            return round(0.622 * e / (1013.25 - e), 4)
-        except (ValueError, ZeroDivisionError):
-            return None
-
-    @staticmethod
-    def _calc_dewpoint(temp_c: float, rh_percent: float) -> float | None:
-        """Dew point temperature in °C (Magnus formula)."""
-        try:
-            e = (rh_percent / 100.0) * 6.112 * math.exp(17.67 * temp_c / (temp_c + 243.5))
-            ln_e = math.log(e / 6.112)
-            return round(243.5 * ln_e / (17.67 - ln_e), 1)
-        except (ValueError, ZeroDivisionError):
-            return None
-
-    @staticmethod
-    def _calc_enthalpy(temp_c: float, abs_humidity: float) -> float | None:
-        """Enthalpy of moist air in kJ/kg dry air."""
-        try:
-            return round(1.006 * temp_c + abs_humidity * (2501 + 1.86 * temp_c), 1)
-        except (TypeError, ValueError):
-            return None
 
-    @staticmethod
-    def _format_firmware_version(raw_value: int) -> str | None:
-        """Convert raw firmware register to a readable firmware version string."""
-        if raw_value <= 0:
-            return None
+@dataclass(slots=True)
+class _ParkedConnection:
+    """Worker and poller of an unloaded hub, kept open for the next setup of the entry."""
+
+    key: tuple
+    worker: ModbusWorker
+    poller: ModbusPoller
+    cancel_close: CALLBACK_TYPE
 
-        major = raw_value // 10000
-        minor = (raw_value % 10000) // 100
-        patch = raw_value % 100
 
-        if patch > 0:
-            return f"{major}.{minor:02d}.{patch:02d}"
-        return f"{major}.{minor:02d}"
+class ComfoAirHub(DataUpdateCoordinator[ComfoAirSnapshot]):
+    """Coordinator running a ModbusPoller on a dedicated worker thread."""
 
     def __init__(
         self,
@@ -97,160 +81,463 @@ class ComfoAirHub(DataUpdateCoordinator[dict]):
         notify_services: str = "",
         connection_error_notification_title: str = "ComfoAir verbindingsfout!",
         connection_error_delay: int = 60,
+        fixed_rate: bool = False,
+        stale_max_age: int = 300,
+        client: str = CLIENT_PYMODBUS,
     ) -> None:
-        super().__init__(hass, _LOGGER, name=name, update_interval=timedelta(seconds=scan_interval))
-        self._mode = mode
-        self._unit = int(device_id)
-        self._host = host
-        self._port = int(port) if port is not None else None
-        self._device = device
-        self._baudrate = int(baudrate) if baudrate is not None else None
-        self._bytesize = int(bytesize) if bytesize is not None else None
-        self._parity = parity
-        self._stopbits = int(stopbits) if stopbits is not None else None
-        self._dewpoint_delta = float(dewpoint_delta)
-
-        self._client = None
-        self._lock = threading.Lock()
-        self._modbus_lock = threading.Lock()
+        # In fixed-rate mode the coordinator's own (drifting) scheduler is disabled and
+        # polls are started from wall-clock aligned ticks instead, see async_start_fixed_rate.
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=name,
+            update_interval=None if fixed_rate else timedelta(seconds=scan_interval),
+        )
+        self._scan_interval = scan_interval
+        self._fixed_rate = fixed_rate
+        self._next_tick: float | None = None
+        self._cancel_tick = None
+        self._poll_in_progress = False
+        self._skipped_ticks = 0
+        # Register reads waiting for the next poll: ((start, count), future for the words).
+        self._pending_reads: list[tuple[tuple[int, int], asyncio.Future]] = []
+        self._live_task: asyncio.Task | None = None
+        # End callbacks of the websocket streams of this hub.
+        self._streams: set[CALLBACK_TYPE] = set()
+
+        self.history: HistoryStore | None = None
+        self.support_map: SupportMap | None = None
+        self._support_map_store = support_map_store(hass, name)
+
         self._consecutive_failures = 0
-        self._static_data: dict = {}
-        self._last_successful_read = None
+        self._connection_error_notified = False
+        self._connection_lost_time = None
+        self._set_connection_error_notifications(
+            notify_connection_errors_mobile,
+            notify_connection_errors_persistent,
+            notify_services,
+            connection_error_notification_title,
+            connection_error_delay,
+        )
 
-        self._notify_connection_errors_mobile = notify_connection_errors_mobile
-        self._notify_connection_errors_persistent = notify_connection_errors_persistent
+        # The last-good cache and the hourly statistics outlive reloads of the entry, so
+        # values survive an options change.
+        storage_key = f"{name}_data_store"
+        if storage_key not in hass.data:
+            hass.data[storage_key] = {"last_good": LastGoodCache(stale_max_age)}
+        self.data_store = hass.data[storage_key]
+        self._last_good: LastGoodCache = self.data_store["last_good"]
+        self._last_good.max_age = stale_max_age
+        # Set up by async_start_backfill when the recorder is loaded.
+        self.backfill: StatisticsBackfill | None = None
+
+        # A reload of the entry takes over the open connection of the previous hub, with
+        # its static data and register profile, as long as the connection settings match.
+        self._connection_key = (mode, device_id, host, port, device, baudrate, bytesize, parity, stopbits, client)
+        parked: _ParkedConnection | None = self.data_store.pop("connection", None)
+        if parked is not None:
+            parked.cancel_close()
+        if parked is not None and parked.key == self._connection_key:
+            _LOGGER.debug("Reusing the open Modbus connection of %s", name)
+            self._worker = parked.worker
+            self._poller = parked.poller
+            self._worker.submit(self._poller.update_settings, max(scan_interval, MIN_POLL_DEADLINE), dewpoint_delta)
+        else:
+            if parked is not None:
+                hass.async_create_task(parked.worker.async_stop(parked.poller.reset_client))
+            self._worker = ModbusWorker(name)
+            # The poller (and its client) is only ever used from the worker thread.
+            self._poller = ModbusPoller(
+                name,
+                mode,
+                device_id,
+                poll_deadline=max(scan_interval, MIN_POLL_DEADLINE),
+                host=host,
+                port=port,
+                device=device,
+                baudrate=baudrate,
+                bytesize=bytesize,
+                parity=parity,
+                stopbits=stopbits,
+                dewpoint_delta=dewpoint_delta,
+                last_good=self._last_good,
+                client=client,
+                filters=SENSOR_FILTERS,
+            )
+
+    def _set_connection_error_notifications(
+        self,
+        notify_mobile: bool,
+        notify_persistent: bool,
+        notify_services: str,
+        title: str,
+        delay: int,
+    ) -> None:
+        self._notify_connection_errors_mobile = notify_mobile
+        self._notify_connection_errors_persistent = notify_persistent
         self._notify_services = (
             [s.strip() for s in notify_services.split(",") if s.strip()] if notify_services else []
         )
-        self._connection_error_notification_title = connection_error_notification_title
-        self._connection_error_notified = False
-        self._connection_lost_time = None
-        self._failures_for_delay = max(1, int(connection_error_delay / scan_interval))
+        self._connection_error_notification_title = title
+        self._failures_for_delay = max(1, int(delay / self._scan_interval))
         _LOGGER.debug(
             "Connection error notification will be sent after %s failures (%ss / %ss)",
             self._failures_for_delay,
+            delay,
+            self._scan_interval,
+        )
+
+    async def async_update_settings(
+        self,
+        scan_interval: int,
+        dewpoint_delta: float,
+        stale_max_age: int,
+        fixed_rate: bool,
+        notify_connection_errors_mobile: bool,
+        notify_connection_errors_persistent: bool,
+        notify_services: str,
+        connection_error_notification_title: str,
+        connection_error_delay: int,
+    ) -> None:
+        """Apply changed options to the running hub, without reconnecting or reloading."""
+        reschedule = scan_interval != self._scan_interval or fixed_rate != self._fixed_rate
+        self._scan_interval = scan_interval
+        self._set_connection_error_notifications(
+            notify_connection_errors_mobile,
+            notify_connection_errors_persistent,
+            notify_services,
+            connection_error_notification_title,
             connection_error_delay,
-            scan_interval,
         )
+        self._last_good.max_age = stale_max_age
+        await self._worker.async_run(
+            self._poller.update_settings, max(scan_interval, MIN_POLL_DEADLINE), dewpoint_delta
+        )
+        if not reschedule:
+            return
 
-        storage_key = f"{name}_data_store"
-        if storage_key not in hass.data:
-            hass.data[storage_key] = {"realtime_data": {}}
-        self.data_store = hass.data[storage_key]
+        self.async_stop_fixed_rate()
+        self._fixed_rate = fixed_rate
+        self.update_interval = None if fixed_rate else timedelta(seconds=scan_interval)
+        self.async_start_fixed_rate()
+        # Polls once now; interval polling is rescheduled from there.
+        await self.async_request_refresh()
 
-        self._client = self._create_client()
-
-    def _create_client(self):
-        if self._mode == MODE_SERIAL:
-            _LOGGER.debug(
-                "Modbus client initialized for %s (baudrate=%s, bytesize=%s, parity=%s, stopbits=%s)",
-                self._device,
-                self._baudrate,
-                self._bytesize,
-                self._parity,
-                self._stopbits,
-            )
-            return ModbusSerialClient(
-                port=self._device,
-                baudrate=self._baudrate,
-                bytesize=self._bytesize,
-                parity=self._parity,
-                stopbits=self._stopbits,
-                timeout=3,
-            )
-        _LOGGER.debug("Modbus client initialized for %s:%s", self._host, self._port)
-        return ModbusTcpClient(host=self._host, port=self._port, timeout=3)
+    async def async_open_history(self, path: str, days: int) -> None:
+        """Record the raw words of every poll in the history file at path, keeping days days."""
+        blocks = blocks_for(days * 86400, self._scan_interval)
+        try:
+            self.history = await self.hass.async_add_executor_job(HistoryStore, path, blocks)
+        except OSError as err:
+            _LOGGER.error("Could not open history file %s, not recording history: %s", path, err)
+
+    @callback
+    def async_start_backfill(self) -> CALLBACK_TYPE:
+        """Keep hourly statistics and import the hours the recorder missed; returns the stop callback.
+
+        Without the recorder there is nothing to fill in, and the recorder modules are
+        never imported.
+        """
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug("Recorder not loaded, no statistics backfill for %s", self.name)
+            return lambda: None
+        try:
+            from .backfill import MEASUREMENT_KEYS, StatisticsBackfill
+        except ImportError as err:
+            # The statistics metadata needs Home Assistant 2025.12 (mean_type, unit_class).
+            _LOGGER.warning("No statistics backfill for %s, Home Assistant is too old: %s", self.name, err)
+            return lambda: None
+
+        statistics = self.data_store.get("statistics")
+        if statistics is None:
+            statistics = self.data_store["statistics"] = HourlyStatistics(MEASUREMENT_KEYS)
+        self.backfill = StatisticsBackfill(self.hass, self.name, statistics)
+        return self.backfill.async_start()
+
+    async def async_close_history(self) -> None:
+        """Close the history file, after any poll still running on the worker."""
+        if self.history is not None:
+            await self._worker.async_run(self.history.close)
+            self.history = None
+
+    async def async_load_support_map(self) -> None:
+        """Apply the stored result of the last register scan, if there is one."""
+        data = await self._support_map_store.async_load()
+        if data is not None:
+            self.support_map = SupportMap.from_dict(data)
+            await self._worker.async_run(self._poller.set_support_map, self.support_map)
+
+    async def async_support_map_outdated(self) -> bool:
+        """True if the unit's model or firmware differs from the one the support map was scanned on."""
+        static = await self._worker.async_run(getattr, self._poller, "static_data")
+        return (
+            self.support_map is not None
+            and bool(static)
+            and not self.support_map.matches(static.get("112"), static.get("firmware_version"))
+        )
 
-    def _reset_client(self) -> None:
-        """Close the current Modbus client, if any, so the next read reconnects."""
-        if self._client is not None:
-            try:
-                self._client.close()
-            except Exception:
-                pass
-            self._client = None
+    async def async_read_plan(self) -> list[tuple[int, int, float]]:
+        """(start, count, refresh interval) requests of a poll, see ModbusPoller.read_plan."""
+        return await self._worker.async_run(getattr, self._poller, "read_plan")
+
+    async def async_unsupported_registers(self) -> frozenset[int]:
+        """Registers the support map says the unit does not have, see ModbusPoller.unsupported_registers."""
+        return await self._worker.async_run(getattr, self._poller, "unsupported_registers")
+
+    async def async_scan_registers(self, first: int, last: int) -> SupportMap:
+        """Map which registers from first to last the unit supports, then store and apply the map.
+
+        The scan runs on the worker in short jobs, so polling goes on meanwhile.
+        """
+        scanner = await self._worker.async_run(self._poller.register_scanner, first, last)
+        started = time.monotonic()
+        while not scanner.done:
+            await self._worker.async_run(scanner.step, SCAN_REQUESTS_PER_JOB)
+        static = await self._worker.async_run(getattr, self._poller, "static_data")
+        support_map = scanner.support_map(static.get("112"), static.get("firmware_version"))
+        _LOGGER.info(
+            "Scanned registers %s-%s of %s in %s requests (%.1fs): %s supported, %s not",
+            first,
+            last,
+            self.name,
+            scanner.requests,
+            time.monotonic() - started,
+            len(support_map.supported),
+            len(support_map.unsupported),
+        )
+        self.support_map = support_map
+        await self._worker.async_run(self._poller.set_support_map, support_map)
+        await self._support_map_store.async_save(support_map.as_dict())
+        return support_map
+
+    @callback
+    def async_start_live_mode(self, registers: Iterable[int], interval: float, duration: float) -> None:
+        """Read registers every interval seconds for duration seconds, firing EVENT_LIVE_DATA per read.
+
+        Replaces a running live mode. The normal polls go on in between, so entities
+        and alarms keep updating at the scan interval.
+        """
+        self.async_stop_live_mode()
+        self._live_task = self.hass.async_create_background_task(
+            self._async_live_mode(frozenset(registers), interval, duration), f"{DOMAIN} {self.name} live mode"
+        )
 
-    def close(self) -> None:
-        """Disconnect client."""
-        try:
-            with self._lock:
-                self._reset_client()
-            _LOGGER.debug("Modbus client connection closed")
-        except Exception as err:
-            _LOGGER.exception("Error closing Modbus connection: %s", err)
-
-    def _read_holding_registers(self, address: int, count: int):
-        """Safely read holding registers with reconnect logic."""
+    @callback
+    def async_stop_live_mode(self) -> None:
+        """Cancel a running live mode, if any."""
+        if self._live_task is not None:
+            self._live_task.cancel()
+            self._live_task = None
+
+    @callback
+    def async_add_stream(self, end: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Track a websocket stream until the returned callback is called; end() is called on unload."""
+        self._streams.add(end)
+        return partial(self._streams.discard, end)
+
+    @callback
+    def async_end_streams(self) -> None:
+        """End every websocket stream of this hub."""
+        for end in list(self._streams):
+            end()
+        self._streams.clear()
+
+    async def _async_live_mode(self, registers: frozenset[int], interval: float, duration: float) -> None:
+        plan = await self._worker.async_run(self._poller.live_plan, registers)
+        keys = frozenset(str(register) for register in registers)
+        _LOGGER.info("Live mode of %s for %ss every %ss: %s", self.name, duration, interval, plan)
+        started = time.monotonic()
+        next_read = started
+        reads = 0
         try:
-            if self._client is None or not self._client.connected:
-                _LOGGER.debug("Modbus client not connected, attempting reconnect...")
-                self._reset_client()
-                self._client = self._create_client()
-                if not self._client.connect():
-                    _LOGGER.error("Modbus reconnect failed")
-                    return None
-
-            with self._modbus_lock:
-                response = self._client.read_holding_registers(
-                    address=address,
-                    count=count,
-                    device_id=self._unit,
-                )
+            while next_read < started + duration:
+                values, timing = await self._worker.async_run(self._poller.read_live, plan, keys)
+                reads += 1
+                if timing is not None:
+                    self.hass.bus.async_fire(
+                        EVENT_LIVE_DATA,
+                        {
+                            "name": self.name,
+                            "time": dt_util.utc_from_timestamp(timing.time).isoformat(),
+                            "values": values,
+                        },
+                    )
+                # Like fixed-rate polling: reads that fell behind are skipped, not caught up.
+                now = time.monotonic()
+                next_read += interval
+                if next_read < now:
+                    next_read += math.ceil((now - next_read) / interval) * interval
+                await asyncio.sleep(next_read - now)
+        finally:
+            _LOGGER.info("Live mode of %s ended after %s reads", self.name, reads)
+
+    async def async_close(self) -> None:
+        """Disconnect the client on the worker thread and stop the worker."""
+        self.async_stop_live_mode()
+        await self._worker.async_stop(self._poller.reset_client)
+        _LOGGER.debug("Modbus client connection closed")
+
+    @callback
+    def async_park(self) -> None:
+        """Keep the connection open for the next setup of this entry instead of closing it.
+
+        Unloading cannot tell a reload from a removal, so a parked connection that is
+        not taken over within PARKED_CONNECTION_TIMEOUT seconds is closed.
+        """
+
+        @callback
+        def _close(_now) -> None:
+            if self.data_store.get("connection") is parked:
+                del self.data_store["connection"]
+                self.hass.async_create_task(self.async_close())
+
+        parked = _ParkedConnection(
+            self._connection_key,
+            self._worker,
+            self._poller,
+            async_call_later(self.hass, PARKED_CONNECTION_TIMEOUT, _close),
+        )
+        self.data_store["connection"] = parked
+        _LOGGER.debug("Modbus connection of %s parked for %ss", self.name, PARKED_CONNECTION_TIMEOUT)
 
-            if response is None:
-                return None
-
-            if response.isError():
-                _LOGGER.warning("Forcing reconnect due to Modbus error frame")
-                self._reset_client()
-                return None
-
-            if not hasattr(response, "registers"):
-                return None
-            _LOGGER.debug("Successfully read %s registers from %s-%s", len(response.registers), address, address + count - 1)
-            return response
-        except (ConnectionException, ModbusIOException, OSError) as err:
-            _LOGGER.error("Modbus communication error while reading %s-%s: %s", address, address + count - 1, err)
-            self._reset_client()
-            return None
-        except Exception as err:
-            _LOGGER.exception("Unexpected error while reading %s-%s: %s", address, address + count - 1, err)
-            return None
-
-    async def _async_update_data(self) -> dict:
+    @callback
+    def async_start_fixed_rate(self) -> None:
+        """Start polling on wall-clock boundaries that are multiples of the scan interval."""
+        if not self._fixed_rate or self._cancel_tick is not None:
+            return
+        self._schedule_next_tick()
+        _LOGGER.debug("Fixed-rate polling started for %s every %ss", self.name, self._scan_interval)
+
+    @callback
+    def async_stop_fixed_rate(self) -> None:
+        """Cancel the pending fixed-rate tick, if any."""
+        if self._cancel_tick is not None:
+            self._cancel_tick()
+            self._cancel_tick = None
+        self._next_tick = None
+
+    @callback
+    def _schedule_next_tick(self) -> None:
+        """Schedule the first wall-clock boundary strictly after now.
+
+        Boundaries that already passed (because a poll or the event loop ran late) are
+        skipped and counted, never queued.
+        """
+        now = time.time()
+        next_tick = (math.floor(now / self._scan_interval) + 1) * self._scan_interval
+        if self._next_tick is not None:
+            missed = round((next_tick - self._next_tick) / self._scan_interval) - 1
+            if missed > 0:
+                self._skipped_ticks += missed
+                _LOGGER.debug("Skipped %s fixed-rate ticks for %s", missed, self.name)
+        self._next_tick = next_tick
+        self._cancel_tick = self.hass.loop.call_later(next_tick - now, self._handle_tick).cancel
+
+    @callback
+    def _handle_tick(self) -> None:
+        self._schedule_next_tick()
+        if self._poll_in_progress:
+            self._skipped_ticks += 1
+            _LOGGER.debug("Previous poll of %s still running, skipping tick", self.name)
+            return
+        self.hass.async_create_task(self.async_refresh())
+
+    @callback
+    def async_set_consumed_keys(self, keys: Iterable[str] | None) -> None:
+        """Limit reads and derived values to the data keys that enabled entities use.
+
+        None restores the full read plan. Alarm registers are always read, so the
+        alarm monitor keeps working with all alarm entities disabled. Takes effect
+        on the worker, after a poll that is running.
+        """
+        self._worker.submit(self._poller.set_consumed_keys, None if keys is None else frozenset(keys))
+
+    async def async_supported_keys(self, keys: Iterable[str]) -> frozenset[str]:
+        """Return the keys for which the unit's register profile has every register they need."""
+        return await self._worker.async_run(self._supported_keys, tuple(keys))
+
+    def _supported_keys(self, keys: tuple[str, ...]) -> frozenset[str]:
+        """Runs on the worker thread."""
+        return frozenset(key for key in keys if self._poller.supports(key))
+
+    async def async_decoders(self) -> Mapping[str, tuple[int, Callable[[int], Any]]]:
+        """Data key -> (slot, decoder) table of the unit's register profile."""
+        return await self._worker.async_run(getattr, self._poller, "decoders")
+
+    async def async_read_registers(self, start: int, count: int) -> list[int] | None:
+        """Read count holding registers from start along with the next poll.
+
+        The range is merged into the poll's own requests where it overlaps or adjoins
+        them, so it costs little or no extra bus time. Returns None if the registers
+        could not be read; raises TimeoutError if no poll picked them up in time.
+        """
+        pending = ((start, count), self.hass.loop.create_future())
+        self._pending_reads.append(pending)
+        try:
+            # The next poll starts within a scan interval and takes at most its deadline.
+            timeout = self._scan_interval + max(self._scan_interval, MIN_POLL_DEADLINE) + REGISTER_READ_MARGIN
+            async with asyncio.timeout(timeout):
+                return await pending[1]
+        finally:
+            if pending in self._pending_reads:
+                self._pending_reads.remove(pending)
+
+    async def _async_update_data(self) -> ComfoAirSnapshot:
         """Fetch Modbus data with fallback to previous values."""
-        if self._last_successful_read is not None:
-            time_since_success = (datetime.now() - self._last_successful_read).total_seconds()
-            if time_since_success > 300:
-                _LOGGER.warning(
-                    "No successful reads for %ss (>5min), forcing reconnect",
-                    int(time_since_success),
-                )
-                self._reset_client()
-
-        data = {**self.data_store.get("realtime_data", {})}
+        pending_reads, self._pending_reads = self._pending_reads, []
+        extra_words: dict[tuple[int, int], list[int]] = {}
+        self._poll_in_progress = True
+        try:
+            snapshot, failed_ranges, read_any, extra_words = await self._worker.async_run(
+                self._poll, {register_range for register_range, _ in pending_reads}
+            )
+        finally:
+            self._poll_in_progress = False
+            for register_range, future in pending_reads:
+                if not future.done():
+                    future.set_result(extra_words.get(register_range))
 
-        realtime_result = await self.hass.async_add_executor_job(self.read_modbus_realtime_data)
-        if isinstance(realtime_result, tuple):
-            realtime, failed_ranges = realtime_result
-        else:
-            realtime = realtime_result
-            failed_ranges = []
+        if read_any and self.backfill is not None:
+            self.backfill.statistics.add(time.time(), snapshot)
 
-        if realtime is None:
-            data["connection_status"] = "Failed"
+        if not read_any:
+            connection_status = "Failed"
             await self._handle_connection_failure()
-            return data
-
-        if failed_ranges:
-            data["connection_status"] = "Partial"
+        elif failed_ranges:
+            connection_status = "Partial"
         else:
-            data["connection_status"] = "OK"
+            connection_status = "OK"
             await self._handle_connection_restored()
 
-        data.update(realtime)
-        self.data_store["realtime_data"] = realtime
-        return data
+        return snapshot.replace(connection_status=connection_status, skipped_ticks=self._skipped_ticks)
+
+    def _poll(
+        self, extra_ranges: set[tuple[int, int]]
+    ) -> tuple[ComfoAirSnapshot, list[tuple[int, int]], bool, dict[tuple[int, int], list[int]]]:
+        """Poll the unit, reading extra_ranges along, and record the words in the history file.
+
+        Runs on the worker thread, like every use of the poller.
+        """
+        last_successful_read = self._poller.last_successful_read
+        if last_successful_read is not None:
+            time_since_success = (datetime.now() - last_successful_read).total_seconds()
+            if time_since_success > 300:
+                _LOGGER.warning(
+                    "No successful reads for %ss (>5min), forcing reconnect",
+                    int(time_since_success),
+                )
+                self._poller.reset_client()
+
+        polled_at = time.time()
+        snapshot, failed_ranges, read_any = self._poller.read_realtime_data(extra_ranges)
+        snapshot = snapshot.replace(poll_overruns=self._poller.poll_overruns)
+        history = self.history
+        if read_any and history is not None:
+            try:
+                history.append(polled_at, snapshot)
+            except (OSError, ValueError) as err:
+                _LOGGER.error("Could not write to history file %s: %s", history.path, err)
+        return snapshot, failed_ranges, read_any, self._poller.extra_words
 
     async def _handle_connection_failure(self) -> None:
         """Track consecutive failures and notify once the configured delay has elapsed."""
@@ -300,195 +587,10 @@ class ComfoAirHub(DataUpdateCoordinator[dict]):
         """Reset failure tracking once the connection is healthy again."""
         if self._consecutive_failures > 0:
             _LOGGER.debug("Connection restored, resetting %s consecutive failures", self._consecutive_failures)
+            if self.backfill is not None:
+                self.hass.async_create_background_task(
+                    self.backfill.async_backfill(), f"{DOMAIN} {self.name} backfill"
+                )
         self._consecutive_failures = 0
         self._connection_lost_time = None
         self._connection_error_notified = False
-
-    def _read_ranges(self, ranges: list[tuple[int, int]]) -> tuple[list[int], list[tuple[int, int]]]:
-        """Read a list of (start, count) register ranges, retrying each up to MAX_READ_RETRIES times."""
-        all_registers: list[int] = []
-        failed_ranges: list[tuple[int, int]] = []
-
-        for start, count in ranges:
-            success = False
-            for attempt in range(MAX_READ_RETRIES):
-                response = self._read_holding_registers(address=start, count=count)
-                if response is not None and len(response.registers) >= count:
-                    all_registers.extend(response.registers)
-                    _LOGGER.debug(
-                        "Read %s registers from %s-%s on attempt %s",
-                        len(response.registers),
-                        start,
-                        start + count - 1,
-                        attempt + 1,
-                    )
-                    success = True
-                    break
-                _LOGGER.warning(
-                    "Attempt %s failed for range %s-%s",
-                    attempt + 1,
-                    start,
-                    start + count - 1,
-                )
-                time.sleep(0.3)
-            if not success:
-                failed_ranges.append((start, count))
-
-        if failed_ranges:
-            _LOGGER.warning("Some ranges failed: %s. Proceeding with available data.", failed_ranges)
-
-        return all_registers, failed_ranges
-
-    def _read_static_data(self) -> None:
-        """Read static device registers once and cache them in _static_data."""
-        _LOGGER.debug("Start reading static data")
-        all_registers, failed_ranges = self._read_ranges(STATIC_READ_RANGES)
-
-        if len(failed_ranges) == len(STATIC_READ_RANGES):
-            return
-
-        decoded = all_registers
-        register_map: dict[int, int] = {}
-        index = 0
-        for start, count in STATIC_READ_RANGES:
-            if (start, count) not in failed_ranges:
-                for offset in range(count):
-                    register_map[start + offset] = index
-                    index += 1
-
-        static: dict = {}
-
-        for register in ("105", "111", "112"):
-            reg_int = int(register)
-            if reg_int in register_map:
-                raw = decoded[register_map[reg_int]]
-                static[register] = ENUM_REGISTERS[register].get(raw, raw)
-            else:
-                static[register] = None
-
-        if FIRMWARE_REGISTER in register_map:
-            static["firmware_version"] = self._format_firmware_version(
-                decoded[register_map[FIRMWARE_REGISTER]]
-            )
-        else:
-            static["firmware_version"] = None
-
-        bl_reg = FIRMWARE_REGISTER + 3
-        if bl_reg in register_map:
-            raw_bl = decoded[register_map[bl_reg]]
-            if raw_bl > 0:
-                bl_major = raw_bl // 100
-                bl_minor = raw_bl % 100
-                static["bootloader_version"] = f"{bl_major}.{bl_minor:02d}"
-                static["hardware_version"] = f"{bl_minor:02d}"
-            else:
-                static["bootloader_version"] = None
-                static["hardware_version"] = None
-        else:
-            static["bootloader_version"] = None
-            static["hardware_version"] = None
-
-        serial_chars = [
-            chr(decoded[register_map[reg]])
-            for reg in range(115, 131)
-            if reg in register_map and 0x20 <= decoded[register_map[reg]] <= 0x7E
-        ]
-        static["serial_number"] = "".join(serial_chars).rstrip() or None
-
-        self._static_data = static
-        _LOGGER.debug("Finished reading static data")
-
-    def read_modbus_realtime_data(self) -> tuple[dict, list[tuple[int, int]]] | tuple[None, list[tuple[int, int]]]:
-        """Read realtime sensor values."""
-        if not self._static_data:
-            self._read_static_data()
-
-        _LOGGER.debug("Start reading realtime data")
-        all_registers, failed_ranges = self._read_ranges(READ_RANGES)
-
-        if not all_registers:
-            return None, failed_ranges
-
-        decoded = all_registers
-
-        register_map = {}
-        index = 0
-        for start, count in READ_RANGES:
-            if (start, count) not in failed_ranges:
-                for offset in range(count):
-                    register_map[start + offset] = index
-                    index += 1
-
-        data = {}
-        for register, description in SENSOR_TYPES.items():
-            if not str(register).isdigit():
-                continue
-
-            register_int = int(register)
-            if register_int not in register_map:
-                data[register] = None
-                continue
-
-            raw_value = decoded[register_map[register_int]]
-
-            if register in ENUM_REGISTERS:
-                data[register] = ENUM_REGISTERS[register].get(raw_value, raw_value)
-                continue
-
-            if register in BOOLEAN_REGISTERS:
-                data[register] = ON_OFF_STATUS.get(raw_value, raw_value)
-                continue
-
-            if description.signed and raw_value >= 0x8000:
-                raw_value -= 0x10000
-
-            value = raw_value * description.scale
-            if description.suggested_display_precision is not None:
-                value = round(value, description.suggested_display_precision)
-            data[register] = value
-
-        data.update(self._static_data)
-
-        for reg_str, bits in ALARM_BITS.items():
-            raw = decoded[register_map[int(reg_str)]] if int(reg_str) in register_map else None
-            for bit_pos, _ in bits:
-                data[alarm_data_key(reg_str, bit_pos)] = bool(raw & (1 << bit_pos)) if raw is not None else None
-
-        for prefix, temp_reg, rh_reg in (
-            ("extract", "304", "308"),
-            ("exhaust", "305", "309"),
-            ("intake", "300", "306"),
-            ("supply", "303", "307"),
-        ):
-            temp = data.get(temp_reg)
-            rh = data.get(rh_reg)
-            abs_hum = self._calc_absolute_humidity(temp, rh) if temp is not None and rh is not None else None
-            data[f"{prefix}_absolute_humidity"] = abs_hum
-            data[f"{prefix}_enthalpy"] = self._calc_enthalpy(temp, abs_hum) if temp is not None and abs_hum is not None else None
-            data[f"{prefix}_dewpoint"] = self._calc_dewpoint(temp, rh) if temp is not None and rh is not None else None
-
-        t_supply = data.get("303")
-        t_extract = data.get("304")
-        if t_supply is not None and t_extract is not None and abs(t_extract) >= 1.0:
-            raw = (t_supply / t_extract) * 100
-            data["temperature_efficiency"] = round(max(0.0, min(100.0, raw)), 1)
-        else:
-            data["temperature_efficiency"] = None
-
-        supply_flow = data.get("313")
-        extract_flow = data.get("312")
-        if supply_flow is not None and extract_flow is not None:
-            data["flow_balance"] = round(supply_flow - extract_flow, 0)
-        else:
-            data["flow_balance"] = None
-
-        supply_dewpoint = data.get("supply_dewpoint")
-        t_extract = data.get("304")
-        if supply_dewpoint is not None and t_extract is not None:
-            data["supply_condensation_alarm"] = supply_dewpoint >= (t_extract - self._dewpoint_delta)
-        else:
-            data["supply_condensation_alarm"] = None
-
-        self._last_successful_read = datetime.now()
-        _LOGGER.debug("Finished reading realtime data")
-        return data, failed_ranges
@@ -0,0 +1,94 @@
+"""Options that can be applied to a running entry, shared by setup and the options flow.
+
+Kept apart from the integration package so the config flow does not import the hub
+and the platforms just to show a form.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME, CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_ALARM_DELAY,
+    CONF_ALARM_NOTIFICATION_TITLE,
+    CONF_CONNECTION_ERROR_DELAY,
+    CONF_CONNECTION_ERROR_NOTIFICATION_TITLE,
+    CONF_DEWPOINT_DELTA,
+    CONF_FIXED_RATE,
+    CONF_NOTIFY_ALARMS_MOBILE,
+    CONF_NOTIFY_ALARMS_PERSISTENT,
+    CONF_NOTIFY_ALARMS_SERVICES,
+    CONF_NOTIFY_CONNECTION_ERRORS_MOBILE,
+    CONF_NOTIFY_CONNECTION_ERRORS_PERSISTENT,
+    CONF_NOTIFY_CONNECTION_ERRORS_SERVICES,
+    CONF_STALE_MAX_AGE,
+    DEFAULT_ALARM_DELAY,
+    DEFAULT_ALARM_NOTIFICATION_TITLE,
+    DEFAULT_CONNECTION_ERROR_DELAY,
+    DEFAULT_CONNECTION_ERROR_NOTIFICATION_TITLE,
+    DEFAULT_DEWPOINT_DELTA,
+    DEFAULT_FIXED_RATE,
+    DEFAULT_NOTIFY_ALARMS_MOBILE,
+    DEFAULT_NOTIFY_ALARMS_PERSISTENT,
+    DEFAULT_NOTIFY_ALARMS_SERVICES,
+    DEFAULT_NOTIFY_CONNECTION_ERRORS_MOBILE,
+    DEFAULT_NOTIFY_CONNECTION_ERRORS_PERSISTENT,
+    DEFAULT_NOTIFY_CONNECTION_ERRORS_SERVICES,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_MAX_AGE,
+    DOMAIN,
+)
+
+if TYPE_CHECKING:
+    from .alarm_monitor import AlarmMonitor
+    from .hub import ComfoAirHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def hub_settings(data: Mapping) -> dict:
+    """Hub options that can be changed on a running hub, see ComfoAirHub.async_update_settings."""
+    return {
+        "scan_interval": data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        "dewpoint_delta": data.get(CONF_DEWPOINT_DELTA, DEFAULT_DEWPOINT_DELTA),
+        "stale_max_age": data.get(CONF_STALE_MAX_AGE, DEFAULT_STALE_MAX_AGE),
+        "fixed_rate": data.get(CONF_FIXED_RATE, DEFAULT_FIXED_RATE),
+        "notify_connection_errors_mobile": data.get(
+            CONF_NOTIFY_CONNECTION_ERRORS_MOBILE, DEFAULT_NOTIFY_CONNECTION_ERRORS_MOBILE
+        ),
+        "notify_connection_errors_persistent": data.get(
+            CONF_NOTIFY_CONNECTION_ERRORS_PERSISTENT, DEFAULT_NOTIFY_CONNECTION_ERRORS_PERSISTENT
+        ),
+        "notify_services": data.get(CONF_NOTIFY_CONNECTION_ERRORS_SERVICES, DEFAULT_NOTIFY_CONNECTION_ERRORS_SERVICES),
+        "connection_error_notification_title": data.get(
+            CONF_CONNECTION_ERROR_NOTIFICATION_TITLE, DEFAULT_CONNECTION_ERROR_NOTIFICATION_TITLE
+        ),
+        "connection_error_delay": data.get(CONF_CONNECTION_ERROR_DELAY, DEFAULT_CONNECTION_ERROR_DELAY),
+    }
+
+
+def alarm_monitor_settings(data: Mapping) -> dict:
+    """Alarm monitor options, see AlarmMonitor.update_settings."""
+    return {
+        "notify_alarms_mobile": data.get(CONF_NOTIFY_ALARMS_MOBILE, DEFAULT_NOTIFY_ALARMS_MOBILE),
+        "notify_alarms_persistent": data.get(CONF_NOTIFY_ALARMS_PERSISTENT, DEFAULT_NOTIFY_ALARMS_PERSISTENT),
+        "notify_services": data.get(CONF_NOTIFY_ALARMS_SERVICES, DEFAULT_NOTIFY_ALARMS_SERVICES),
+        "notification_title": data.get(CONF_ALARM_NOTIFICATION_TITLE, DEFAULT_ALARM_NOTIFICATION_TITLE),
+        "alarm_delay": data.get(CONF_ALARM_DELAY, DEFAULT_ALARM_DELAY),
+    }
+
+
+async def async_apply_live_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply LIVE_OPTIONS changes in entry.data to the running hub and alarm monitor."""
+    item = hass.data[DOMAIN][entry.data[CONF_NAME]]
+    hub: ComfoAirHub = item["hub"]
+    alarm_monitor: AlarmMonitor = item["alarm_monitor"]
+    await hub.async_update_settings(**hub_settings(entry.data))
+    alarm_monitor.update_settings(**alarm_monitor_settings(entry.data))
+    _LOGGER.debug("Applied changed options of %s without a reload", entry.data[CONF_NAME])
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 import logging
+import time
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.const import CONF_NAME
+from homeassistant.core import callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_registry import RegistryEntryDisabler
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
@@ -15,9 +18,8 @@ from .const import (
     CONTROL_TYPE_SENSOR_KEYS_BY_TYPE,
     DEFAULT_CONTROL_TYPE,
     DOMAIN,
-    SENSOR_TYPES,
-    ComfoAirModbusSensorEntityDescription,
 )
+from .sensor_types import SENSOR_TYPES, ComfoAirModbusSensorEntityDescription
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,10 +35,17 @@ async def async_setup_entry(hass, entry, async_add_entities) -> None:
         CONTROL_TYPE_SENSOR_KEYS_BY_TYPE[DEFAULT_CONTROL_TYPE],
     )
 
+    entity_registry = er.async_get(hass)
     entities = []
+    supported_keys = await hub.async_supported_keys(SENSOR_TYPES)
     for sensor_description in SENSOR_TYPES.values():
         sensor_key = sensor_description.key
-        enabled_default = True
+        if sensor_key not in supported_keys:
+            # Not in the unit's register profile: never polled, so no entity either. A
+            # registry entry from before is kept, with its customisations, in case the
+            # profile turns out wrong.
+            continue
+        enabled_default = sensor_description.entity_registry_enabled_default
         if sensor_key in CONTROL_TYPE_SENSOR_KEYS:
             enabled_default = sensor_key in active_control_sensor_keys
 
@@ -51,7 +60,6 @@ async def async_setup_entry(hass, entry, async_add_entities) -> None:
         )
     async_add_entities(entities)
 
-    entity_registry = er.async_get(hass)
     for sensor_key in CONTROL_TYPE_SENSOR_KEYS:
         unique_id = f"{hub_name}_{sensor_key}"
         entity_id = entity_registry.async_get_entity_id("sensor", DOMAIN, unique_id)
@@ -68,7 +76,15 @@ async def async_setup_entry(hass, entry, async_add_entities) -> None:
 
 
 class ComfoAirSensor(CoordinatorEntity, SensorEntity):
-    """ComfoAir sensor entity."""
+    """ComfoAir sensor entity.
+
+    All static attributes are set once here; values arrive decoded and range-checked
+    from the hub's snapshot, so the state properties only do a lookup.
+    """
+
+    _last_write = 0.0
+    _cancel_delayed_write = None
+    _wrote_failure = False
 
     def __init__(
         self,
@@ -79,34 +95,64 @@ class ComfoAirSensor(CoordinatorEntity, SensorEntity):
         enabled_default: bool,
     ) -> None:
         self._platform_name = platform_name
+        self._key = description.key
         self._attr_device_info = device_info
+        self._attr_name = f"{platform_name} {description.name}"
+        self._attr_unique_id = f"{platform_name}_{description.key}"
         self.entity_description: ComfoAirModbusSensorEntityDescription = description
         self._attr_entity_registry_enabled_default = enabled_default
         super().__init__(coordinator=hub)
 
-    @property
-    def name(self):
-        return f"{self._platform_name} {self.entity_description.name}"
-
-    @property
-    def unique_id(self):
-        return f"{self._platform_name}_{self.entity_description.key}"
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state, or once the minimum update interval has passed.
+
+        A failed read of the sensor's value, and the first good one after it, are
+        written straight away, so a stale or missing value is never held back.
+        """
+        interval = self.entity_description.min_update_interval
+        data = self.coordinator.data
+        failed = data is None or data.get("connection_status") == "Failed" or data.is_stale(self._key)
+        if interval is None or failed or self._wrote_failure:
+            self._wrote_failure = failed
+            self._async_write_now()
+            return
+        if self._cancel_delayed_write is not None:
+            # The delayed write picks up the latest snapshot.
+            return
+        delay = self._last_write + interval - time.monotonic()
+        if delay <= 0:
+            self._async_write_now()
+        else:
+            self._cancel_delayed_write = async_call_later(self.hass, delay, self._async_delayed_write)
+
+    @callback
+    def _async_delayed_write(self, _now) -> None:
+        self._cancel_delayed_write = None
+        self._async_write_now()
+
+    @callback
+    def _async_write_now(self) -> None:
+        if self._cancel_delayed_write is not None:
+            self._cancel_delayed_write()
+            self._cancel_delayed_write = None
+        self._last_write = time.monotonic()
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        if self._cancel_delayed_write is not None:
+            self._cancel_delayed_write()
+            self._cancel_delayed_write = None
+        await super().async_will_remove_from_hass()
 
     @property
     def native_value(self):
-        if self.entity_description.key not in self.coordinator.data:
-            return None
-
-        value = self.coordinator.data[self.entity_description.key]
-        if value is None:
-            return None
+        data = self.coordinator.data
+        return data.get(self._key) if data is not None else None
 
-        if self.entity_description.native_min_value is not None and value < self.entity_description.native_min_value:
-            _LOGGER.debug("%s: value %s below minimum %s", self.name, value, self.entity_description.native_min_value)
-            return None
-
-        if self.entity_description.native_max_value is not None and value > self.entity_description.native_max_value:
-            _LOGGER.debug("%s: value %s above maximum %s", self.name, value, self.entity_description.native_max_value)
-            return None
-
-        return value
+    @property
+    def extra_state_attributes(self):
+        data = self.coordinator.data
+        if data is not None and data.is_stale(self._key):
+            return {"stale": True}
+        return None
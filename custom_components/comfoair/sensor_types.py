@@ -0,0 +1,504 @@
+"""Sensor entity descriptions for ComfoAir Modbus.
+
+Kept apart from the sensor platform so the services and the statistics backfill
+can look up names and units without importing the platform.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntityDescription, SensorStateClass
+from homeassistant.const import PERCENTAGE, REVOLUTIONS_PER_MINUTE, UnitOfTemperature
+
+from .const import SENSOR_FILTERS
+from .core.filters import FILTER_EMA, FILTER_MEDIAN, FILTER_RATE, FilterSpec, filtered_key
+
+
+@dataclass
+class ComfoAirModbusSensorEntityDescription(SensorEntityDescription):
+    """ComfoAir sensor entities.
+
+    Only presentation lives here; how a register is decoded (scale, sign, range) is
+    in core.const.REGISTER_SCALING. Each filter in const.SENSOR_FILTERS adds a sensor
+    (disabled by default) with the filtered value, see core.filters. With min_update_interval
+    (seconds) the state is written at most that often; polls in between are
+    coalesced into one write of the latest value.
+    """
+
+    min_update_interval: float | None = None
+
+
+SENSOR_TYPES: dict[str, ComfoAirModbusSensorEntityDescription] = {
+    "connection_status": ComfoAirModbusSensorEntityDescription(
+        key="connection_status",
+        name="connection status",
+        icon="mdi:lan-connect",
+    ),
+    "poll_overruns": ComfoAirModbusSensorEntityDescription(
+        key="poll_overruns",
+        name="poll overruns",
+        icon="mdi:timer-alert-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    "skipped_ticks": ComfoAirModbusSensorEntityDescription(
+        key="skipped_ticks",
+        name="skipped poll ticks",
+        icon="mdi:timer-off-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    "firmware_version": ComfoAirModbusSensorEntityDescription(
+        key="firmware_version",
+        name="firmware version",
+        icon="mdi:chip",
+    ),
+    "serial_number": ComfoAirModbusSensorEntityDescription(
+        key="serial_number",
+        name="serial number",
+        icon="mdi:barcode",
+    ),
+    "bootloader_version": ComfoAirModbusSensorEntityDescription(
+        key="bootloader_version",
+        name="bootloader version",
+        icon="mdi:chip",
+    ),
+    "hardware_version": ComfoAirModbusSensorEntityDescription(
+        key="hardware_version",
+        name="hardware version",
+        icon="mdi:chip",
+    ),
+    "extract_absolute_humidity": ComfoAirModbusSensorEntityDescription(
+        key="extract_absolute_humidity",
+        name="extract air absolute humidity",
+        icon="mdi:water",
+        native_unit_of_measurement="kg/kg",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=4,
+    ),
+    "extract_enthalpy": ComfoAirModbusSensorEntityDescription(
+        key="extract_enthalpy",
+        name="extract air enthalpy",
+        icon="mdi:fire",
+        native_unit_of_measurement="kJ/kg",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "extract_dewpoint": ComfoAirModbusSensorEntityDescription(
+        key="extract_dewpoint",
+        name="extract air dew point",
+        icon="mdi:thermometer-water",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "exhaust_absolute_humidity": ComfoAirModbusSensorEntityDescription(
+        key="exhaust_absolute_humidity",
+        name="exhaust air absolute humidity",
+        icon="mdi:water",
+        native_unit_of_measurement="kg/kg",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=4,
+    ),
+    "exhaust_enthalpy": ComfoAirModbusSensorEntityDescription(
+        key="exhaust_enthalpy",
+        name="exhaust air enthalpy",
+        icon="mdi:fire",
+        native_unit_of_measurement="kJ/kg",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "exhaust_dewpoint": ComfoAirModbusSensorEntityDescription(
+        key="exhaust_dewpoint",
+        name="exhaust air dew point",
+        icon="mdi:thermometer-water",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "intake_absolute_humidity": ComfoAirModbusSensorEntityDescription(
+        key="intake_absolute_humidity",
+        name="intake air absolute humidity",
+        icon="mdi:water",
+        native_unit_of_measurement="kg/kg",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=4,
+    ),
+    "intake_enthalpy": ComfoAirModbusSensorEntityDescription(
+        key="intake_enthalpy",
+        name="intake air enthalpy",
+        icon="mdi:fire",
+        native_unit_of_measurement="kJ/kg",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "intake_dewpoint": ComfoAirModbusSensorEntityDescription(
+        key="intake_dewpoint",
+        name="intake air dew point",
+        icon="mdi:thermometer-water",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "supply_absolute_humidity": ComfoAirModbusSensorEntityDescription(
+        key="supply_absolute_humidity",
+        name="supply air absolute humidity",
+        icon="mdi:water",
+        native_unit_of_measurement="kg/kg",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=4,
+    ),
+    "supply_enthalpy": ComfoAirModbusSensorEntityDescription(
+        key="supply_enthalpy",
+        name="supply air enthalpy",
+        icon="mdi:fire",
+        native_unit_of_measurement="kJ/kg",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "supply_dewpoint": ComfoAirModbusSensorEntityDescription(
+        key="supply_dewpoint",
+        name="supply air dew point",
+        icon="mdi:thermometer-water",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "temperature_efficiency": ComfoAirModbusSensorEntityDescription(
+        key="temperature_efficiency",
+        name="efficiency",
+        icon="mdi:percent",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "flow_balance": ComfoAirModbusSensorEntityDescription(
+        key="flow_balance",
+        name="air flow balance",
+        icon="mdi:scale-balance",
+        native_unit_of_measurement="m³/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    "101": ComfoAirModbusSensorEntityDescription(
+        key="101",
+        name="device status",
+        icon="mdi:information-outline",
+    ),
+    "105": ComfoAirModbusSensorEntityDescription(
+        key="105",
+        name="language",
+        icon="mdi:translate",
+    ),
+    "111": ComfoAirModbusSensorEntityDescription(
+        key="111",
+        name="orientation",
+        icon="mdi:rotate-3d-variant",
+    ),
+    "112": ComfoAirModbusSensorEntityDescription(
+        key="112",
+        name="model",
+        icon="mdi:information",
+    ),
+    "300": ComfoAirModbusSensorEntityDescription(
+        key="300",
+        name="intake air temperature",
+        icon="mdi:thermometer",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "301": ComfoAirModbusSensorEntityDescription(
+        key="301",
+        name="pre-heating temperature",
+        icon="mdi:thermometer",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "303": ComfoAirModbusSensorEntityDescription(
+        key="303",
+        name="supply air temperature",
+        icon="mdi:thermometer",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "304": ComfoAirModbusSensorEntityDescription(
+        key="304",
+        name="extract air temperature",
+        icon="mdi:thermometer",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "305": ComfoAirModbusSensorEntityDescription(
+        key="305",
+        name="exhaust air temperature",
+        icon="mdi:thermometer",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "306": ComfoAirModbusSensorEntityDescription(
+        key="306",
+        name="intake air humidity",
+        icon="mdi:water-percent",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "307": ComfoAirModbusSensorEntityDescription(
+        key="307",
+        name="supply air humidity",
+        icon="mdi:water-percent",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "308": ComfoAirModbusSensorEntityDescription(
+        key="308",
+        name="extract air humidity",
+        icon="mdi:water-percent",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "309": ComfoAirModbusSensorEntityDescription(
+        key="309",
+        name="exhaust air humidity",
+        icon="mdi:water-percent",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.HUMIDITY,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "310": ComfoAirModbusSensorEntityDescription(
+        key="310",
+        name="extract air fan",
+        icon="mdi:fan",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "311": ComfoAirModbusSensorEntityDescription(
+        key="311",
+        name="supply air fan",
+        icon="mdi:fan",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "312": ComfoAirModbusSensorEntityDescription(
+        key="312",
+        name="extract air flow",
+        icon="mdi:weather-windy",
+        native_unit_of_measurement="m³/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    "313": ComfoAirModbusSensorEntityDescription(
+        key="313",
+        name="supply air flow",
+        icon="mdi:weather-windy",
+        native_unit_of_measurement="m³/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    "314": ComfoAirModbusSensorEntityDescription(
+        key="314",
+        name="extract air fan speed",
+        icon="mdi:fan",
+        native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        min_update_interval=30,
+    ),
+    "315": ComfoAirModbusSensorEntityDescription(
+        key="315",
+        name="supply air fan speed",
+        icon="mdi:fan",
+        native_unit_of_measurement=REVOLUTIONS_PER_MINUTE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        min_update_interval=30,
+    ),
+    "316": ComfoAirModbusSensorEntityDescription(
+        key="316",
+        name="analog voltage C1",
+        icon="mdi:flash-triangle-outline",
+        native_unit_of_measurement="V",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "317": ComfoAirModbusSensorEntityDescription(
+        key="317",
+        name="rf voltage",
+        icon="mdi:flash-triangle-outline",
+        native_unit_of_measurement="V",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "318": ComfoAirModbusSensorEntityDescription(
+        key="318",
+        name="RF enabled",
+        icon="mdi:toggle-switch-outline",
+    ),
+    "319": ComfoAirModbusSensorEntityDescription(
+        key="319",
+        name="pre-heater state",
+        icon="mdi:toggle-switch-outline",
+    ),
+    "320": ComfoAirModbusSensorEntityDescription(
+        key="320",
+        name="extract air flow setpoint +- balance offset",
+        icon="mdi:weather-windy",
+        native_unit_of_measurement="m³/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    "321": ComfoAirModbusSensorEntityDescription(
+        key="321",
+        name="supply air flow setpoint",
+        icon="mdi:weather-windy",
+        native_unit_of_measurement="m³/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    "322": ComfoAirModbusSensorEntityDescription(
+        key="322",
+        name="running mean outdoor temperature",
+        icon="mdi:thermometer",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+    ),
+    "325": ComfoAirModbusSensorEntityDescription(
+        key="325",
+        name="bypass motor active",
+        icon="mdi:valve",
+    ),
+    "326": ComfoAirModbusSensorEntityDescription(
+        key="326",
+        name="bypass setpoint",
+        icon="mdi:valve-open",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    "327": ComfoAirModbusSensorEntityDescription(
+        key="327",
+        name="bypass position",
+        icon="mdi:valve-open",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    "328": ComfoAirModbusSensorEntityDescription(
+        key="328",
+        name="0-10 v speed setting",
+        icon="mdi:speedometer",
+        suggested_display_precision=0,
+    ),
+    "329": ComfoAirModbusSensorEntityDescription(
+        key="329",
+        name="rf speed setting",
+        icon="mdi:speedometer",
+        suggested_display_precision=0,
+    ),
+    "330": ComfoAirModbusSensorEntityDescription(
+        key="330",
+        name="3-way switch",
+        icon="mdi:toggle-switch-outline",
+        suggested_display_precision=0,
+    ),
+    "331": ComfoAirModbusSensorEntityDescription(
+        key="331",
+        name="bathroom switch",
+        icon="mdi:toggle-switch-outline",
+        suggested_display_precision=0,
+    ),
+    "334": ComfoAirModbusSensorEntityDescription(
+        key="334",
+        name="defrost cycles last 24h",
+        icon="mdi:snowflake-melt",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+    ),
+    "336": ComfoAirModbusSensorEntityDescription(
+        key="336",
+        name="runtime in days",
+        native_unit_of_measurement="days",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=0,
+    ),
+    "337": ComfoAirModbusSensorEntityDescription(
+        key="337",
+        name="fireplace present",
+        icon="mdi:fireplace",
+    ),
+    "338": ComfoAirModbusSensorEntityDescription(
+        key="338",
+        name="pre-heater present",
+        icon="mdi:radiator",
+    ),
+    "344": ComfoAirModbusSensorEntityDescription(
+        key="344",
+        name="heat exchanger type",
+        icon="mdi:heat-wave",
+    ),
+    "345": ComfoAirModbusSensorEntityDescription(
+        key="345",
+        name="comfort humidity control",
+        icon="mdi:water-percent",
+    ),
+}
+
+FILTER_NAMES = {FILTER_EMA: "smoothed", FILTER_MEDIAN: "median", FILTER_RATE: "rate of change"}
+RATE_UNITS = {1: "s", 60: "min", 3600: "h"}
+
+
+def _filtered_description(
+    description: ComfoAirModbusSensorEntityDescription, spec: FilterSpec
+) -> ComfoAirModbusSensorEntityDescription:
+    """Description of the sensor showing description's value through the filter spec."""
+    changes = {}
+    if spec.kind == FILTER_RATE:
+        # A rate is not a quantity of the source's device class.
+        changes = {
+            "icon": "mdi:trending-up",
+            "device_class": None,
+            "native_unit_of_measurement": (
+                f"{description.native_unit_of_measurement}/{RATE_UNITS.get(spec.per_seconds, f'{spec.per_seconds:g}s')}"
+            ),
+        }
+    return replace(
+        description,
+        key=filtered_key(description.key, spec.kind),
+        name=f"{description.name} {FILTER_NAMES[spec.kind]}",
+        entity_registry_enabled_default=False,
+        suggested_display_precision=spec.precision,
+        min_update_interval=None,
+        **changes,
+    )
+
+
+SENSOR_TYPES.update(
+    {
+        filtered_key(key, spec.kind): _filtered_description(SENSOR_TYPES[key], spec)
+        for key, specs in SENSOR_FILTERS.items()
+        for spec in specs
+    }
+)
@@ -0,0 +1,284 @@
+"""Services of the ComfoAir integration."""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, ENUM_REGISTERS, MAX_REGISTERS, READ_RANGES
+from .core.scan import SupportMap
+from .hub import ComfoAirHub
+from .sensor_types import SENSOR_TYPES
+
+SERVICE_QUERY_HISTORY = "query_history"
+SERVICE_READ_REGISTERS = "read_registers"
+SERVICE_SCAN_REGISTERS = "scan_registers"
+SERVICE_LIVE_MODE = "live_mode"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_REGISTERS = "registers"
+ATTR_RAW = "raw"
+ATTR_LIMIT = "limit"
+ATTR_ADDRESS = "address"
+ATTR_COUNT = "count"
+ATTR_FIRST = "first"
+ATTR_LAST = "last"
+ATTR_INTERVAL = "interval"
+ATTR_DURATION = "duration"
+
+DEFAULT_QUERY_LIMIT = 10000
+MAX_QUERY_LIMIT = 100000
+# Default scan range; it holds every register of the known models.
+DEFAULT_SCAN_FIRST = 0
+DEFAULT_SCAN_LAST = 999
+DEFAULT_LIVE_INTERVAL = 0.5
+DEFAULT_LIVE_DURATION = 300
+MAX_LIVE_DURATION = 3600
+
+_REALTIME_ADDRESSES = frozenset(address for start, count in READ_RANGES for address in range(start, start + count))
+_REALTIME_REGISTERS = {str(address) for address in _REALTIME_ADDRESSES}
+
+QUERY_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_REGISTERS): vol.All(cv.ensure_list, [vol.In(_REALTIME_REGISTERS)]),
+        vol.Optional(ATTR_RAW, default=False): cv.boolean,
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_QUERY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_QUERY_LIMIT)
+        ),
+    }
+)
+
+REGISTER_ADDRESS = vol.All(vol.Coerce(int), vol.Range(min=0, max=0xFFFF))
+REGISTER_COUNT = vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_REGISTERS))
+
+READ_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_ADDRESS): REGISTER_ADDRESS,
+        vol.Optional(ATTR_COUNT, default=1): REGISTER_COUNT,
+    }
+)
+
+SCAN_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_FIRST, default=DEFAULT_SCAN_FIRST): REGISTER_ADDRESS,
+        vol.Optional(ATTR_LAST, default=DEFAULT_SCAN_LAST): REGISTER_ADDRESS,
+    }
+)
+
+LIVE_MODE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_REGISTERS): vol.All(cv.ensure_list, [vol.In(_REALTIME_REGISTERS)], vol.Length(min=1)),
+        vol.Optional(ATTR_INTERVAL, default=DEFAULT_LIVE_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=60)
+        ),
+        vol.Optional(ATTR_DURATION, default=DEFAULT_LIVE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=MAX_LIVE_DURATION)
+        ),
+    }
+)
+
+
+def hub_for_entry(hass: HomeAssistant, entry_id: str) -> ComfoAirHub:
+    """Return the hub of a loaded ComfoAir config entry."""
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN or entry.data[CONF_NAME] not in hass.data.get(DOMAIN, {}):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="entry_not_loaded", translation_placeholders={"entry": entry_id}
+        )
+    return hass.data[DOMAIN][entry.data[CONF_NAME]]["hub"]
+
+
+def _timestamp(value: datetime) -> float:
+    # Times without a time zone are local time.
+    return dt_util.as_utc(value).timestamp()
+
+
+async def _async_query_history(call: ServiceCall) -> ServiceResponse:
+    """Return recorded polls as columns: the poll times and, per register, its values."""
+    hass = call.hass
+    hub = hub_for_entry(hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    history = hub.history
+    if history is None:
+        raise ServiceValidationError(translation_domain=DOMAIN, translation_key="history_disabled")
+
+    start = _timestamp(call.data[ATTR_START])
+    end = _timestamp(call.data[ATTR_END]) if ATTR_END in call.data else dt_util.utcnow().timestamp()
+    registers = call.data.get(ATTR_REGISTERS)
+    addresses = sorted(int(register) for register in registers) if registers else None
+    limit = call.data[ATTR_LIMIT]
+
+    # Decoding a long range takes a while, so it runs off the event loop. One more poll
+    # than the limit is read, to tell whether the range was cut short.
+    times, columns = await hass.async_add_executor_job(history.query, start, end, addresses, limit + 1)
+    more = len(times) > limit
+    if more:
+        next_start = times[limit]
+        del times[limit:]
+        for column in columns.values():
+            del column[limit:]
+
+    values: dict[str, list] = {}
+    decoders = await hub.async_decoders()
+    for address, column in columns.items():
+        key = str(address)
+        decoder = None if call.data[ATTR_RAW] else decoders.get(key)
+        if decoder is None:
+            values[key] = column
+        else:
+            decode = decoder[1]
+            values[key] = [None if word is None else decode(word) for word in column]
+
+    response: ServiceResponse = {
+        "times": [dt_util.utc_from_timestamp(timestamp).isoformat() for timestamp in times],
+        "values": values,
+    }
+    if more:
+        # Pass as start to get the next page; rounded down, so that poll is included.
+        response["next_start"] = dt_util.utc_from_timestamp(math.floor(next_start * 1e6) / 1e6).isoformat()
+    return response
+
+
+async def async_read_registers(hub: ComfoAirHub, address: int, count: int) -> dict[str, dict[str, Any]]:
+    """Read registers along with the hub's next poll; per address the raw word and what is known about it.
+
+    Registers the integration knows get their decoded value, and the name and unit
+    of their sensor.
+    """
+    if address + count > 0x10000:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_register_range",
+            translation_placeholders={"first": str(address), "last": str(address + count - 1)},
+        )
+    try:
+        words = await hub.async_read_registers(address, count)
+    except TimeoutError as err:
+        raise HomeAssistantError(translation_domain=DOMAIN, translation_key="read_timeout") from err
+    if words is None:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN,
+            translation_key="read_failed",
+            translation_placeholders={"first": str(address), "last": str(address + count - 1)},
+        )
+
+    decoders = await hub.async_decoders()
+    registers: dict[str, dict[str, Any]] = {}
+    for offset, word in enumerate(words):
+        key = str(address + offset)
+        register: dict[str, Any] = {"raw": word}
+        decoder = decoders.get(key)
+        if decoder is not None:
+            register["value"] = decoder[1](word)
+        elif key in ENUM_REGISTERS:
+            register["value"] = ENUM_REGISTERS[key].get(word, word)
+        description = SENSOR_TYPES.get(key)
+        if description is not None:
+            register["name"] = description.name
+            if description.native_unit_of_measurement is not None:
+                register["unit"] = description.native_unit_of_measurement
+        registers[key] = register
+    return registers
+
+
+async def _async_read_registers(call: ServiceCall) -> ServiceResponse:
+    """Read holding registers along with the next poll."""
+    hub = hub_for_entry(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    return {"registers": await async_read_registers(hub, call.data[ATTR_ADDRESS], call.data[ATTR_COUNT])}
+
+
+async def async_scan_registers(
+    hass: HomeAssistant, entry_id: str, hub: ComfoAirHub, first: int, last: int
+) -> SupportMap:
+    """Scan which registers from first to last the unit supports and use the result.
+
+    The read plan follows at once; if support for a realtime register changed, the
+    entry is reloaded, so entities for registers the unit lacks are removed or added.
+    """
+    unsupported = await hub.async_unsupported_registers() & _REALTIME_ADDRESSES
+    support_map = await hub.async_scan_registers(first, last)
+    if await hub.async_unsupported_registers() & _REALTIME_ADDRESSES != unsupported:
+        hass.config_entries.async_schedule_reload(entry_id)
+    return support_map
+
+
+async def _async_scan_registers(call: ServiceCall) -> ServiceResponse:
+    """Map the supported holding registers in a range."""
+    entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+    hub = hub_for_entry(call.hass, entry_id)
+    first = call.data[ATTR_FIRST]
+    last = call.data[ATTR_LAST]
+    if first > last:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_scan_range",
+            translation_placeholders={"first": str(first), "last": str(last)},
+        )
+    support_map = await async_scan_registers(call.hass, entry_id, hub, first, last)
+    return support_map.as_dict()
+
+
+async def _async_live_mode(call: ServiceCall) -> None:
+    """Read a few registers at a high rate for a while, as events; a duration of 0 ends live mode."""
+    hub = hub_for_entry(call.hass, call.data[ATTR_CONFIG_ENTRY_ID])
+    if call.data[ATTR_DURATION] == 0:
+        hub.async_stop_live_mode()
+        return
+    registers = call.data[ATTR_REGISTERS]
+    # Registers without a value of their own (unused, or alarm bit fields) or missing
+    # from the unit would silently be left out of the reads.
+    decoders = await hub.async_decoders()
+    supported = await hub.async_supported_keys(registers)
+    rejected = sorted(
+        {register for register in registers if register not in decoders or register not in supported}, key=int
+    )
+    if rejected:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="live_mode_unavailable",
+            translation_placeholders={"registers": ", ".join(rejected)},
+        )
+    hub.async_start_live_mode(
+        (int(register) for register in registers), call.data[ATTR_INTERVAL], call.data[ATTR_DURATION]
+    )
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_QUERY_HISTORY,
+        _async_query_history,
+        schema=QUERY_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_READ_REGISTERS,
+        _async_read_registers,
+        schema=READ_REGISTERS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SCAN_REGISTERS,
+        _async_scan_registers,
+        schema=SCAN_REGISTERS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_LIVE_MODE, _async_live_mode, schema=LIVE_MODE_SCHEMA)
@@ -0,0 +1,151 @@
+"""Websocket commands of the ComfoAir integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .core.snapshot import ComfoAirSnapshot
+from .services import REGISTER_ADDRESS, REGISTER_COUNT, async_read_registers, hub_for_entry
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/read_registers",
+        vol.Required("entry_id"): str,
+        vol.Required("address"): REGISTER_ADDRESS,
+        vol.Optional("count", default=1): REGISTER_COUNT,
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def ws_read_registers(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Read holding registers along with the next poll, like the read_registers action."""
+    hub = hub_for_entry(hass, msg["entry_id"])
+    registers = await async_read_registers(hub, msg["address"], msg["count"])
+    connection.send_result(msg["id"], {"registers": registers})
+
+
+# Snapshot values that only mean something inside the process.
+_INTERNAL_KEYS = frozenset({"acquired_monotonic"})
+
+
+def _snapshot_values(snapshot: ComfoAirSnapshot | None, keys: frozenset[str] | None) -> dict[str, Any]:
+    if snapshot is None:
+        return {}
+    return {
+        key: snapshot.get(key)
+        for key in (snapshot if keys is None else keys)
+        if key not in _INTERNAL_KEYS and key in snapshot
+    }
+
+
+def _available(snapshot: ComfoAirSnapshot | None) -> bool:
+    return snapshot is not None and snapshot.get("connection_status") != "Failed"
+
+
+def _stale_keys(snapshot: ComfoAirSnapshot | None, values: dict[str, Any]) -> list[str]:
+    if snapshot is None:
+        return []
+    return sorted(key for key in values if snapshot.is_stale(key))
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required("entry_id"): str,
+        vol.Optional("keys"): [str],
+    }
+)
+@callback
+def ws_subscribe(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]) -> None:
+    """Stream a hub's data: all values first, then per poll only the keys that changed.
+
+    Every message has a sequence number, one higher than the previous; a client that
+    sees a gap resubscribes for a new full message. available and stale are only
+    sent when they change. When the entry is unloaded (or reloaded) a last message
+    with ended set closes the subscription.
+    """
+    hub = hub_for_entry(hass, msg["entry_id"])
+    keys = frozenset(msg["keys"]) if "keys" in msg else None
+    msg_id = msg["id"]
+    values = _snapshot_values(hub.data, keys)
+    stale = _stale_keys(hub.data, values)
+    available = _available(hub.data)
+    sequence = 0
+
+    @callback
+    def _async_update() -> None:
+        nonlocal values, stale, available, sequence
+        snapshot = hub.data
+        new_values = _snapshot_values(snapshot, keys)
+        new_stale = _stale_keys(snapshot, new_values)
+        delta: dict[str, Any] = {}
+        changed = {key: value for key, value in new_values.items() if values.get(key, ...) != value}
+        changed.update({key: None for key in values.keys() - new_values.keys()})
+        if changed:
+            delta["changed"] = changed
+        if new_stale != stale:
+            delta["stale"] = new_stale
+        new_available = _available(snapshot)
+        if new_available != available:
+            delta["available"] = new_available
+        values, stale, available = new_values, new_stale, new_available
+        if not delta:
+            return
+        sequence += 1
+        connection.send_message(
+            websocket_api.event_message(msg_id, {"seq": sequence, "time": dt_util.utcnow().isoformat(), **delta})
+        )
+
+    @callback
+    def _async_unloaded() -> None:
+        nonlocal sequence
+        unsubscribe = connection.subscriptions.pop(msg_id, None)
+        if unsubscribe is None:
+            # The client unsubscribed already.
+            return
+        unsubscribe()
+        sequence += 1
+        connection.send_message(
+            websocket_api.event_message(msg_id, {"seq": sequence, "time": dt_util.utcnow().isoformat(), "ended": True})
+        )
+
+    remove_listener = hub.async_add_listener(_async_update)
+    remove_stream = hub.async_add_stream(_async_unloaded)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        # Called on unsubscribe, on disconnect and on unload.
+        remove_listener()
+        remove_stream()
+
+    connection.subscriptions[msg_id] = _async_unsubscribe
+    connection.send_result(msg_id)
+    connection.send_message(
+        websocket_api.event_message(
+            msg_id,
+            {
+                "seq": sequence,
+                "time": dt_util.utcnow().isoformat(),
+                "full": True,
+                "values": values,
+                "stale": stale,
+                "available": available,
+            },
+        )
+    )
+
+
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, ws_read_registers)
+    websocket_api.async_register_command(hass, ws_subscribe)
@@ -0,0 +1,76 @@
+"""Dedicated Modbus I/O worker for the ComfoAir integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ModbusWorker:
+    """Single thread that owns one Modbus bus and runs its jobs in submission order.
+
+    All blocking client calls for a bus go through this worker, so the client is
+    only ever touched from one thread and no locking is needed around it.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=f"comfoair_{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """Queue func(*args) on the worker thread and return a future for its result."""
+        future: Future = Future()
+        if self._stopping:
+            future.set_exception(RuntimeError(f"Modbus worker {self._name} is stopped"))
+            return future
+        self._queue.put((future, func, args))
+        return future
+
+    async def async_run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) on the worker thread and await the result."""
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    async def async_stop(self, final: Callable[[], Any] | None = None) -> None:
+        """Run an optional final job (e.g. closing the client), then stop the thread.
+
+        Jobs that were already queued still run first, so shutdown is ordered.
+        """
+        if self._stopping:
+            return
+        future = self.submit(final) if final is not None else None
+        self._stopping = True
+        self._queue.put(_STOP)
+        if future is not None:
+            try:
+                await asyncio.wrap_future(future)
+            except Exception as err:
+                _LOGGER.error("Error in final job of Modbus worker %s: %s", self._name, err)
+
+    def _run(self) -> None:
+        _LOGGER.debug("Modbus worker %s started", self._name)
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            future, func, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = func(*args)
+            except BaseException as err:
+                future.set_exception(err)
+            else:
+                future.set_result(result)
+        _LOGGER.debug("Modbus worker %s stopped", self._name)
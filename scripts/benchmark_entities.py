@@ -0,0 +1,141 @@
+"""Profile a full ComfoAir coordinator update across all entities, state writes included.
+
+Builds each poll's snapshot with the core's public API (random register words,
+decoded, derived and filtered like a real poll, but without bus time) and hands it
+to the hub with async_set_updated_data. Every entity then runs its coordinator
+update and writes its state to the state machine, as in Home Assistant.
+
+Run from the repository root, in an environment with Home Assistant installed:
+
+    python scripts/benchmark_entities.py --iterations 2000
+    python scripts/benchmark_entities.py --profile
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import logging
+import pstats
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import (  # noqa: E402
+    area_registry as ar,
+    category_registry as cr,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+    label_registry as lr,
+)
+from homeassistant.helpers.entity_component import EntityComponent  # noqa: E402
+
+from custom_components.comfoair.binary_sensor import AlarmBitSensor, SupplyCondensationAlarmSensor  # noqa: E402
+from custom_components.comfoair.const import ALARM_BITS, READ_RANGES, SENSOR_FILTERS  # noqa: E402
+from custom_components.comfoair.core.filters import FilterBank  # noqa: E402
+from custom_components.comfoair.core.psychrometrics import DERIVED_INPUTS, derive_values  # noqa: E402
+from custom_components.comfoair.core.snapshot import ComfoAirSnapshot, LastGoodCache  # noqa: E402
+from custom_components.comfoair.core.transport import RequestTiming  # noqa: E402
+from custom_components.comfoair.hub import ComfoAirHub  # noqa: E402
+from custom_components.comfoair.sensor import ComfoAirSensor  # noqa: E402
+from custom_components.comfoair.sensor_types import SENSOR_TYPES  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Polls:
+    """Snapshots of plausible random polls, built like ModbusPoller.read_realtime_data does."""
+
+    def __init__(self, seed: int) -> None:
+        self._random = random.Random(seed)
+        self._cache = LastGoodCache(300)
+        self._filters = FilterBank(SENSOR_FILTERS)
+
+    def snapshot(self) -> ComfoAirSnapshot:
+        now = time.monotonic()
+        timing = RequestTiming(now, now, time.time(), time.time())
+        chunks = [
+            (start, [self._random.randrange(0, 1000) for _ in range(count)], timing) for start, count in READ_RANGES
+        ]
+        values: dict = {}
+        snapshot = self._cache.snapshot(chunks, [], now, values, {})
+        values.update(derive_values(snapshot, DERIVED_INPUTS, 1.0))
+        values.update(self._filters.update(snapshot)[0])
+        return snapshot.replace(connection_status="OK", poll_overruns=0, skipped_ticks=0)
+
+
+def _create_entities(hub: ComfoAirHub) -> tuple[list, list]:
+    device_info = {"identifiers": {("comfoair", hub.name)}}
+    sensors = [
+        ComfoAirSensor(hub.name, hub, device_info, description, True) for description in SENSOR_TYPES.values()
+    ]
+    binary_sensors: list = [SupplyCondensationAlarmSensor(hub.name, hub, device_info)]
+    for reg_str, bits in ALARM_BITS.items():
+        for bit_pos, description in bits:
+            binary_sensors.append(AlarmBitSensor(hub.name, hub, device_info, reg_str, bit_pos, description))
+    return sensors, binary_sensors
+
+
+async def _run(iterations: int, profile: bool) -> None:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        for registry in (ar, cr, dr, er, fr, lr):
+            await registry.async_load(hass)
+
+        # Nothing listens on this port: the hub's own first refresh fails quickly, and
+        # all data after it comes from _Polls.
+        hub = ComfoAirHub(hass, "bench", 5, "tcp", 1, host="127.0.0.1", port=9)
+        await hass.async_block_till_done()
+
+        # Added like the platforms add them, so entities disabled by default stay out.
+        sensors, binary_sensors = _create_entities(hub)
+        await EntityComponent(_LOGGER, "sensor", hass).async_add_entities(sensors)
+        await EntityComponent(_LOGGER, "binary_sensor", hass).async_add_entities(binary_sensors)
+        entities = len(hass.states.async_all())
+
+        polls = _Polls(seed=1)
+        hub.async_set_updated_data(polls.snapshot())
+        profiler = cProfile.Profile() if profile else None
+        snapshot_time = 0.0
+        update_time = 0.0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            snapshot = polls.snapshot()
+            snapshot_time += time.perf_counter() - start
+            if profiler is not None:
+                profiler.enable()
+            start = time.perf_counter()
+            hub.async_set_updated_data(snapshot)
+            update_time += time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+        await hass.async_block_till_done()
+
+        print(f"{entities} entities, {iterations} updates")
+        print(f"{snapshot_time / iterations * 1e6:.1f} us per snapshot (decode, derive, filter)")
+        print(f"{update_time / iterations * 1e6:.1f} us per coordinator update, state writes included")
+        print(f"{update_time / iterations / entities * 1e6:.2f} us per entity")
+        if profiler is not None:
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+        await hub.async_close()
+        await hass.async_stop(force=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--profile", action="store_true", help="print a cProfile report of the coordinator updates")
+    args = parser.parse_args()
+    asyncio.run(_run(args.iterations, args.profile))
+
+
+if __name__ == "__main__":
+    main()
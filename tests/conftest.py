@@ -0,0 +1,6 @@
+"""Test setup: the HA-free core package is imported as `core`, without Home Assistant."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "custom_components" / "comfoair"))
@@ -0,0 +1,142 @@
+"""Tests for the built-in FC03 client: frame packing, CRC and response checks."""
+
+import socket
+import struct
+import threading
+
+import pytest
+
+from core.const import MODE_RTU_OVER_TCP, MODE_TCP
+from core.fc03 import Fc03Client, ModbusExceptionResponse, ModbusFrameError, crc16
+
+
+def _rtu(frame: bytes) -> bytes:
+    return frame + struct.pack("<H", crc16(frame))
+
+
+class _Unit:
+    """One-connection TCP server that records each request and answers with respond(request)."""
+
+    def __init__(self, respond) -> None:
+        self.requests: list[bytes] = []
+        self._respond = respond
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self.port = self._server.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        connection, _ = self._server.accept()
+        with connection:
+            while request := connection.recv(256):
+                self.requests.append(request)
+                connection.sendall(self._respond(request))
+
+    def close(self) -> None:
+        self._server.close()
+        self._thread.join(1)
+
+
+@pytest.fixture
+def unit():
+    units: list[_Unit] = []
+
+    def start(respond) -> _Unit:
+        units.append(_Unit(respond))
+        return units[-1]
+
+    yield start
+    for started in units:
+        started.close()
+
+
+def _client(mode: str, port: int) -> Fc03Client:
+    client = Fc03Client(mode, 1, host="127.0.0.1", port=port, timeout=1)
+    assert client.connect()
+    return client
+
+
+def test_crc16_matches_the_modbus_reference() -> None:
+    # Read one register from address 0 of unit 1: the CRC goes on the wire as 84 0A.
+    assert crc16(bytes.fromhex("010300000001")) == 0x0A84
+    assert _rtu(bytes.fromhex("010300000001"))[-2:] == bytes.fromhex("840A")
+
+
+def test_mbap_request_and_response(unit) -> None:
+    def respond(request: bytes) -> bytes:
+        transaction = struct.unpack_from(">H", request)[0]
+        return struct.pack(">HHHBBB3H", transaction, 0, 9, 1, 3, 6, 215, 0, 65535)
+
+    server = unit(respond)
+    client = _client(MODE_TCP, server.port)
+    try:
+        assert list(client.read_holding_registers(300, 3)) == [215, 0, 65535]
+        assert list(client.read_holding_registers(300, 3)) == [215, 0, 65535]
+    finally:
+        client.close()
+    assert server.requests == [
+        struct.pack(">HHHBBHH", 1, 0, 6, 1, 3, 300, 3),
+        struct.pack(">HHHBBHH", 2, 0, 6, 1, 3, 300, 3),
+    ]
+
+
+def test_mbap_response_for_another_transaction_is_rejected(unit) -> None:
+    server = unit(lambda request: struct.pack(">HHHBBBH", 99, 0, 5, 1, 3, 2, 1))
+    client = _client(MODE_TCP, server.port)
+    try:
+        with pytest.raises(ModbusFrameError):
+            client.read_holding_registers(300, 1)
+    finally:
+        client.close()
+
+
+def test_rtu_request_and_response(unit) -> None:
+    server = unit(lambda request: _rtu(struct.pack(">BBB2H", 1, 3, 4, 1200, 1250)))
+    client = _client(MODE_RTU_OVER_TCP, server.port)
+    try:
+        assert list(client.read_holding_registers(314, 2)) == [1200, 1250]
+    finally:
+        client.close()
+    assert server.requests == [_rtu(struct.pack(">BBHH", 1, 3, 314, 2))]
+
+
+def test_rtu_response_with_a_bad_crc_is_rejected(unit) -> None:
+    def respond(request: bytes) -> bytes:
+        frame = bytearray(_rtu(struct.pack(">BBBH", 1, 3, 2, 215)))
+        frame[-1] ^= 0xFF
+        return bytes(frame)
+
+    server = unit(respond)
+    client = _client(MODE_RTU_OVER_TCP, server.port)
+    try:
+        with pytest.raises(ModbusFrameError, match="CRC"):
+            client.read_holding_registers(300, 1)
+    finally:
+        client.close()
+
+
+def test_rtu_exception_response(unit) -> None:
+    server = unit(lambda request: _rtu(struct.pack(">BBB", 1, 0x83, 2)))
+    client = _client(MODE_RTU_OVER_TCP, server.port)
+    try:
+        with pytest.raises(ModbusExceptionResponse) as raised:
+            client.read_holding_registers(317, 1)
+    finally:
+        client.close()
+    assert raised.value.exception_code == 2
+
+
+def test_response_with_the_wrong_register_count_is_rejected(unit) -> None:
+    server = unit(lambda request: _rtu(struct.pack(">BBBH", 1, 3, 2, 215)))
+    client = _client(MODE_RTU_OVER_TCP, server.port)
+    try:
+        with pytest.raises(ModbusFrameError):
+            client.read_holding_registers(300, 2)
+    finally:
+        client.close()
+
+
+@pytest.mark.parametrize("count", [0, 126])
+def test_count_outside_the_protocol_limit(count: int) -> None:
+    with pytest.raises(ValueError):
+        Fc03Client(MODE_TCP, 1, host="127.0.0.1", port=502).read_holding_registers(300, count)
@@ -0,0 +1,68 @@
+"""Tests for the streaming filters."""
+
+import math
+
+import pytest
+
+from core.filters import (
+    FILTER_EMA,
+    FILTER_MEDIAN,
+    FILTER_RATE,
+    EmaFilter,
+    FilterBank,
+    FilterSpec,
+    MedianFilter,
+    RateFilter,
+    filter_source,
+    filtered_key,
+)
+from core.snapshot import LastGoodCache
+from core.transport import RequestTiming
+
+
+def test_filtered_keys() -> None:
+    assert filtered_key("308", FILTER_EMA) == "308_ema"
+    assert filter_source("308_ema") == "308"
+    assert filter_source("alarm_400_3") is None
+    assert filter_source("308") is None
+
+
+def test_ema_is_weighted_by_the_time_between_samples() -> None:
+    ema = EmaFilter(60)
+    assert ema.update(10.0, 0.0) == 10.0
+    assert ema.update(20.0, 60.0) == pytest.approx(10.0 + 10.0 * (1 - math.exp(-1)))
+    # A sample at the same time changes nothing.
+    assert ema.update(100.0, 60.0) == pytest.approx(10.0 + 10.0 * (1 - math.exp(-1)))
+
+
+def test_median_removes_a_spike() -> None:
+    median = MedianFilter(3)
+    assert [median.update(value, time) for time, value in enumerate([20, 21, 90, 22, 23])] == [20, 20.5, 21, 22, 23]
+
+
+def test_rate_per_minute_over_the_window() -> None:
+    rate = RateFilter(3, 60)
+    assert rate.update(10.0, 0.0) is None
+    assert rate.update(11.0, 30.0) == pytest.approx(2.0)
+    assert rate.update(13.0, 60.0) == pytest.approx(3.0)
+    # The oldest sample left the window.
+    assert rate.update(13.0, 90.0) == pytest.approx(2.0)
+
+
+def test_bank_keeps_the_last_output_for_stale_sources() -> None:
+    cache = LastGoodCache(300)
+    bank = FilterBank({"314": (FilterSpec(FILTER_MEDIAN, 3, precision=0),), "315": (FilterSpec(FILTER_RATE, 2),)})
+    assert bank.keys == {"314_median", "315_rate"}
+
+    def poll(now: float, words: list[int] | None):
+        timing = RequestTiming(now, now, now, now)
+        if words is None:
+            return cache.snapshot([], [(314, 2)], now, {}, {})
+        return cache.snapshot([(314, words, timing)], [], now, {}, {})
+
+    values, stale = bank.update(poll(0.0, [1200, 1250]))
+    assert values["314_median"] == 1200
+    assert stale == frozenset()
+    values, stale = bank.update(poll(10.0, None), keys=["314_median"])
+    assert values == {"314_median": 1200}
+    assert stale == {"314_median"}
@@ -0,0 +1,126 @@
+"""Tests for the memory-mapped history ring."""
+
+import pytest
+
+from core.history import BLOCK_SLOTS, HistoryStore, blocks_for
+from core.snapshot import LastGoodCache
+from core.transport import RequestTiming
+
+START = 1_700_000_000.0
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "history.bin")
+
+
+class _Polls:
+    """Snapshots of polls of registers 300-302, one second apart."""
+
+    def __init__(self) -> None:
+        self._cache = LastGoodCache(300)
+        self.time = START
+
+    def next(self, words: list[int] | None):
+        """Poll with the given words for 300-302, or a failed read if None."""
+        self.time += 1
+        timing = RequestTiming(self.time, self.time, self.time, self.time)
+        if words is None:
+            return self._cache.snapshot([], [(300, 3)], self.time, {}, {})
+        return self._cache.snapshot([(300, words, timing)], [], self.time, {}, {})
+
+
+def _append(store: HistoryStore, polls: _Polls, words: list[int] | None) -> None:
+    snapshot = polls.next(words)
+    store.append(polls.time, snapshot)
+
+
+def test_blocks_for() -> None:
+    assert blocks_for(0, 1) == 2
+    assert blocks_for(10 * (BLOCK_SLOTS - 1), 1) == 11
+
+
+def test_polls_read_back_as_written(path) -> None:
+    store = HistoryStore(path, 4)
+    polls = _Polls()
+    written = [[200, 0, 65535], [201, 0, 65535], [199, 5, 0], [60000, 5, 0], [60001, 5, 1]]
+    for words in written:
+        _append(store, polls, words)
+    times, columns = store.query(START, START + 100, [300, 301, 302])
+    store.close()
+    assert times == [START + 1 + index for index in range(len(written))]
+    assert [list(poll) for poll in zip(columns[300], columns[301], columns[302])] == written
+
+
+def test_words_not_read_are_none(path) -> None:
+    store = HistoryStore(path, 4)
+    polls = _Polls()
+    _append(store, polls, [200, 1, 2])
+    _append(store, polls, None)
+    _append(store, polls, [202, 1, 2])
+    _times, columns = store.query(START, START + 100, [300, 325])
+    store.close()
+    assert columns[300] == [200, None, 202]
+    assert columns[325] == [None, None, None]
+
+
+def test_time_range_and_limit(path) -> None:
+    store = HistoryStore(path, 4)
+    polls = _Polls()
+    for value in range(10):
+        _append(store, polls, [value, 0, 0])
+    times, columns = store.query(START + 3, START + 6, [300])
+    assert times == [START + 3, START + 4, START + 5, START + 6]
+    assert columns[300] == [2, 3, 4, 5]
+    times, columns = store.query(START, START + 100, [300], limit=2)
+    store.close()
+    assert columns[300] == [0, 1]
+
+
+def test_oldest_block_is_overwritten(path) -> None:
+    store = HistoryStore(path, 2)
+    polls = _Polls()
+    for value in range(3 * BLOCK_SLOTS):
+        _append(store, polls, [value % 100, 0, 0])
+    times, columns = store.query(START, polls.time, [300])
+    store.close()
+    assert times[-1] == polls.time
+    assert START + 1 < times[0]
+    assert len(times) < 3 * BLOCK_SLOTS
+    assert columns[300][-1] == (3 * BLOCK_SLOTS - 1) % 100
+
+
+def test_history_survives_reopening(path) -> None:
+    polls = _Polls()
+    store = HistoryStore(path, 4)
+    _append(store, polls, [200, 1, 2])
+    store.close()
+    store = HistoryStore(path, 4)
+    _append(store, polls, [201, 1, 2])
+    times, columns = store.query(START, START + 100, [300])
+    store.close()
+    assert times == [START + 1, START + 2]
+    assert columns[300] == [200, 201]
+
+
+def test_reopening_with_fewer_blocks_keeps_the_newest(path) -> None:
+    polls = _Polls()
+    for _ in range(4):
+        # Each open starts a new block.
+        store = HistoryStore(path, 4)
+        _append(store, polls, [200, 0, 0])
+        store.close()
+    store = HistoryStore(path, 2)
+    times, _columns = store.query(START, START + 100, [300])
+    store.close()
+    assert times == [START + 3, START + 4]
+
+
+def test_closed_store_finds_nothing(path) -> None:
+    store = HistoryStore(path, 4)
+    polls = _Polls()
+    _append(store, polls, [200, 1, 2])
+    store.close()
+    store.close()
+    _append(store, polls, [201, 1, 2])
+    assert store.query(START, START + 100, [300]) == ([], {300: []})
@@ -0,0 +1,58 @@
+"""Tests for the read plan."""
+
+from core.const import READ_RANGES
+from core.plan import build_read_plan, merge_extra_ranges, registers_for_key
+
+
+def test_range_is_cut_to_the_needed_span() -> None:
+    assert build_read_plan({300, 305}) == [(300, 6, 0)]
+
+
+def test_ranges_without_needed_registers_are_dropped() -> None:
+    assert build_read_plan(set()) == []
+    assert build_read_plan({336}) == [(336, 1, 0)]
+
+
+def test_all_registers_read_every_range_whole() -> None:
+    registers = {address for start, count in READ_RANGES for address in range(start, start + count)}
+    assert build_read_plan(registers) == [(start, count, 0) for start, count in READ_RANGES]
+
+
+def test_span_is_split_at_unsupported_addresses() -> None:
+    assert build_read_plan({300, 310}, unsupported={305}) == [(300, 1, 0), (310, 1, 0)]
+    # An unsupported address outside the span changes nothing.
+    assert build_read_plan({300, 310}, unsupported={320}) == [(300, 11, 0)]
+
+
+def test_span_of_only_slow_registers_gets_the_slow_interval() -> None:
+    assert build_read_plan({336, 337}, {336, 337}, 300) == [(336, 2, 300)]
+    # A slow register sharing a span with a realtime one is read along every poll.
+    assert build_read_plan({300, 305}, {305}, 300) == [(300, 6, 0)]
+
+
+def test_registers_for_key() -> None:
+    assert registers_for_key("300") == {300}
+    assert registers_for_key("alarm_400_3") == {400}
+    assert registers_for_key("308_ema") == {308}
+    assert registers_for_key("serial_number") == set()
+
+
+def test_extra_range_inside_a_planned_one_is_read_by_it() -> None:
+    assert merge_extra_ranges([(300, 10)], [(302, 2)]) == [((300, 10), [(300, 10)])]
+
+
+def test_adjoining_extra_range_widens_the_planned_request() -> None:
+    assert merge_extra_ranges([(300, 10)], [(310, 5)]) == [((300, 15), [(300, 10)])]
+    assert merge_extra_ranges([(300, 10), (325, 3)], [(310, 15)]) == [((300, 28), [(300, 10), (325, 3)])]
+
+
+def test_extra_range_across_a_gap_gets_its_own_request() -> None:
+    assert merge_extra_ranges([(300, 10)], [(311, 2)]) == [((311, 2), [])]
+
+
+def test_planned_ranges_without_extra_ranges_are_left_out() -> None:
+    assert merge_extra_ranges([(101, 1), (300, 10)], [(500, 2)]) == [((500, 2), [])]
+
+
+def test_requests_stay_within_max_count() -> None:
+    assert merge_extra_ranges([(300, 10)], [(305, 10)], max_count=12) == [((305, 10), [])]
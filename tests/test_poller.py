@@ -0,0 +1,107 @@
+"""Tests for the poll deadline, the retry budget and the order of the ranges."""
+
+import pytest
+
+import core.poller
+from core.const import MODE_TCP
+from core.poller import MAX_POLL_RETRIES, MAX_READ_RETRIES, RETRY_DELAY, ModbusPoller
+from core.transport import RequestTiming
+
+LATENCY = 0.1
+
+
+class _Clock:
+    """Stands in for the time module: sleeping advances the monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class _Unit:
+    """Fake transport whose requests each take LATENCY on the clock; failing ranges get no answer."""
+
+    def __init__(self, clock: _Clock, failing=()) -> None:
+        self.requests: list[tuple[int, int]] = []
+        self.transactions = 0
+        self.last_timing: RequestTiming | None = None
+        self._clock = clock
+        self._failing = set(failing)
+
+    def read_holding_registers(self, address: int, count: int) -> list[int] | None:
+        self.requests.append((address, count))
+        self.transactions += 1
+        sent = self._clock.now
+        self._clock.now += LATENCY
+        self.last_timing = RequestTiming(sent, self._clock.now, sent, self._clock.now)
+        return None if (address, count) in self._failing else [0] * count
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(core.poller, "time", clock)
+    return clock
+
+
+def _poller(unit: _Unit) -> ModbusPoller:
+    poller = ModbusPoller("test", MODE_TCP, 1, poll_deadline=5, host="127.0.0.1", port=502)
+    poller._transport = unit
+    return poller
+
+
+def test_failed_range_is_retried_and_the_rest_still_read(clock) -> None:
+    unit = _Unit(clock, failing={(300, 23)})
+    poller = _poller(unit)
+    chunks, failed = poller._read_ranges([(300, 23), (325, 3)], clock.now + 5)
+    assert failed == [(300, 23)]
+    assert [(start, len(words)) for start, words, _timing in chunks] == [(325, 3)]
+    assert unit.requests == [(300, 23)] * MAX_READ_RETRIES + [(325, 3)]
+    assert poller._retries_left == MAX_POLL_RETRIES - (MAX_READ_RETRIES - 1)
+
+
+def test_retry_budget_is_shared_by_the_ranges_of_a_poll(clock) -> None:
+    unit = _Unit(clock, failing={(300, 23), (325, 3)})
+    poller = _poller(unit)
+    _chunks, failed = poller._read_ranges([(300, 23), (325, 3)], clock.now + 5)
+    assert failed == [(300, 23), (325, 3)]
+    assert len(unit.requests) == 2 + MAX_POLL_RETRIES
+    assert poller._retries_left == 0
+    assert poller._poll_overrun
+
+
+def test_ranges_past_the_deadline_are_skipped(clock) -> None:
+    unit = _Unit(clock)
+    poller = _poller(unit)
+    chunks, failed = poller._read_ranges([(101, 1), (300, 23), (325, 3)], clock.now + 1.5 * LATENCY)
+    assert len(chunks) == 2
+    assert failed == [(325, 3)]
+    assert unit.requests == [(101, 1), (300, 23)]
+    assert poller._poll_overrun
+
+
+def test_retry_that_would_pass_the_deadline_is_not_made(clock) -> None:
+    unit = _Unit(clock, failing={(300, 23)})
+    poller = _poller(unit)
+    _chunks, failed = poller._read_ranges([(300, 23), (325, 3)], clock.now + RETRY_DELAY)
+    assert failed == [(300, 23)]
+    assert unit.requests == [(300, 23), (325, 3)]
+    assert poller._retries_left == MAX_POLL_RETRIES
+
+
+def test_ranges_missed_last_poll_go_first_and_slow_ones_wait(clock) -> None:
+    poller = _poller(_Unit(clock))
+    poller._read_plan = [(101, 1, 0), (300, 23, 0), (336, 2, 300)]
+    poller._range_read_at = {(336, 2): clock.now}
+    poller._deferred_ranges = {(300, 23)}
+    assert poller._prioritized_ranges() == [(300, 23), (101, 1)]
+    clock.now += 300
+    assert poller._prioritized_ranges() == [(300, 23), (101, 1), (336, 2)]
@@ -0,0 +1,74 @@
+"""Tests for the connection benchmark."""
+
+import time
+
+import pytest
+
+import core.poller
+import core.probe
+from core.const import MODE_TCP
+from core.probe import benchmark, recommended_scan_interval
+from core.transport import RequestTiming
+
+ROUND_TRIP = 0.02
+
+
+class _Unit:
+    """Fake transport that answers every request with zeros, timed as ROUND_TRIP, except the failing ranges."""
+
+    def __init__(self, failing=()) -> None:
+        self.requests: list[tuple[int, int]] = []
+        self.transactions = 0
+        self.last_timing: RequestTiming | None = None
+        self._failing = set(failing)
+
+    def read_holding_registers(self, address: int, count: int) -> list[int] | None:
+        self.requests.append((address, count))
+        self.transactions += 1
+        sent = time.monotonic()
+        self.last_timing = RequestTiming(sent, sent + ROUND_TRIP, time.time(), time.time() + ROUND_TRIP)
+        if any(start <= address < start + length for start, length in self._failing):
+            return None
+        return [0] * count
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def connect(monkeypatch):
+    def connect(unit: _Unit) -> _Unit:
+        monkeypatch.setattr(core.probe, "ModbusTransport", lambda *args, **kwargs: unit)
+        monkeypatch.setattr(core.poller, "ModbusTransport", lambda *args, **kwargs: unit)
+        return unit
+
+    return connect
+
+
+def test_recommended_scan_interval() -> None:
+    assert recommended_scan_interval(0.01) == 1
+    assert recommended_scan_interval(1.1) == 5
+
+
+def test_benchmark_times_the_polls(connect) -> None:
+    connect(_Unit())
+    result = benchmark(MODE_TCP, 1, polls=3, host="127.0.0.1", port=502)
+    assert result.model == "E300 P"
+    assert result.polls == 3
+    assert result.failed_polls == 0
+    assert result.latency == pytest.approx(ROUND_TRIP)
+    assert result.poll_time <= result.max_poll_time
+    assert result.recommended_scan_interval == recommended_scan_interval(result.max_poll_time)
+
+
+def test_benchmark_fails_when_the_unit_does_not_answer(connect) -> None:
+    unit = connect(_Unit(failing={(0, 1000)}))
+    assert benchmark(MODE_TCP, 1, host="127.0.0.1", port=502) is None
+    # The single identify() read fails fast, without the poller's retries.
+    assert len(unit.requests) == 1
+
+
+def test_benchmark_fails_when_most_polls_fail(connect, monkeypatch) -> None:
+    monkeypatch.setattr(core.poller, "RETRY_DELAY", 0)
+    connect(_Unit(failing={(300, 1)}))
+    assert benchmark(MODE_TCP, 1, polls=3, host="127.0.0.1", port=502) is None
@@ -0,0 +1,18 @@
+"""Tests for the register profiles."""
+
+from core.profiles import select_profile
+
+
+def test_profile_leaves_out_its_unsupported_registers() -> None:
+    profile = select_profile("E300 P", None)
+    assert profile.unsupported == {317, 329}
+    assert not profile.registers & profile.unsupported
+    assert "317" not in profile.decoders
+    assert not profile.supports({300, 317})
+
+
+def test_slow_registers_are_supported_ones() -> None:
+    profile = select_profile("E300 RF", None)
+    assert 322 in profile.slow_registers
+    assert profile.slow_registers <= profile.registers
+    assert profile.slow_interval > 0
@@ -0,0 +1,74 @@
+"""Tests for the register scan and the support map."""
+
+import json
+
+from core.const import ILLEGAL_DATA_ADDRESS
+from core.scan import RegisterScanner, SupportMap, address_ranges
+
+
+class _Unit:
+    """Fake transport that rejects requests covering an unsupported address and ignores silent ones."""
+
+    def __init__(self, unsupported=(), silent=()) -> None:
+        self.requests: list[tuple[int, int]] = []
+        self.last_exception_code: int | None = None
+        self._unsupported = set(unsupported)
+        self._silent = set(silent)
+
+    def read_holding_registers(self, address: int, count: int) -> list[int] | None:
+        self.requests.append((address, count))
+        addresses = set(range(address, address + count))
+        self.last_exception_code = ILLEGAL_DATA_ADDRESS if addresses & self._unsupported else None
+        if addresses & (self._unsupported | self._silent):
+            return None
+        return [0] * count
+
+
+def _scan(unit: _Unit, first: int, last: int) -> RegisterScanner:
+    scanner = RegisterScanner(unit, first, last)
+    scanner.step(1000)
+    assert scanner.done
+    return scanner
+
+
+def test_supported_span_takes_one_request() -> None:
+    scanner = _scan(_Unit(), 300, 399)
+    assert scanner.supported == set(range(300, 400))
+    assert scanner.requests == 1
+
+
+def test_rejected_request_is_bisected_to_the_unsupported_address() -> None:
+    unit = _Unit(unsupported={317, 329})
+    scanner = _scan(unit, 300, 399)
+    assert scanner.unsupported == {317, 329}
+    assert scanner.supported == set(range(300, 400)) - {317, 329}
+    assert scanner.requests == len(unit.requests) < 30
+    assert all(count <= 125 for _address, count in unit.requests)
+
+
+def test_scan_resumes_where_the_step_stopped() -> None:
+    scanner = RegisterScanner(_Unit(unsupported={317}), 300, 399)
+    scanner.step(2)
+    assert scanner.requests == 2
+    assert not scanner.done
+    scanner.step(1000)
+    assert scanner.done
+    assert scanner.unsupported == {317}
+
+
+def test_request_without_answer_is_in_neither_set() -> None:
+    scanner = _scan(_Unit(silent={305}), 300, 309)
+    assert scanner.supported == set()
+    assert scanner.unsupported == set()
+
+
+def test_address_ranges() -> None:
+    assert address_ranges([303, 300, 301, 305]) == [[300, 301], [303, 303], [305, 305]]
+    assert address_ranges([]) == []
+
+
+def test_support_map_survives_a_json_round_trip() -> None:
+    support_map = _scan(_Unit(unsupported={317, 329}), 300, 399).support_map("E300 RF", "1.2.3")
+    assert SupportMap.from_dict(json.loads(json.dumps(support_map.as_dict()))) == support_map
+    assert support_map.matches("E300 RF", "1.2.3")
+    assert not support_map.matches("E300 RF", "1.2.4")
@@ -0,0 +1,85 @@
+"""Tests for the last-good cache and its staleness rules."""
+
+from core.snapshot import REGISTER_SLOTS, LastGoodCache
+from core.transport import RequestTiming
+
+MAX_AGE = 300
+
+
+def _timing(monotonic: float) -> RequestTiming:
+    return RequestTiming(monotonic, monotonic, 1e9 + monotonic, 1e9 + monotonic)
+
+
+def _poll(cache: LastGoodCache, now: float, chunks=(), failed_ranges=()):
+    chunks = [(start, registers, _timing(now)) for start, registers in chunks]
+    return cache.snapshot(chunks, list(failed_ranges), now, {}, {})
+
+
+def _fresh(snapshot, address: int) -> bool:
+    _words, mask = snapshot.fresh_words()
+    return bool(mask >> REGISTER_SLOTS[address] & 1)
+
+
+def test_read_word_is_fresh() -> None:
+    snapshot = _poll(LastGoodCache(MAX_AGE), 0.0, [(325, [10, 20, 30])])
+    assert snapshot.get("325") is not None
+    assert not snapshot.is_stale("325")
+    assert _fresh(snapshot, 325)
+    assert snapshot.timing("325") == _timing(0.0)
+
+
+def test_never_read_word_is_missing() -> None:
+    snapshot = _poll(LastGoodCache(MAX_AGE), 0.0, failed_ranges=[(325, 3)])
+    assert snapshot.get("325") is None
+    assert not snapshot.is_stale("325")
+    assert not _fresh(snapshot, 325)
+
+
+def test_failed_read_serves_the_last_good_word_as_stale() -> None:
+    cache = LastGoodCache(MAX_AGE)
+    good = _poll(cache, 0.0, [(325, [10, 20, 30])])
+    snapshot = _poll(cache, 60.0, failed_ranges=[(325, 3)])
+    assert snapshot.get("325") == good.get("325")
+    assert snapshot.is_stale("325")
+    assert not _fresh(snapshot, 325)
+    # Sampled when it was last read, not in this poll.
+    assert snapshot.timing("325") == _timing(0.0)
+
+
+def test_stale_word_is_dropped_after_max_age() -> None:
+    cache = LastGoodCache(MAX_AGE)
+    _poll(cache, 0.0, [(325, [10, 20, 30])])
+    assert _poll(cache, MAX_AGE, failed_ranges=[(325, 3)]).is_stale("325")
+    snapshot = _poll(cache, MAX_AGE + 1, failed_ranges=[(325, 3)])
+    assert snapshot.get("325") is None
+    assert not snapshot.is_stale("325")
+    # Reading it again brings it back.
+    assert _poll(cache, MAX_AGE + 2, [(325, [10, 20, 30])]).get("325") is not None
+
+
+def test_word_not_due_keeps_its_value_unflagged() -> None:
+    cache = LastGoodCache(MAX_AGE)
+    _poll(cache, 0.0, [(325, [10, 20, 30]), (336, [1, 2, 3])])
+    snapshot = _poll(cache, 10.0, [(325, [11, 21, 31])])
+    assert snapshot.get("336") is not None
+    assert not snapshot.is_stale("336")
+    assert _fresh(snapshot, 336)
+
+
+def test_invalidated_word_is_missing() -> None:
+    cache = LastGoodCache(MAX_AGE)
+    _poll(cache, 0.0, [(325, [10, 20, 30])])
+    cache.invalidate([325, 999])
+    snapshot = _poll(cache, 10.0)
+    assert snapshot.get("325") is None
+    assert snapshot.timing("325") is None
+    assert not _fresh(snapshot, 325)
+    assert snapshot.get("326") is not None
+
+
+def test_snapshot_does_not_change_with_later_polls() -> None:
+    cache = LastGoodCache(MAX_AGE)
+    first = _poll(cache, 0.0, [(325, [10, 20, 30])])
+    value = first.get("325")
+    _poll(cache, 10.0, [(325, [40, 50, 60])])
+    assert first.get("325") == value